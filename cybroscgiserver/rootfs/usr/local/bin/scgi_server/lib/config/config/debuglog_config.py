@@ -12,14 +12,16 @@ class DebugLogConfig:
             log_to_file: bool,
             verbose_level: str,
             max_log_file_size_kb: int,
-            max_log_backup_count: int
+            max_log_backup_count: int,
+            trace_requests: int
     ):
         return DebugLogConfig(
             enabled,
             log_to_file,
             verbose_level,
             max_log_file_size_kb,
-            max_log_backup_count
+            max_log_backup_count,
+            trace_requests
         )
 
     enabled: bool
@@ -27,14 +29,16 @@ class DebugLogConfig:
     verbose_level: str
     max_log_file_size_kb: int
     max_log_backup_count: int
+    trace_requests: int
 
-    def props(self) -> Tuple[bool, bool, str, int, int]:
+    def props(self) -> Tuple[bool, bool, str, int, int, int]:
         return (
             self.enabled,
             self.log_to_file,
             self.verbose_level,
             self.max_log_file_size_kb,
-            self.max_log_backup_count
+            self.max_log_backup_count,
+            self.trace_requests
         )
 
     @classmethod
@@ -47,6 +51,7 @@ class DebugLogConfig:
             verbose_level,
             max_log_file_size_kb,
             max_log_backup_count,
+            trace_requests
         ) = default.props()
 
         return cls.create(
@@ -57,4 +62,5 @@ class DebugLogConfig:
                       fallback=max_log_file_size_kb),
             cp.getint(section, "max_backup_count",
                       fallback=max_log_backup_count),
+            cp.getint(section, "trace_requests", fallback=trace_requests),
         )
@@ -1,6 +1,26 @@
 from configparser import ConfigParser
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from enum import Enum
+from typing import Optional, Tuple, TypeVar
+
+from lib.general.conditional_logger import get_logger
+from lib.input_output.websocket.send_queue import DropPolicy
+from lib.services.cpu_intensive_task_runner import TaskRunnerBackend
+
+E = TypeVar("E", bound=Enum)
+
+
+def _get_enum(cp: ConfigParser, section: str, option: str, fallback: E) -> E:
+    """Reads option with one of the values of the enum, an unknown value is
+    reported and the fallback is used instead.
+    """
+    value = cp.get(section, option, fallback=fallback.value)
+    try:
+        return type(fallback)(value)
+    except ValueError:
+        get_logger().warning(f"Invalid {section} {option} '{value}', "
+                             f"using {fallback.value}")
+        return fallback
 
 
 @dataclass(frozen=True)
@@ -14,9 +34,18 @@ class ScgiConfig:
     server_address: Optional[str]
     keepalive: float
     only_user_variables: bool
+    compression_min_bytes: int
+    ws_queue_size: int
+    ws_drop_policy: DropPolicy
+    write_coalesce_ms: int
+    read_after_write: bool
+    task_runner: TaskRunnerBackend
+    task_runner_threshold: int
+    workers: int
 
     def props(self) -> Tuple[
-        str, int, int, bool, bool, Optional[str], Optional[str], float, bool
+        str, int, int, bool, bool, Optional[str], Optional[str], float, bool,
+        int, int, DropPolicy, int, bool, TaskRunnerBackend, int, int
     ]:
         return (
             self.scgi_bind_address,
@@ -27,7 +56,15 @@ class ScgiConfig:
             self.access_token,
             self.server_address,
             self.keepalive,
-            self.only_user_variables
+            self.only_user_variables,
+            self.compression_min_bytes,
+            self.ws_queue_size,
+            self.ws_drop_policy,
+            self.write_coalesce_ms,
+            self.read_after_write,
+            self.task_runner,
+            self.task_runner_threshold,
+            self.workers
         )
 
     @classmethod
@@ -43,7 +80,15 @@ class ScgiConfig:
             access_token,
             server_address,
             keepalive,
-            only_user_variables
+            only_user_variables,
+            compression_min_bytes,
+            ws_queue_size,
+            ws_drop_policy,
+            write_coalesce_ms,
+            read_after_write,
+            task_runner,
+            task_runner_threshold,
+            workers
         ) = default.props()
 
         scgi_bind_addr_from_conf = cp.get(section, "bind_address",
@@ -65,4 +110,16 @@ class ScgiConfig:
             cp.getfloat(section, "keepalive", fallback=keepalive),
             cp.getboolean(section, "only_user_variables",
                           fallback=only_user_variables),
+            cp.getint(section, "compression_min_bytes",
+                      fallback=compression_min_bytes),
+            cp.getint(section, "ws_queue_size", fallback=ws_queue_size),
+            _get_enum(cp, section, "ws_drop_policy", ws_drop_policy),
+            cp.getint(section, "write_coalesce_ms",
+                      fallback=write_coalesce_ms),
+            cp.getboolean(section, "read_after_write",
+                          fallback=read_after_write),
+            _get_enum(cp, section, "task_runner", task_runner),
+            cp.getint(section, "task_runner_threshold",
+                      fallback=task_runner_threshold),
+            cp.getint(section, "workers", fallback=workers),
         )
\ No newline at end of file
@@ -0,0 +1,125 @@
+import asyncio
+import sys
+import threading
+import traceback
+from asyncio import AbstractEventLoop
+from time import monotonic
+from concurrent.futures import Future
+from typing import List, Optional
+
+from lib.general.conditional_logger import ConditionalLogger
+from lib.general.metrics import MetricsRegistry, Histogram, Counter, \
+    LATENCY_BUCKETS
+
+
+class _WatchedLoop:
+    __slots__ = ("name", "loop", "lag", "stalls", "thread_id", "last_beat",
+                 "reported")
+
+    def __init__(self,
+                 name: str,
+                 loop: AbstractEventLoop,
+                 lag: Histogram,
+                 stalls: Counter):
+        self.name: str = name
+        self.loop: AbstractEventLoop = loop
+        self.lag: Histogram = lag
+        self.stalls: Counter = stalls
+        # known once the heartbeat runs on the loop
+        self.thread_id: Optional[int] = None
+        self.last_beat: float = 0
+        # stack of the current stall is already logged
+        self.reported: bool = False
+
+
+class LoopWatchdog:
+    """Measures how late event loops run their callbacks and reports loops
+    blocked by synchronous code, e.g. parsing or file logging.
+
+    A heartbeat task on each loop measures the lag of periodic wake-ups. A
+    thread of its own checks the heartbeats, so a loop which is still
+    blocked is noticed and the stack of the blocking code is logged once
+    per stall.
+    """
+    def __init__(self,
+                 log: ConditionalLogger,
+                 metrics: MetricsRegistry,
+                 period_s: float,
+                 threshold_s: float):
+        self._log: ConditionalLogger = log
+        self._period_s: float = period_s
+        self._threshold_s: float = threshold_s
+        self._lag = metrics.histogram(
+            "event_loop_lag_seconds",
+            "Delay of scheduled wake-ups of the event loop",
+            LATENCY_BUCKETS,
+            ("loop",)
+        )
+        self._stalls = metrics.counter(
+            "event_loop_stalls_total",
+            "Times the event loop was blocked for longer than the threshold",
+            ("loop",)
+        )
+        self._loops: List[_WatchedLoop] = []
+        self._beats: List[Future] = []
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event: threading.Event = threading.Event()
+
+    def watch(self, loop: AbstractEventLoop, name: str) -> None:
+        self._loops.append(_WatchedLoop(name,
+                                        loop,
+                                        self._lag.labels(name),
+                                        self._stalls.labels(name)))
+
+    def start(self) -> None:
+        self._beats = [
+            asyncio.run_coroutine_threadsafe(self._beat(watched),
+                                             watched.loop)
+            for watched in self._loops
+        ]
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run,
+                                        name="LoopWatchdog",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        for beat in self._beats:
+            beat.cancel()
+        self._beats = []
+
+    async def _beat(self, watched: _WatchedLoop) -> None:
+        watched.last_beat = monotonic()
+        # the watchdog thread checks the loop once its thread is known, so
+        # the first beat must be set already
+        watched.thread_id = threading.get_ident()
+        while True:
+            await asyncio.sleep(self._period_s)
+            now = monotonic()
+            watched.lag.observe(max(0.0, now - watched.last_beat
+                                    - self._period_s))
+            watched.last_beat = now
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self._period_s):
+            now = monotonic()
+            for watched in self._loops:
+                if watched.thread_id is None:
+                    continue
+
+                blocked_s = now - watched.last_beat - self._period_s
+                if blocked_s < self._threshold_s:
+                    watched.reported = False
+                elif not watched.reported:
+                    watched.reported = True
+                    watched.stalls.inc()
+                    self._report(watched, blocked_s)
+
+    def _report(self, watched: _WatchedLoop, blocked_s: float) -> None:
+        frame = sys._current_frames().get(watched.thread_id)
+        stack = "" if frame is None \
+            else "".join(traceback.format_stack(frame))
+        self._log.warning(f"{watched.name} loop blocked for at least "
+                          f"{blocked_s:.2f} s, currently running:\n{stack}")
@@ -0,0 +1,207 @@
+import math
+from bisect import bisect_left
+from typing import Dict, Tuple, List, Callable, Optional, Union
+
+# upper bounds of latency histograms [s]
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0)
+# upper bounds of histograms of small counts
+COUNT_BUCKETS = (1, 2, 3, 5, 10, 20, 50)
+
+
+class Counter:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value: float = 0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+
+class Gauge:
+    __slots__ = ("value", "_function")
+
+    def __init__(self, function: Optional[Callable[[], float]] = None):
+        self.value: float = 0
+        # when set, value is read when metrics are collected
+        self._function: Optional[Callable[[], float]] = function
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Reads the value from `function` when metrics are collected, for
+        gauges with labels, where each label needs a function of its own.
+        """
+        self._function = function
+
+    def get(self) -> float:
+        return self.value if self._function is None else self._function()
+
+
+class Histogram:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds: Tuple[float, ...] = bounds
+        # last item counts values above the largest bound
+        self.counts: List[int] = [0] * (len(bounds) + 1)
+        self.sum: float = 0
+        self.count: int = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+Metric = Union[Counter, Gauge, Histogram]
+
+
+class MetricFamily:
+    """Metrics of the same name, one for each combination of label values.
+    Metrics without labels are accessed with `labels()`.
+    """
+    def __init__(self,
+                 name: str,
+                 help_text: str,
+                 metric_type: str,
+                 label_names: Tuple[str, ...],
+                 create: Callable[[], Metric]):
+        self.name: str = name
+        self.help_text: str = help_text
+        self.metric_type: str = metric_type
+        self.label_names: Tuple[str, ...] = label_names
+        self._create: Callable[[], Metric] = create
+        self._metrics: Dict[Tuple[str, ...], Metric] = {}
+
+    def labels(self, *values) -> Metric:
+        try:
+            return self._metrics[values]
+        except KeyError:
+            if len(values) != len(self.label_names):
+                raise ValueError(f"{self.name} has labels "
+                                 f"{self.label_names}")
+            metric = self._create()
+            self._metrics[values] = metric
+            return metric
+
+    def remove(self, *values) -> None:
+        self._metrics.pop(values, None)
+
+    def items(self) -> List[Tuple[Tuple[str, ...], Metric]]:
+        # metrics may be added by the communication thread
+        return list(self._metrics.items())
+
+
+class MetricsRegistry:
+    """Counters, gauges and histograms of the server, rendered in the
+    Prometheus text format.
+
+    Metrics are plain objects updated without locking, they are cheap
+    enough to be updated for each exchange. Values updated by the
+    communication thread may be rendered slightly out of date.
+    """
+    def __init__(self):
+        self._families: Dict[str, MetricFamily] = {}
+
+    def counter(self,
+                name: str,
+                help_text: str,
+                label_names: Tuple[str, ...] = ()) -> MetricFamily:
+        return self._register(name, help_text, "counter", label_names,
+                              Counter)
+
+    def gauge(self,
+              name: str,
+              help_text: str,
+              label_names: Tuple[str, ...] = (),
+              function: Optional[Callable[[], float]] = None
+              ) -> MetricFamily:
+        return self._register(name, help_text, "gauge", label_names,
+                              lambda: Gauge(function))
+
+    def histogram(self,
+                  name: str,
+                  help_text: str,
+                  bounds: Tuple[float, ...],
+                  label_names: Tuple[str, ...] = ()) -> MetricFamily:
+        return self._register(name, help_text, "histogram", label_names,
+                              lambda: Histogram(bounds))
+
+    def render(self) -> str:
+        lines = []
+        for family in list(self._families.values()):
+            lines.append(f"# HELP {family.name} {family.help_text}")
+            lines.append(f"# TYPE {family.name} {family.metric_type}")
+            for values, metric in family.items():
+                labels = [
+                    f'{name}="{self._escape(str(value))}"'
+                    for name, value in zip(family.label_names, values)
+                ]
+                if isinstance(metric, Histogram):
+                    self._render_histogram(lines, family.name, labels,
+                                           metric)
+                else:
+                    value = metric.value if isinstance(metric, Counter) \
+                        else metric.get()
+                    lines.append(f"{family.name}{self._labels(labels)} "
+                                 f"{self._number(value)}")
+        lines.append("")
+        return "\n".join(lines)
+
+    def _register(self,
+                  name: str,
+                  help_text: str,
+                  metric_type: str,
+                  label_names: Tuple[str, ...],
+                  create: Callable[[], Metric]) -> MetricFamily:
+        try:
+            family = self._families[name]
+        except KeyError:
+            family = MetricFamily(name, help_text, metric_type, label_names,
+                                  create)
+            self._families[name] = family
+            return family
+
+        if family.metric_type != metric_type or \
+                family.label_names != label_names:
+            raise ValueError(f"Metric {name} is already registered as "
+                             f"{family.metric_type} {family.label_names}")
+        return family
+
+    @classmethod
+    def _render_histogram(cls,
+                          lines: List[str],
+                          name: str,
+                          labels: List[str],
+                          histogram: Histogram) -> None:
+        cumulative = 0
+        bounds = [cls._number(bound) for bound in histogram.bounds]
+        for bound, count in zip(bounds + ["+Inf"], histogram.counts):
+            cumulative += count
+            bucket_labels = cls._labels(labels + [f'le="{bound}"'])
+            lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+        lines.append(f"{name}_sum{cls._labels(labels)} "
+                     f"{cls._number(histogram.sum)}")
+        lines.append(f"{name}_count{cls._labels(labels)} {histogram.count}")
+
+    @staticmethod
+    def _labels(labels: List[str]) -> str:
+        return "" if len(labels) == 0 else "{" + ",".join(labels) + "}"
+
+    @staticmethod
+    def _escape(value: str) -> str:
+        return value.replace("\\", "\\\\").replace('"', '\\"') \
+            .replace("\n", "\\n")
+
+    @staticmethod
+    def _number(value: float) -> str:
+        if math.isnan(value):
+            return "NaN"
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        if isinstance(value, int) or float(value).is_integer():
+            return str(int(value))
+        return repr(float(value))
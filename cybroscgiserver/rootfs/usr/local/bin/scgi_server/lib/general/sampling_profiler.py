@@ -0,0 +1,205 @@
+import sys
+import threading
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from time import monotonic, thread_time
+from types import FrameType, CodeType
+from typing import Dict, Tuple, Optional, List
+
+from lib.general.conditional_logger import ConditionalLogger
+
+# time spent waiting for events of the loop
+IDLE = "idle"
+# time not spent in any of the subsystems
+OTHER = "other"
+
+
+class SamplingProfiler:
+    """Periodically samples stacks of the event loop threads, without
+    instrumenting the code, so it may be started on a running server.
+
+    Samples are written to the log directory in the collapsed stack format
+    (one `thread;outer;...;inner count` line per distinct stack), which is
+    read by flame graph tools. Each sample is also attributed to the
+    innermost subsystem found on its stack.
+
+    Sampling holds the GIL, so it delays the loops. The sampler measures
+    its own cpu time and sleeps long enough to keep it below
+    `max_overhead` of the wall time, stretching the interval if needed.
+    """
+    def __init__(self,
+                 log: ConditionalLogger,
+                 log_dir: Path,
+                 thread_names: Tuple[str, ...],
+                 subsystems: Tuple[Tuple[str, str], ...],
+                 interval_s: float,
+                 max_overhead: float):
+        self._log: ConditionalLogger = log
+        self._log_dir: Path = log_dir
+        self._thread_names: Tuple[str, ...] = thread_names
+        # (fragment of module path, subsystem name)
+        self._subsystems: Tuple[Tuple[str, str], ...] = subsystems
+        self._interval_s: float = interval_s
+        self._max_overhead: float = max_overhead
+        self._thread: Optional[threading.Thread] = None
+        # each run has its own event, so a stopping run doesn't stop the
+        # next one
+        self._stop_event: threading.Event = threading.Event()
+        self._end_time: float = 0
+        # function name and subsystem by code of sampled functions
+        self._description_by_code: Dict[
+            CodeType, Tuple[str, Optional[str]]
+        ] = {}
+        # share of samples by (thread name, subsystem) of the last profile
+        self._last_profile: Dict[Tuple[str, str], float] = {}
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() \
+            and not self._stop_event.is_set()
+
+    @property
+    def remaining_s(self) -> float:
+        return max(0.0, self._end_time - monotonic()) \
+            if self.is_running else 0.0
+
+    @property
+    def last_profile(self) -> Dict[Tuple[str, str], float]:
+        return self._last_profile
+
+    def start(self, duration_s: float) -> None:
+        """Starts sampling for `duration_s` seconds, a running profile is
+        extended or shortened. A stopped profile which is still being saved
+        is replaced by a new one.
+        """
+        self._end_time = monotonic() + duration_s
+        if self.is_running:
+            return
+
+        threads = {
+            thread.ident: thread.name
+            for thread in threading.enumerate()
+            if thread.name in self._thread_names
+        }
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run,
+                                        args=(threads, self._stop_event),
+                                        name="SamplingProfiler",
+                                        daemon=True)
+        self._thread.start()
+        self._log.info(f"Profiling {', '.join(threads.values())} for "
+                       f"{duration_s:g} s")
+
+    def stop(self) -> None:
+        """Stops sampling, collected samples are saved."""
+        self._stop_event.set()
+
+    def _run(self,
+             threads: Dict[int, str],
+             stop_event: threading.Event) -> None:
+        stacks: Counter = Counter()
+        subsystems: Counter = Counter()
+        sample_count = 0
+        sampling_time = 0.0
+        start = monotonic()
+
+        wait_s = self._interval_s
+        while not stop_event.wait(wait_s) and \
+                monotonic() < self._end_time:
+            cpu_start = thread_time()
+            self._sample(threads, stacks, subsystems)
+            cost = thread_time() - cpu_start
+
+            sample_count += 1
+            sampling_time += cost
+            wait_s = max(self._interval_s, cost / self._max_overhead)
+
+        elapsed = monotonic() - start
+        self._last_profile = {
+            key: count / sample_count
+            for key, count in subsystems.items()
+        } if sample_count > 0 else {}
+
+        try:
+            path = self._save(stacks)
+        except OSError as e:
+            self._log.error(f"Can't save profile: {e}")
+            return
+
+        overhead = sampling_time / elapsed if elapsed > 0 else 0
+        self._log.info(f"Profile of {sample_count} samples saved to {path}, "
+                       f"sampling took {overhead * 100:.2f}% of the time")
+        self._log.info(lambda: "Profile by subsystem: " + ", ".join(
+            f"{thread} {subsystem} {share * 100:.1f}%"
+            for (thread, subsystem), share in sorted(
+                self._last_profile.items()
+            )
+        ))
+
+    def _sample(self,
+                threads: Dict[int, str],
+                stacks: Counter,
+                subsystems: Counter) -> None:
+        frames = sys._current_frames()
+        for thread_id, thread_name in threads.items():
+            frame = frames.get(thread_id)
+            if frame is None:
+                continue
+
+            names, subsystem = self._walk(frame)
+            names.append(thread_name)
+            names.reverse()
+            stacks[";".join(names)] += 1
+            subsystems[thread_name, subsystem] += 1
+
+    def _walk(self, frame: FrameType) -> Tuple[List[str], str]:
+        """Returns function names of the stack, the innermost first, and
+        the subsystem the sample is attributed to.
+        """
+        names = []
+        subsystem = None
+        innermost = frame
+        while frame is not None:
+            name, code_subsystem = self._describe(frame.f_code)
+            names.append(name)
+            if subsystem is None:
+                subsystem = code_subsystem
+            frame = frame.f_back
+
+        if subsystem is None:
+            # loops wait for events in the selector
+            subsystem = IDLE if innermost.f_code.co_name == "select" \
+                else OTHER
+
+        return names, subsystem
+
+    def _describe(self, code: CodeType) -> Tuple[str, Optional[str]]:
+        """Returns function name and subsystem of the code, both are
+        remembered, so stacks are sampled quickly.
+        """
+        try:
+            return self._description_by_code[code]
+        except KeyError:
+            path = code.co_filename.replace("\\", "/")
+            description = (
+                f"{Path(path).stem}:"
+                f"{getattr(code, 'co_qualname', code.co_name)}",
+                next(
+                    (name for fragment, name in self._subsystems
+                     if fragment in path),
+                    None
+                )
+            )
+            self._description_by_code[code] = description
+            return description
+
+    def _save(self, stacks: Counter) -> Path:
+        self._log_dir.mkdir(parents=True, exist_ok=True)
+        path = self._log_dir / (
+            f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.folded"
+        )
+        with path.open("w") as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        return path
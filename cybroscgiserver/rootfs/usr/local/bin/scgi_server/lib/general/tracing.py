@@ -0,0 +1,125 @@
+import heapq
+from contextlib import nullcontext, contextmanager
+from contextvars import ContextVar
+from itertools import count
+from time import monotonic
+from typing import Optional, List, Tuple, NamedTuple, Iterator
+
+# trace of the scgi request being processed, copied into tasks created
+# while processing it, also on the communication loop
+_current_trace: ContextVar[Optional['Trace']] = ContextVar("trace",
+                                                           default=None)
+# returned by `span` when the request is not traced
+_NO_SPAN = nullcontext()
+
+
+class Span(NamedTuple):
+    stage: str
+    target: Optional[int]
+    # relative to the start of the trace [s]
+    start: float
+    duration: float
+
+
+class Trace:
+    """Processing stages of a single scgi request. Stages of different
+    controllers run concurrently, so spans may overlap.
+    """
+    __slots__ = ("request_id", "description", "start", "duration", "spans")
+
+    def __init__(self, request_id: int):
+        self.request_id: int = request_id
+        self.description: str = ""
+        self.start: float = monotonic()
+        # set when the request is answered
+        self.duration: Optional[float] = None
+        self.spans: List[Span] = []
+
+    def add_span(self,
+                 stage: str,
+                 start: float,
+                 end: float,
+                 target: Optional[int] = None) -> None:
+        """Adds a stage measured with `time.monotonic`, which is also the
+        clock of event loops. Stages of background tasks started by the
+        request, e.g. cache refreshes, which end after the request is
+        answered are ignored.
+        """
+        if self.duration is not None:
+            return
+        self.spans.append(
+            Span(stage, target, start - self.start, end - start)
+        )
+
+
+class _Span:
+    __slots__ = ("_trace", "_stage", "_target", "_start")
+
+    def __init__(self, trace: Trace, stage: str, target: Optional[int]):
+        self._trace: Trace = trace
+        self._stage: str = stage
+        self._target: Optional[int] = target
+        self._start: float = 0
+
+    def __enter__(self) -> None:
+        self._start = monotonic()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._trace.add_span(self._stage, self._start, monotonic(),
+                             self._target)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+def span(stage: str, target: Optional[int] = None):
+    """Context manager measuring a stage of the traced request, e.g.
+    `with span("read", nad): ...`. Does nothing when the request is not
+    traced.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        return _NO_SPAN
+    return _Span(trace, stage, target)
+
+
+class Tracer:
+    """Traces scgi requests and keeps the slowest ones.
+
+    Requests are traced only when a tracer exists, otherwise each stage
+    costs a single context variable lookup.
+    """
+    def __init__(self, size: int):
+        self._size: int = size
+        self._request_ids = count(1)
+        # min-heap of (duration, request id, trace), the fastest of the kept
+        # traces is replaced first
+        self._slowest: List[Tuple[float, int, Trace]] = []
+
+    @property
+    def slowest(self) -> List[Trace]:
+        """Kept traces, the slowest first."""
+        return [
+            trace for _, _, trace in sorted(self._slowest, reverse=True)
+        ]
+
+    @contextmanager
+    def trace(self) -> Iterator[Trace]:
+        """Traces the request processed within the `with` block."""
+        trace = Trace(next(self._request_ids))
+        token = _current_trace.set(trace)
+        try:
+            yield trace
+        finally:
+            _current_trace.reset(token)
+            self._keep(trace)
+
+    def _keep(self, trace: Trace) -> None:
+        trace.duration = monotonic() - trace.start
+        item = (trace.duration, trace.request_id, trace)
+
+        if len(self._slowest) < self._size:
+            heapq.heappush(self._slowest, item)
+        elif trace.duration > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, item)
@@ -0,0 +1,54 @@
+import time
+import zlib
+from typing import Optional, Tuple
+
+# zlib window bits for each supported content coding
+_WBITS = {
+    "gzip": 16 + zlib.MAX_WBITS,
+    "deflate": zlib.MAX_WBITS
+}
+
+
+def select_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Selects the best supported content coding from the value of
+    Accept-Encoding request header. Returns None when the response should be
+    sent without compression.
+    """
+    if not accept_encoding:
+        return None
+
+    # q value of each listed coding, the wildcard stands for the others
+    q_by_coding = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        q_by_coding[coding] = q
+
+    wildcard_q = q_by_coding.pop("*", 0.0)
+    best_encoding, best_q = None, 0.0
+    for coding in (*q_by_coding, *_WBITS):
+        q = q_by_coding.get(coding, wildcard_q)
+        if coding in _WBITS and q > best_q:
+            best_encoding, best_q = coding, q
+
+    return best_encoding
+
+
+def compress(data: bytes,
+             encoding: str,
+             level: int = 6) -> Tuple[bytes, float]:
+    """Compresses data using given content coding. Returns compressed data
+    and cpu time spent compressing [s].
+    """
+    start = time.thread_time()
+    compressor = zlib.compressobj(level, zlib.DEFLATED, _WBITS[encoding])
+    result = compressor.compress(data) + compressor.flush()
+    return result, time.thread_time() - start
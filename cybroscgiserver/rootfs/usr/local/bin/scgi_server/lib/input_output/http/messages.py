@@ -20,6 +20,22 @@ def join_headers(headers: Dict[str, str]) -> str:
     return LINE_END.join(f"{k}: {v}" for k, v in headers.items())
 
 
+def get_header(headers: Optional[Dict[str, str]],
+               name: str,
+               default: Optional[str] = None) -> Optional[str]:
+    """Gets header value, header names are case-insensitive.
+    """
+    if headers is None:
+        return default
+
+    name = name.lower()
+    for k, v in headers.items():
+        if k.lower() == name:
+            return v
+
+    return default
+
+
 @dataclass(frozen=True)
 class HttpRequestMessage:
     """HTTP request message object representation.
@@ -118,6 +134,16 @@ class HttpResponseMessage:
             body="" if body is None else body
         )
 
+    @classmethod
+    def not_modified(cls, headers: Optional[Dict[str, str]] = None):
+        """Create response for status 304.
+        """
+        return cls(
+            status_code=304,
+            status_message="Not Modified",
+            headers={} if headers is None else headers
+        )
+
     @classmethod
     def bad_request(cls,
                     headers: Optional[Dict[str, str]] = None,
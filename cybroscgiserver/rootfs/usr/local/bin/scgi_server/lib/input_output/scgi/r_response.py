@@ -1,10 +1,8 @@
-from dataclasses import dataclass
 from enum import Enum
-from typing import Union, List, Optional
+from typing import Union, List, Optional, NamedTuple
 
 
-@dataclass
-class RResponse:
+class RResponse(NamedTuple):
     class Code(Enum):
         NO_ERROR = 0
         TIMEOUT = 1
@@ -0,0 +1,80 @@
+from dataclasses import replace
+from typing import List, Optional
+
+from lib.input_output.websocket.frame import WebSocketFrame, Opcode, \
+    WebSocketProtocolError
+
+CONTROL_OPCODES = (Opcode.CLOSE, Opcode.PING, Opcode.PONG)
+
+
+class WebSocketFrameDecoder:
+    """Incrementally decodes WebSocket frames from a byte stream.
+
+    Data may contain partial or several coalesced frames. Fragmented messages
+    are joined into a single frame, control frames may be interleaved with
+    the fragments.
+    """
+    def __init__(self, max_message_size: int = 1024 * 1024):
+        self._max_message_size: int = max_message_size
+        self._buffer: bytearray = bytearray()
+        self._fragments: Optional[List[WebSocketFrame]] = None
+        self._fragments_size: int = 0
+
+    def feed(self, data: bytes) -> List[WebSocketFrame]:
+        """Adds received data and returns all frames completed by it.
+        """
+        self._buffer += data
+
+        frames: List[WebSocketFrame] = []
+        offset = 0
+        while True:
+            result = WebSocketFrame.parse(self._buffer, offset)
+            if result is None:
+                break
+
+            frame, offset = result
+            frame = self._assemble(frame)
+            if frame is not None:
+                frames.append(frame)
+
+        if offset > 0:
+            del self._buffer[:offset]
+
+        if len(self._buffer) > self._max_message_size:
+            raise WebSocketProtocolError("Frame too large")
+
+        return frames
+
+    def _assemble(self, frame: WebSocketFrame) -> Optional[WebSocketFrame]:
+        if frame.opcode in CONTROL_OPCODES:
+            if not frame.fin:
+                raise WebSocketProtocolError("Fragmented control frame")
+            return frame
+
+        if frame.opcode == Opcode.CONTINUATION:
+            if self._fragments is None:
+                raise WebSocketProtocolError("Unexpected continuation frame")
+        elif self._fragments is not None:
+            raise WebSocketProtocolError("Expected continuation frame")
+        elif frame.fin:
+            return frame
+        else:
+            self._fragments = []
+            self._fragments_size = 0
+
+        self._fragments.append(frame)
+        self._fragments_size += frame.payload_len
+        if self._fragments_size > self._max_message_size:
+            raise WebSocketProtocolError("Message too large")
+
+        if not frame.fin:
+            return None
+
+        fragments, self._fragments = self._fragments, None
+        payload = b"".join(fragment.payload for fragment in fragments)
+        return replace(
+            fragments[0],
+            fin=True,
+            payload_len=len(payload),
+            payload=payload
+        )
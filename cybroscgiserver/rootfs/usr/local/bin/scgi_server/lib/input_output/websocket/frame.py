@@ -2,7 +2,11 @@ import struct
 from dataclasses import dataclass
 from enum import Enum
 from os import urandom
-from typing import Optional
+from typing import Optional, Tuple, Union
+
+
+class WebSocketProtocolError(ValueError):
+    pass
 
 
 class Opcode(Enum):
@@ -62,7 +66,7 @@ class WebSocketFrame:
                 (self.payload_len & 0x7f) |
                 (0x80 if self.mask_key is not None else 0x00)
             )
-        elif self.payload_len <= 65536:
+        elif self.payload_len <= 0xFFFF:
             return struct.pack(
                 ">BH",
                 0xFE if self.mask_key is not None else 0x7E,
@@ -83,12 +87,17 @@ class WebSocketFrame:
 
     @staticmethod
     def mask_data(masking_key: bytes, data: bytes) -> bytes:
-        """Masks the given data with the given masking key.
+        """Masks the given data with the given masking key. Data is XOR-ed
+        as a single wide integer instead of byte by byte.
         """
-        return b''.join(
-            (data[i] ^ masking_key[i % 4]).to_bytes(1, byteorder='little')
-            for i in range(0, len(data))
-        )
+        data_len = len(data)
+        if data_len == 0:
+            return b""
+
+        key = (masking_key * (data_len // 4 + 1))[:data_len]
+        return (
+            int.from_bytes(data, "little") ^ int.from_bytes(key, "little")
+        ).to_bytes(data_len, "little")
 
     def serialize(self) -> bytes:
         """Returns bytes representation of WebSocket frame.
@@ -107,46 +116,78 @@ class WebSocketFrame:
     def deserialize(cls, msg: bytes):
         """Creates a WebSocketFrame instance from a bytes message.
         """
-        fin = (msg[0] & 0x80 != 0)
-        rsv1 = (msg[0] & 0x40 != 0)
-        rsv2 = (msg[0] & 0x20 != 0)
-        rsv3 = (msg[0] & 0x10 != 0)
-        opcode = Opcode(msg[0] & 0x0F)
-        has_mask = (msg[1] & 0x80 != 0)
-
-        payload_len = int(msg[1] & 0x7F)
+        result = cls.parse(msg)
+        if result is None:
+            raise WebSocketProtocolError("Incomplete frame")
+
+        frame, _ = result
+        return frame
+
+    @classmethod
+    def parse(
+        cls,
+        data: Union[bytes, bytearray],
+        offset: int = 0
+    ) -> Optional[Tuple['WebSocketFrame', int]]:
+        """Parses frame starting at offset. Returns the frame and offset of
+        the first byte after it, or None when data doesn't contain the whole
+        frame yet.
+        """
+        available = len(data) - offset
+        if available < 2:
+            return None
+
+        first_byte = data[offset]
+        second_byte = data[offset + 1]
+        has_mask = (second_byte & 0x80 != 0)
+
+        payload_len = second_byte & 0x7F
+        header_len = 2
         if payload_len == 0x7E:
-            payload_len = struct.unpack(">H", msg[2:4])[0]
-            mask_key = msg[4:8] if has_mask else None
-            payload_idx = 8 if has_mask else 4
+            header_len = 4
+            if available < header_len:
+                return None
+            payload_len = struct.unpack_from(">H", data, offset + 2)[0]
         elif payload_len == 0x7F:
-            payload_len = struct.unpack(">Q", msg[2:10])[0]
-            mask_key = msg[10:14] if has_mask else None
-            payload_idx = 14 if has_mask else 10
-        else:
-            mask_key = msg[2:6] if has_mask else None
-            payload_idx = 6 if has_mask else 2
+            header_len = 10
+            if available < header_len:
+                return None
+            payload_len = struct.unpack_from(">Q", data, offset + 2)[0]
+
+        payload_idx = offset + header_len + (4 if has_mask else 0)
+        end = payload_idx + payload_len
+        if len(data) < end:
+            return None
+
+        try:
+            opcode = Opcode(first_byte & 0x0F)
+        except ValueError:
+            raise WebSocketProtocolError(
+                f"Unknown opcode {first_byte & 0x0F}"
+            )
 
-        unmasked_payload = cls.mask_data(
-            mask_key,
-            msg[payload_idx:payload_idx + payload_len]
-        ) if has_mask else msg[payload_idx:payload_idx + payload_len]
+        if has_mask:
+            mask_key = bytes(data[payload_idx - 4:payload_idx])
+            payload = cls.mask_data(mask_key, data[payload_idx:end])
+        else:
+            mask_key = None
+            payload = bytes(data[payload_idx:end])
 
-        status_code = struct.unpack(">H", unmasked_payload)[0] \
-            if opcode == Opcode.CLOSE \
+        status_code = struct.unpack_from(">H", payload)[0] \
+            if opcode == Opcode.CLOSE and payload_len >= 2 \
             else None
 
         return cls(
-            fin=fin,
+            fin=(first_byte & 0x80 != 0),
             opcode=opcode,
-            rsv1=rsv1,
-            rsv2=rsv2,
-            rsv3=rsv3,
+            rsv1=(first_byte & 0x40 != 0),
+            rsv2=(first_byte & 0x20 != 0),
+            rsv3=(first_byte & 0x10 != 0),
             mask_key=mask_key,
             payload_len=payload_len,
-            payload=unmasked_payload,
+            payload=payload,
             status_code=status_code
-        )
+        ), end
 
     @classmethod
     def for_payload(cls, payload: bytes, client: bool = False):
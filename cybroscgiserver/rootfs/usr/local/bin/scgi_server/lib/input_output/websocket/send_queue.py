@@ -0,0 +1,64 @@
+import asyncio
+from collections import deque
+from enum import Enum
+from typing import Deque
+
+
+class DropPolicy(Enum):
+    # discard the oldest queued message to make room for the new one
+    DROP_OLDEST = "drop_oldest"
+    # give up on the client, connection is closed
+    DISCONNECT = "disconnect"
+
+
+class SendQueueFull(Exception):
+    pass
+
+
+class WebSocketSendQueue:
+    """Bounded queue of serialized frames waiting to be written to a single
+    WebSocket client. Producers never wait on the client socket, a slow
+    client either loses its oldest messages or gets disconnected.
+    """
+    def __init__(self, max_size: int, drop_policy: DropPolicy):
+        self._max_size: int = max_size
+        self._drop_policy: DropPolicy = drop_policy
+        self._items: Deque[bytes] = deque()
+        self._not_empty: asyncio.Event = asyncio.Event()
+        self._dropped_count: int = 0
+        self._sent_count: int = 0
+
+    @property
+    def depth(self) -> int:
+        return len(self._items)
+
+    @property
+    def dropped_count(self) -> int:
+        return self._dropped_count
+
+    @property
+    def sent_count(self) -> int:
+        return self._sent_count
+
+    def put(self, data: bytes) -> None:
+        """Queues serialized frame, raises SendQueueFull when the queue is
+        full and the policy is to disconnect.
+        """
+        if len(self._items) >= self._max_size:
+            self._dropped_count += 1
+            if self._drop_policy == DropPolicy.DISCONNECT:
+                raise SendQueueFull()
+            self._items.popleft()
+
+        self._items.append(data)
+        self._not_empty.set()
+
+    async def get(self) -> bytes:
+        """Waits for the next frame.
+        """
+        while len(self._items) == 0:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+
+        self._sent_count += 1
+        return self._items.popleft()
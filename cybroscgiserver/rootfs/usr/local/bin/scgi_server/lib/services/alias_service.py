@@ -18,11 +18,27 @@ class AliasService:
         self._log: ConditionalLogger = log
         self._aliases = aliases
         self._reversed = reversed_aliases
+        self._generation: int = 0
 
     @property
     def aliases(self):
         return self._aliases
 
+    @property
+    def generation(self) -> int:
+        """Incremented every time aliases are updated, used to invalidate
+        data derived from aliases.
+        """
+        return self._generation
+
+    def update(self,
+               aliases: Dict[str, str],
+               reversed_aliases: Dict[str, str]) -> None:
+        self._aliases = aliases
+        self._reversed = reversed_aliases
+        self._generation += 1
+        self._log.info("Aliases updated")
+
     @property
     def reversed_aliases(self):
         return self._reversed
@@ -1,14 +1,189 @@
 import asyncio
+import functools
+import pickle
+from concurrent.futures import Executor, ThreadPoolExecutor, \
+    ProcessPoolExecutor
+from enum import Enum
+from math import inf
+from time import perf_counter
+from typing import Optional, Dict, Tuple, List, Callable, Any
 
+# functions are sent to the process pool only when they are pickled to at
+# most this many bytes
+MAX_PICKLED_FUNCTION_BYTES = 1024
+
+
+class TaskRunnerBackend(Enum):
+    INLINE = "inline"
+    THREAD = "thread"
+    PROCESS = "process"
+
+
+class TaskTiming:
+    """Timing histogram of a single task."""
+    # upper bounds of histogram buckets [s]
+    BUCKETS: Tuple[float, ...] = (0.0001, 0.001, 0.01, 0.1, inf)
+
+    __slots__ = ("count", "total_s", "buckets")
 
-class CPUIntensiveTaskRunner:
     def __init__(self):
-        # Experimental - uncomment to turn on multiprocessing
-        # self._process_pool = ProcessPoolExecutor()
-        pass
-
-    async def run(self, function, *args):
-        loop = asyncio.get_running_loop()
-        return function(*args)
-        # Experimental - uncomment to turn on multiprocessing
-        # return await loop.run_in_executor(self._process_pool, function, *args)
+        self.count: int = 0
+        self.total_s: float = 0.0
+        self.buckets: List[int] = [0] * len(self.BUCKETS)
+
+    @property
+    def mean_s(self) -> float:
+        return self.total_s / self.count if self.count > 0 else 0.0
+
+    def add(self, duration_s: float) -> None:
+        self.count += 1
+        self.total_s += duration_s
+        for i, bound in enumerate(self.BUCKETS):
+            if duration_s < bound:
+                self.buckets[i] += 1
+                break
+
+
+class CPUIntensiveTaskRunner:
+    """Runs cpu intensive parts of request processing, e.g. splitting,
+    grouping and merging of requests.
+
+    Tasks with inputs smaller than the threshold run inline, switching to
+    another thread or process would cost more than the task itself. Larger
+    tasks are sent to the thread or process pool. Only functions which can
+    be sent to another process in a few bytes are offloaded to the process
+    pool, methods of services, local functions and functions called with
+    arguments which can't be pickled always run inline.
+    """
+    def __init__(self,
+                 backend: TaskRunnerBackend = TaskRunnerBackend.INLINE,
+                 threshold: int = 1000):
+        self._backend: TaskRunnerBackend = backend
+        # number of items (e.g. requests or addresses) in task arguments
+        self._threshold: int = threshold
+        self._executor: Optional[Executor] = None
+        # function -> can be sent to the process pool
+        self._picklable: Dict[Any, bool] = {}
+        # (task name, backend) -> timing
+        self._timings: Dict[Tuple[str, TaskRunnerBackend], TaskTiming] = {}
+
+    @property
+    def backend(self) -> TaskRunnerBackend:
+        return self._backend
+
+    @property
+    def timings(self) -> Dict[Tuple[str, TaskRunnerBackend], TaskTiming]:
+        return self._timings
+
+    async def run(self, function: Callable, *args):
+        backend = self._select_backend(function, args)
+        start = perf_counter()
+
+        if backend == TaskRunnerBackend.INLINE:
+            result = function(*args)
+        else:
+            result = await asyncio.get_running_loop().run_in_executor(
+                self._get_executor(), function, *args
+            )
+
+        self._add_timing(function, backend, perf_counter() - start)
+        return result
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _select_backend(self, function: Callable, args: tuple
+                        ) -> TaskRunnerBackend:
+        if self._backend == TaskRunnerBackend.INLINE:
+            return TaskRunnerBackend.INLINE
+
+        if self._estimate_size(function, args) < self._threshold:
+            return TaskRunnerBackend.INLINE
+
+        if (
+            self._backend == TaskRunnerBackend.PROCESS and
+            not self._is_picklable(function, args)
+        ):
+            return TaskRunnerBackend.INLINE
+
+        return self._backend
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self._backend == TaskRunnerBackend.PROCESS:
+                self._executor = ProcessPoolExecutor()
+            else:
+                self._executor = ThreadPoolExecutor(
+                    thread_name_prefix="TaskRunner"
+                )
+        return self._executor
+
+    def _is_picklable(self, function: Callable, args: tuple) -> bool:
+        key = self._get_key(function)
+        picklable = self._picklable.get(key)
+        if picklable is None:
+            picklable = self._check_picklable(function, args)
+            self._picklable[key] = picklable
+        return picklable
+
+    @classmethod
+    def _check_picklable(cls, function: Callable, args: tuple) -> bool:
+        """Checks whether the function and its arguments can be sent to
+        another process. A function is called with arguments of the same
+        types each time, so only its first call is checked.
+        """
+        func = function.func \
+            if isinstance(function, functools.partial) \
+            else function
+
+        # instance of a bound method is sent along with each call
+        try:
+            if len(pickle.dumps(func)) > MAX_PICKLED_FUNCTION_BYTES:
+                return False
+            pickle.dumps((function, args))
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return False
+
+        return True
+
+    def _add_timing(self,
+                    function: Callable,
+                    backend: TaskRunnerBackend,
+                    duration_s: float) -> None:
+        key = (self._get_name(function), backend)
+        timing = self._timings.get(key)
+        if timing is None:
+            timing = self._timings[key] = TaskTiming()
+        timing.add(duration_s)
+
+    @staticmethod
+    def _get_key(function: Callable):
+        if isinstance(function, functools.partial):
+            function = function.func
+        return getattr(function, "__func__", function)
+
+    @classmethod
+    def _get_name(cls, function: Callable) -> str:
+        function = cls._get_key(function)
+        return getattr(function, "__qualname__", repr(function))
+
+    @staticmethod
+    def _estimate_size(function: Callable, args: tuple) -> int:
+        """Returns number of items in the arguments, nested collections of
+        tuple arguments are counted as well.
+        """
+        if isinstance(function, functools.partial):
+            args = function.args + args
+
+        size = 0
+        for arg in args:
+            if isinstance(arg, tuple):
+                for item in arg:
+                    size += len(item) if isinstance(
+                        item, (list, tuple, dict, set)
+                    ) else 1
+            elif isinstance(arg, (list, dict, set)):
+                size += len(arg)
+        return size
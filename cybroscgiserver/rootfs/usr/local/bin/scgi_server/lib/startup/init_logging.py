@@ -48,6 +48,17 @@ def init_logging(log_config: DebugLogConfig,
         )
 
 
+def set_logging_level(level: str) -> None:
+    """Changes level of the root logger and the log file.
+    """
+    root = logging.getLogger()
+    root.setLevel(level)
+
+    for handler in root.handlers:
+        if isinstance(handler, logging.handlers.RotatingFileHandler):
+            handler.setLevel(level)
+
+
 def _create_file_handler(level: str,
                          log_dir: Path,
                          filename: str,
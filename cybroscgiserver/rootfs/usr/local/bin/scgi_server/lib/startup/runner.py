@@ -4,7 +4,7 @@ import sys
 from asyncio import AbstractEventLoop
 from enum import Enum
 from threading import Thread
-from typing import Callable, Coroutine, Tuple, Any, Dict
+from typing import Callable, Coroutine, Tuple, Any, Dict, Optional
 
 from lib.config.loader import ConfigLoaderFileNotFoundError
 
@@ -50,19 +50,30 @@ def _exception_handler(context: Dict[str, Any],
 
 def run(
     main_coro: Callable[
-        [AbstractEventLoop, AbstractEventLoop],
+        [AbstractEventLoop, Callable[[], AbstractEventLoop]],
         Coroutine[None, None, None]
     ]
 ) -> None:
-    # Create communication loop which will handle abus-related data flow
-    # throughout the application.
-    # Everything else will be done on main thread (the one this code is
-    # currently running on).
+    # Communication loop handles abus-related data flow throughout the
+    # application, it is created on the first call of
+    # get_communication_loop. Everything else will be done on main thread
+    # (the one this code is currently running on).
     #asyncio.run(_run(main_coro))
 
-    communication_loop, kill_communication_loop = (
-        create_thread_loop("CommunicationThread")
-    )
+    communication_loop: Optional[AbstractEventLoop] = None
+    kill_communication_thread: Optional[Callable] = None
+
+    def get_communication_loop() -> AbstractEventLoop:
+        nonlocal communication_loop, kill_communication_thread
+        if communication_loop is None:
+            communication_loop, kill_communication_thread = (
+                create_thread_loop("CommunicationThread")
+            )
+        return communication_loop
+
+    def kill_communication_loop():
+        if kill_communication_thread is not None:
+            kill_communication_thread()
 
     running_loop = asyncio.new_event_loop()
     completed = running_loop.create_future()
@@ -81,7 +92,9 @@ def run(
                 context, kill_run_loop, exit_code
             )
         )
-        running_loop.create_task(main_coro(running_loop, communication_loop))
+        running_loop.create_task(
+            main_coro(running_loop, get_communication_loop)
+        )
         running_loop.run_until_complete(completed)
         running_loop.close()
         print("x")
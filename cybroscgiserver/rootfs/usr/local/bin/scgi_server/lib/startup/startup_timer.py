@@ -0,0 +1,30 @@
+from time import perf_counter
+from typing import List, Tuple, Optional
+
+
+class StartupTimer:
+    """Measures duration of startup phases.
+
+    Each call of `mark` ends the current phase and starts the next one.
+    """
+    def __init__(self, start: Optional[float] = None):
+        # time.perf_counter() based
+        self._start: float = perf_counter() if start is None else start
+        self._last: float = self._start
+        self._phases: List[Tuple[str, float]] = []
+
+    def mark(self, phase: str) -> None:
+        now = perf_counter()
+        self._phases.append((phase, now - self._last))
+        self._last = now
+
+    @property
+    def total_s(self) -> float:
+        return self._last - self._start
+
+    def __str__(self):
+        phases = ", ".join(
+            f"{phase} {duration * 1000:.0f} ms"
+            for phase, duration in self._phases
+        )
+        return f"{phases}, total {self.total_s * 1000:.0f} ms"
@@ -1,12 +1,19 @@
 #!/usr/bin/env python
+from time import perf_counter
+
+# start of imports, used to report startup time
+_IMPORT_START = perf_counter()
+
 import logging
 import sys
 from asyncio import AbstractEventLoop
+from typing import Callable
 
 from lib.config.loader import read_config_from_file
 from lib.general.paths import CONFIG_FILE
 from lib.startup.init_logging import init_logging
 from lib.startup.runner import run
+from lib.startup.startup_timer import StartupTimer
 from scgi_server.local.config.config.config import Config
 from scgi_server.local.config.config.config_defaults import DEFAULT_CONFIG
 from scgi_server.local.container import Container
@@ -15,13 +22,22 @@ from scgi_server.local.errors import ScgiServerError
 
 async def main(
     main_loop: AbstractEventLoop,
-    comm_loop: AbstractEventLoop
+    get_comm_loop: Callable[[], AbstractEventLoop]
 ) -> None:
+    startup_timer = StartupTimer(_IMPORT_START)
+    startup_timer.mark("imports")
+
     try:
         config = read_config_from_file(CONFIG_FILE, Config, DEFAULT_CONFIG)
         init_logging(config.debuglog_config,
                      config.locations_config.log_dir,
                      "scgi")
+        startup_timer.mark("config")
+
+        if config.abus_config.single_loop:
+            comm_loop = main_loop
+        else:
+            comm_loop = get_comm_loop()
 
         container = Container(
             config,
@@ -29,8 +45,10 @@ async def main(
             comm_loop,
             sys.argv[0]
         )
+        bootstrap = container.scgi_server_bootstrap
+        startup_timer.mark("container")
 
-        await container.scgi_server_bootstrap.run()
+        await bootstrap.run(startup_timer)
     except ScgiServerError as e:
         logging.critical(e)
 
@@ -1,9 +1,16 @@
+import asyncio
+import signal
+from typing import Optional, TYPE_CHECKING
+
 from lib.general.conditional_logger import ConditionalLogger
 from lib.general.file_watcher import FileWatcher
-from scgi_server.local.input_output.abus_stack.can_protocol.can_transceiver \
-    import CanTransceiver
+from lib.general.loop_watchdog import LoopWatchdog
+from lib.general.sampling_profiler import SamplingProfiler
+from lib.startup.startup_timer import StartupTimer
+from scgi_server.local.defaults import PROFILER_SIGNAL_DURATION
 from scgi_server.local.input_output.abus_stack.udp.udp_transceiver import \
     UdpTransceiver
+from scgi_server.local.input_output.ipc.rw_ipc_server import RWIpcServer
 from scgi_server.local.input_output.tcp.server import TCPServer
 from scgi_server.local.services.plc_info_service.plc_info_cleaner import \
     PlcInfoCleaner
@@ -11,8 +18,17 @@ from scgi_server.local.services.plc_info_service.plc_info_service import \
     PlcInfoService
 from scgi_server.local.services.rw_service.subservices.plc_comm_service. \
     alc_service.alc_service import AlcService
+from scgi_server.local.services.rw_service.subservices.plc_comm_service. \
+    plc_cache.cache_poller import CachePoller
 from scgi_server.local.services.rw_service.subservices.plc_comm_service. \
     plc_client_manager.plc_client_manager import PlcClientManager
+from scgi_server.local.services.snapshot_service.snapshot_service import \
+    SnapshotService
+from scgi_server.local.worker.worker_pool import WorkerPool
+
+if TYPE_CHECKING:
+    from scgi_server.local.input_output.abus_stack.can_protocol \
+        .can_transceiver import CanTransceiver
 
 
 class Bootstrap:
@@ -26,10 +42,16 @@ class Bootstrap:
             plc_client_manager: PlcClientManager,
             alc_service: AlcService,
             udp_transceiver: UdpTransceiver,
-            can_transceiver: CanTransceiver,
+            can_transceiver: Optional['CanTransceiver'],
             tcp_server: TCPServer,
             plc_info_cleaner: PlcInfoCleaner,
             file_watcher: FileWatcher,
+            cache_poller: Optional[CachePoller],
+            snapshot_service: Optional[SnapshotService],
+            rw_ipc_server: Optional[RWIpcServer],
+            worker_pool: Optional[WorkerPool],
+            sampling_profiler: SamplingProfiler,
+            loop_watchdog: LoopWatchdog,
             eth_enabled: bool,
             can_enabled: bool
     ):
@@ -38,19 +60,34 @@ class Bootstrap:
         self._plc_client_manager: PlcClientManager = plc_client_manager
         self._alc_service: AlcService = alc_service
         self._udp_transceiver: UdpTransceiver = udp_transceiver
-        self._can_transceiver: CanTransceiver = can_transceiver
+        # can stack is imported only when can is enabled
+        self._can_transceiver: Optional['CanTransceiver'] = can_transceiver
         self._tcp_server: TCPServer = tcp_server
         self._plc_info_cleaner: PlcInfoCleaner = plc_info_cleaner
         self._file_watcher = file_watcher
+        self._cache_poller: Optional[CachePoller] = cache_poller
+        self._snapshot_service: Optional[SnapshotService] = snapshot_service
+        self._rw_ipc_server: Optional[RWIpcServer] = rw_ipc_server
+        self._worker_pool: Optional[WorkerPool] = worker_pool
+        self._sampling_profiler: SamplingProfiler = sampling_profiler
+        self._loop_watchdog: LoopWatchdog = loop_watchdog
         self._eth_enabled: bool = eth_enabled
         self._can_enabled: bool = can_enabled
 
-    async def run(self) -> None:
+    async def run(self, startup_timer: Optional[StartupTimer] = None) -> None:
+        """Starts listeners first, so the server answers as soon as
+        possible, alc files are loaded in the background.
+        """
+        if startup_timer is None:
+            startup_timer = StartupTimer()
+
         self._plc_info_service.set_plc_client_manager(self._plc_client_manager)
         self._plc_info_service.load_static_plc_infos()
 
-        self._log.info('Initializing alc service with alc files')
-        await self._alc_service.initialize_with_alc_files()
+        if self._snapshot_service is not None:
+            self._log.info('Restoring snapshot')
+            await self._snapshot_service.restore()
+        startup_timer.mark("plc infos")
 
         if self._eth_enabled:
             self._log.info('Initializing UDP communication')
@@ -60,14 +97,55 @@ class Bootstrap:
 
         self._log.info('Initializing TCP communication')
         await self._tcp_server.start()
+        startup_timer.mark("listeners")
+
+        if self._worker_pool is not None:
+            self._log.info(f'Starting {self._worker_pool.count} scgi workers')
+            await self._rw_ipc_server.start()
+            await self._tcp_server.start_ws_relay(
+                self._worker_pool.ws_relay_path
+            )
+            self._worker_pool.start()
+            startup_timer.mark("workers")
+
+        self._log.info('Loading alc files in the background')
+        self._alc_service.start_loading_alc_files()
 
         if self._can_enabled:
             self._log.info('Initializing CAN communication')
             self._can_transceiver.start()
+            startup_timer.mark("can")
         else:
             self._log.info('Skipped CAN initialization')
 
+        if self._cache_poller is not None:
+            self._log.info('Starting cache poller')
+            self._cache_poller.start()
+
+        if self._snapshot_service is not None:
+            self._snapshot_service.start()
+
         self._log.debug('Starting plc info cleaner')
         self._plc_info_cleaner.start()
         self._log.debug('Starting file watcher')
         self._file_watcher.start()
+        self._log.debug('Starting loop watchdog')
+        self._loop_watchdog.start()
+
+        try:
+            asyncio.get_running_loop().add_signal_handler(
+                signal.SIGUSR1, self._toggle_profiler
+            )
+        except (NotImplementedError, RuntimeError, AttributeError):
+            # not supported on windows
+            pass
+
+        startup_timer.mark("services")
+
+        self._log.info(f"Started in {startup_timer}")
+
+    def _toggle_profiler(self) -> None:
+        if self._sampling_profiler.is_running:
+            self._sampling_profiler.stop()
+        else:
+            self._sampling_profiler.start(PROFILER_SIGNAL_DURATION)
@@ -11,7 +11,8 @@ class AbusConfig:
     def create(cls,
                timeout_ms: timedelta,
                number_of_retries: int,
-               password: Union[int, str]):
+               password: Union[int, str],
+               single_loop: bool):
         try:
             password = None if password == "" else int(password)
         except ValueError:
@@ -21,17 +22,21 @@ class AbusConfig:
             timedelta(milliseconds=timeout_ms),
             number_of_retries,
             password,
+            single_loop,
         )
 
     timeout_ms: timedelta
     number_of_retries: int
     password: Optional[int]
+    # a-bus communication runs on the main loop instead of a separate thread
+    single_loop: bool
 
-    def props(self) -> Tuple[float, int, str]:
+    def props(self) -> Tuple[float, int, str, bool]:
         return (
             self.timeout_ms.total_seconds() * 1000,
             self.number_of_retries,
             "" if self.password is None else str(self.password),
+            self.single_loop,
         )
 
     @classmethod
@@ -42,6 +47,7 @@ class AbusConfig:
             timeout_ms,
             number_of_retries,
             password,
+            single_loop,
         ) = default.props()
 
         return cls.create(
@@ -49,4 +55,5 @@ class AbusConfig:
             cp.getint(section, "number_of_retries",
                       fallback=number_of_retries),
             cp.get(section, "password", fallback=password),
+            cp.getboolean(section, "single_loop", fallback=single_loop),
         )
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from datetime import timedelta
-from typing import Tuple
+from typing import Tuple, List
 
 
 @dataclass(frozen=True)
@@ -9,30 +9,89 @@ class CacheConfig:
     def create(cls,
                request_period_s: float,
                valid_period_s: float,
-               cleanup_period_s: float):
+               cleanup_period_s: float,
+               poll_period_s: float,
+               poll_idle_period_s: float,
+               poll_tags: List[str],
+               max_entries: int,
+               max_size_kb: int,
+               snapshot_period_s: float,
+               snapshot_max_age_s: float):
         return CacheConfig(
             timedelta(seconds=request_period_s),
             timedelta(seconds=valid_period_s),
-            timedelta(seconds=cleanup_period_s)
+            timedelta(seconds=cleanup_period_s),
+            timedelta(seconds=poll_period_s),
+            timedelta(seconds=poll_idle_period_s),
+            poll_tags,
+            max_entries,
+            max_size_kb,
+            timedelta(seconds=snapshot_period_s),
+            timedelta(seconds=snapshot_max_age_s)
         )
 
     request_period: timedelta
     valid_period: timedelta
     cleanup_period_s: timedelta
+    poll_period: timedelta
+    poll_idle_period: timedelta
+    poll_tags: List[str]
+    max_entries: int
+    max_size_kb: int
+    snapshot_period: timedelta
+    snapshot_max_age: timedelta
 
-    def props(self) -> Tuple[float, float, float]:
+    def props(self) -> Tuple[
+        float, float, float, float, float, List[str], int, int, float, float
+    ]:
         return self.request_period.total_seconds(), \
                self.valid_period.total_seconds(), \
-               self.cleanup_period_s.total_seconds()
+               self.cleanup_period_s.total_seconds(), \
+               self.poll_period.total_seconds(), \
+               self.poll_idle_period.total_seconds(), \
+               self.poll_tags, \
+               self.max_entries, \
+               self.max_size_kb, \
+               self.snapshot_period.total_seconds(), \
+               self.snapshot_max_age.total_seconds()
 
     @classmethod
     def load(cls, cp: 'ConfigParser', default: 'Config'):
         section = "CACHE"
 
-        request_period_s, valid_period_s, cleanup_period_s = default.props()
+        (
+            request_period_s,
+            valid_period_s,
+            cleanup_period_s,
+            poll_period_s,
+            poll_idle_period_s,
+            poll_tags,
+            max_entries,
+            max_size_kb,
+            snapshot_period_s,
+            snapshot_max_age_s
+        ) = default.props()
+
+        poll_tags_from_conf = cp.get(section, "poll_tags", fallback=None)
+        if poll_tags_from_conf is not None:
+            poll_tags = [
+                tag.strip()
+                for tag in poll_tags_from_conf.split(",")
+                if tag.strip() != ""
+            ]
 
         return cls.create(
             cp.getint(section, "request_period_s", fallback=request_period_s),
             cp.getint(section, "valid_period_s", fallback=valid_period_s),
-            cp.getint(section, "cleanup_period_s", fallback=cleanup_period_s)
+            cp.getint(section, "cleanup_period_s", fallback=cleanup_period_s),
+            cp.getfloat(section, "poll_period_s", fallback=poll_period_s),
+            cp.getint(section, "poll_idle_period_s",
+                      fallback=poll_idle_period_s),
+            poll_tags,
+            cp.getint(section, "max_entries", fallback=max_entries),
+            cp.getint(section, "max_size_kb", fallback=max_size_kb),
+            cp.getint(section, "snapshot_period_s",
+                      fallback=snapshot_period_s),
+            cp.getint(section, "snapshot_max_age_s",
+                      fallback=snapshot_max_age_s)
         )
@@ -14,6 +14,8 @@ from lib.config.config.scgi_config import ScgiConfig
 from scgi_server.local.config.config.static_plcs_config import \
     StaticPlcsConfig
 from lib.general.paths import APP_DIR
+from lib.input_output.websocket.send_queue import DropPolicy
+from lib.services.cpu_intensive_task_runner import TaskRunnerBackend
 
 DEFAULT_CONFIG = Config(
     EthConfig(
@@ -37,12 +39,20 @@ DEFAULT_CONFIG = Config(
     AbusConfig(
         timeout_ms=timedelta(milliseconds=200),
         number_of_retries=3,
-        password=None
+        password=None,
+        single_loop=False
     ),
     CacheConfig(
         request_period=timedelta(seconds=0),
         valid_period=timedelta(seconds=0),
-        cleanup_period_s=timedelta(seconds=0)
+        cleanup_period_s=timedelta(seconds=0),
+        poll_period=timedelta(seconds=0),
+        poll_idle_period=timedelta(seconds=300),
+        poll_tags=[],
+        max_entries=100000,
+        max_size_kb=32768,
+        snapshot_period=timedelta(seconds=0),
+        snapshot_max_age=timedelta(hours=1)
     ),
     ScgiConfig(
         scgi_bind_address='',
@@ -53,7 +63,15 @@ DEFAULT_CONFIG = Config(
         access_token=None,
         server_address=None,
         keepalive=.0,
-        only_user_variables=False
+        only_user_variables=False,
+        compression_min_bytes=1024,
+        ws_queue_size=64,
+        ws_drop_policy=DropPolicy.DROP_OLDEST,
+        write_coalesce_ms=0,
+        read_after_write=True,
+        task_runner=TaskRunnerBackend.INLINE,
+        task_runner_threshold=1000,
+        workers=0
     ),
     LocationsConfig(
         app_dir=APP_DIR,
@@ -65,7 +83,8 @@ DEFAULT_CONFIG = Config(
         log_to_file=True,
         verbose_level="DEBUG",
         max_log_file_size_kb=1024,
-        max_log_backup_count=5
+        max_log_backup_count=5,
+        trace_requests=0
     ),
     StaticPlcsConfig(
         static_plcs_configs=[]
@@ -0,0 +1,156 @@
+from dataclasses import replace
+from datetime import timedelta
+from pathlib import Path
+from typing import Callable, Awaitable, Optional, List
+
+from lib.config.loader import read_config_from_file
+from lib.general.conditional_logger import ConditionalLogger
+from lib.services.alias_service import AliasService
+from lib.startup.init_logging import set_logging_level
+from scgi_server.local.config.config.config import Config
+from scgi_server.local.services.plc_info_service.plc_info_service import \
+    PlcInfoService
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_cache.plc_cache import PlcCache
+from scgi_server.local.services.socket_service.socket_service import \
+    SocketService
+
+
+class ConfigReloader:
+    """Applies changes of the configuration file without restarting the
+    server.
+
+    Aliases, static controllers, socket definitions, cache periods and
+    limits and the log level are changed in place. Any other change, e.g. a
+    port or bind address, needs a restart.
+    """
+    def __init__(self,
+                 log: ConditionalLogger,
+                 config_file: Path,
+                 config: Config,
+                 default_config: Config,
+                 alias_service: AliasService,
+                 plc_info_service: PlcInfoService,
+                 socket_service: SocketService,
+                 plc_cache: Optional[PlcCache],
+                 restart: Callable[[], Awaitable[None]]):
+        self._log: ConditionalLogger = log
+        self._config_file: Path = config_file
+        self._config: Config = config
+        self._default_config: Config = default_config
+        self._alias_service: AliasService = alias_service
+        self._plc_info_service: PlcInfoService = plc_info_service
+        self._socket_service: SocketService = socket_service
+        self._plc_cache: Optional[PlcCache] = plc_cache
+        self._restart: Callable[[], Awaitable[None]] = restart
+
+    @property
+    def config(self) -> Config:
+        return self._config
+
+    async def reload(self) -> None:
+        try:
+            new_config = read_config_from_file(
+                str(self._config_file), Config, self._default_config
+            )
+        except Exception as e:
+            self._log.error(f"Config not reloaded, can't read "
+                            f"{self._config_file}: {e}")
+            return
+
+        old_config = self._config
+        if new_config == old_config:
+            return
+
+        restart_reasons = self.get_restart_reasons(old_config, new_config)
+        if len(restart_reasons) > 0:
+            self._log.info(f"Restarting, changed: "
+                           f"{', '.join(restart_reasons)}")
+            await self._restart()
+            return
+
+        await self._apply(old_config, new_config)
+        self._config = new_config
+        self._log.info("Config reloaded")
+
+    @classmethod
+    def get_restart_reasons(cls,
+                            old_config: Config,
+                            new_config: Config) -> List[str]:
+        """Returns names of changed config sections which can't be applied
+        without a restart.
+        """
+        reasons = []
+
+        if (
+            replace(old_config.eth_config, sockets={}) !=
+            replace(new_config.eth_config, sockets={})
+        ):
+            reasons.append("ETH")
+        if old_config.push_config != new_config.push_config:
+            reasons.append("PUSH")
+        if old_config.can_config != new_config.can_config:
+            reasons.append("CAN")
+        if old_config.abus_config != new_config.abus_config:
+            reasons.append("ABUS")
+        if (
+            cls._without_hot_cache_options(old_config) !=
+            cls._without_hot_cache_options(new_config)
+        ):
+            reasons.append("CACHE")
+        if old_config.scgi_config != new_config.scgi_config:
+            reasons.append("SCGI")
+        if (
+            new_config.scgi_config.workers > 0 and
+            old_config.alias_config.aliases != new_config.alias_config.aliases
+        ):
+            # scgi workers read aliases only at startup
+            reasons.append("ALIAS")
+        if old_config.locations_config != new_config.locations_config:
+            reasons.append("LOCATIONS")
+        if (
+            replace(old_config.debuglog_config, verbose_level="") !=
+            replace(new_config.debuglog_config, verbose_level="")
+        ):
+            reasons.append("DEBUGLOG")
+
+        return reasons
+
+    async def _apply(self, old_config: Config, new_config: Config) -> None:
+        new_aliases = new_config.alias_config
+        if old_config.alias_config.aliases != new_aliases.aliases:
+            self._alias_service.update(new_aliases.aliases,
+                                       new_aliases.reversed)
+
+        if old_config.static_plcs_config != new_config.static_plcs_config:
+            await self._plc_info_service.update_static_plc_infos(
+                new_config.static_plcs_config.static_plcs_configs
+            )
+            self._log.info("Static controllers updated")
+
+        if old_config.eth_config.sockets != new_config.eth_config.sockets:
+            self._socket_service.set_sockets(new_config.eth_config.sockets)
+
+        old_cache = old_config.cache_config
+        new_cache = new_config.cache_config
+        if self._plc_cache is not None and old_cache != new_cache:
+            self._plc_cache.set_periods(new_cache.request_period,
+                                        new_cache.valid_period)
+            self._plc_cache.set_limits(new_cache.max_entries,
+                                       new_cache.max_size_kb * 1024)
+            self._log.info("Cache settings updated")
+
+        old_level = old_config.debuglog_config.verbose_level
+        new_level = new_config.debuglog_config.verbose_level
+        if old_level != new_level and new_config.debuglog_config.enabled:
+            set_logging_level(new_level)
+            self._log.info(f"Log level changed to {new_level}")
+
+    @staticmethod
+    def _without_hot_cache_options(config: Config):
+        cache_config = config.cache_config
+        return replace(cache_config,
+                       request_period=timedelta(0),
+                       valid_period=timedelta(0),
+                       max_entries=0,
+                       max_size_kb=0)
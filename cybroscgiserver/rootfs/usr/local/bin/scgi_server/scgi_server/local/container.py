@@ -1,32 +1,49 @@
+import asyncio
 from asyncio import AbstractEventLoop
-from typing import Optional
+from datetime import timedelta
+from typing import Optional, TYPE_CHECKING
 
 from scgi_server import CONFIG_FILE
 from lib.general.conditional_logger import get_logger
 from lib.general.file_watcher import FileWatcher
+from lib.general.loop_watchdog import LoopWatchdog
+from lib.general.metrics import MetricsRegistry
 from lib.general.paths import APP_DIR
+from lib.general.sampling_profiler import SamplingProfiler
+from lib.general.tracing import Tracer
 from lib.services.alias_service import AliasService
 from lib.services.cpu_intensive_task_runner import \
     CPUIntensiveTaskRunner
 from scgi_server.local.bootstrap import Bootstrap
 from scgi_server.local.config.config.config import Config
+from scgi_server.local.config.config.config_defaults import DEFAULT_CONFIG
+from scgi_server.local.config.config_reloader import ConfigReloader
 from scgi_server.local.data_logger.data_logger_cache import DataLoggerCache
+from scgi_server.local.defaults import PROGRAM_RESPONSE_CACHE_SIZE, \
+    QUERY_PLAN_CACHE_SIZE, READ_PLAN_CACHE_SIZE, MIN_SUBSCRIPTION_INTERVAL, \
+    PLC_CACHE_IDLE_PERIOD, MAX_BACKGROUND_REFRESHES, SNAPSHOT_FILE_NAME, \
+    IPC_DIR_NAME, RW_IPC_SOCKET_NAME, WS_RELAY_SOCKET_NAME, \
+    WORKER_CHECK_PERIOD, PROFILER_INTERVAL, PROFILER_MAX_OVERHEAD, \
+    PROFILER_SUBSYSTEMS, LOOP_WATCHDOG_PERIOD, LOOP_LAG_THRESHOLD
 from scgi_server.local.general.logger_names import LoggerNames
 from scgi_server.local.input_output.abus_stack.abus.abus_transceiver import \
     AbusTransceiver
-from scgi_server.local.input_output.abus_stack.can_protocol.can_transceiver \
-    import CanTransceiver
-from scgi_server.local.input_output.abus_stack.can_protocol.iex_transceiver \
-    import IexTransceiver
 from scgi_server.local.input_output.abus_stack.router import Router
 from scgi_server.local.input_output.abus_stack.udp.udp_activity_service \
     import UdpActivityService
 from scgi_server.local.input_output.abus_stack.udp.udp_transceiver import \
     UdpTransceiver
+from scgi_server.local.input_output.ipc.rw_ipc_server import RWIpcServer
+from scgi_server.local.input_output.scgi.program_response_cache import \
+    ProgramResponseCache
+from scgi_server.local.input_output.scgi.query_plan_cache import \
+    QueryPlanCache
 from scgi_server.local.input_output.scgi.scgi_activity_service import \
     ScgiActivityService
 from scgi_server.local.input_output.scgi.scgi_server import ScgiServer
 from scgi_server.local.input_output.tcp.server import TCPServer
+from scgi_server.local.input_output.websocket.websocket_activity_service \
+    import WebSocketActivityService
 from scgi_server.local.services.plc_detection_service.plc_detection_service \
     import PlcDetectionService
 from scgi_server.local.services.plc_info_service.plc_info_cleaner import \
@@ -41,22 +58,43 @@ from scgi_server.local.services.rw_service.subservices.plc_activity_service \
     .plc_activity_service import PlcActivityService
 from scgi_server.local.services.rw_service.subservices.plc_comm_service \
     .alc_service.alc_service import AlcService
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_cache.cache_budget import CacheBudget
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_cache.cache_poller import CachePoller
 from scgi_server.local.services.rw_service.subservices.plc_comm_service \
     .plc_cache.plc_cache import PlcCache
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_cache.revalidation_coordinator import RevalidationCoordinator
 from scgi_server.local.services.rw_service.subservices.plc_comm_service \
     .plc_client_manager.plc_client_manager import PlcClientManager
 from scgi_server.local.services.rw_service.subservices.plc_comm_service \
     .plc_comm_service import PlcCommService
+from scgi_server.local.services.snapshot_service.snapshot_service import \
+    SnapshotService
 from scgi_server.local.services.socket_service.socket_service import \
     SocketService
+from scgi_server.local.services.subscription_service.subscription_service \
+    import SubscriptionService
 from scgi_server.local.services.status_services.facade \
     .plc_status_service_facade import PlcStatusServiceFacade
 from scgi_server.local.services.status_services.facade \
     .system_status_service_facade import SystemStatusServiceFacade
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .read_plan_cache import ReadPlanCache
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .write_coalescer import WriteCoalescer
 from scgi_server.local.services.status_services.plc_status_service \
     .plc_status_service import PlcStatusService
 from scgi_server.local.services.status_services.system_status_service import \
     SystemStatusService
+from scgi_server.local.worker.worker_pool import WorkerPool
+
+if TYPE_CHECKING:
+    from scgi_server.local.input_output.abus_stack.can_protocol \
+        .can_transceiver import CanTransceiver
+    from scgi_server.local.input_output.abus_stack.can_protocol \
+        .iex_transceiver import IexTransceiver
 
 
 class Container:
@@ -77,6 +115,9 @@ class Container:
         self._plc_activity_service: Optional[PlcActivityService] = None
         self._scgi_activity_service: Optional[ScgiActivityService] = None
         self._push_activity_service: Optional[PushActivityService] = None
+        self._websocket_activity_service: (
+                Optional[WebSocketActivityService]
+        ) = None
         self._data_logger_cache: Optional[DataLoggerCache] = None
         self._plc_info_service: Optional[PlcInfoService] = None
         self._alc_service: Optional[AlcService] = None
@@ -90,28 +131,96 @@ class Container:
         self._push_service: Optional[PushService] = None
         self._plc_client_manager: Optional[PlcClientManager] = None
         self._plc_cache: Optional[PlcCache] = None
+        self._cache_poller: Optional[CachePoller] = None
+        self._snapshot_service: Optional[SnapshotService] = None
+        self._revalidation_coordinator: (
+                Optional[RevalidationCoordinator]
+        ) = None
+        self._write_coalescer: Optional[WriteCoalescer] = None
         self._plc_communication_service: Optional[PlcCommService] = None
+        self._read_plan_cache: Optional[ReadPlanCache] = None
         self._rw_service: Optional[RWService] = None
         self._router: Optional[Router] = None
         self._abus_transceiver: Optional[AbusTransceiver] = None
         self._udp_transceiver: Optional[UdpTransceiver] = None
-        self._can_transceiver: Optional[CanTransceiver] = None
-        self._iex_transceiver: Optional[IexTransceiver] = None
+        # can stack is imported only when can is enabled
+        self._can_transceiver: Optional['CanTransceiver'] = None
+        self._iex_transceiver: Optional['IexTransceiver'] = None
         self._scgi_server: Optional[ScgiServer] = None
+        self._program_response_cache: Optional[ProgramResponseCache] = None
+        self._query_plan_cache: Optional[QueryPlanCache] = None
         self._tcp_server: Optional[TCPServer] = None
+        self._subscription_service: Optional[SubscriptionService] = None
+        self._rw_ipc_server: Optional[RWIpcServer] = None
+        self._worker_pool: Optional[WorkerPool] = None
         self._file_watcher: Optional[FileWatcher] = None
+        self._config_reloader: Optional[ConfigReloader] = None
         self._scgi_server_bootstrap: Optional[Bootstrap] = None
         self._cpu_intensive_task_runner: Optional[CPUIntensiveTaskRunner] = None
+        self._metrics_registry: Optional[MetricsRegistry] = None
+        self._tracer: Optional[Tracer] = None
+        self._sampling_profiler: Optional[SamplingProfiler] = None
+        self._loop_watchdog: Optional[LoopWatchdog] = None
         self._plc_info_cleaner: Optional[PlcInfoCleaner] = None
         self._socket_service: Optional[SocketService] = None
 
     @property
     def cpu_intensive_task_runner(self) -> CPUIntensiveTaskRunner:
         if self._cpu_intensive_task_runner is None:
-            self._cpu_intensive_task_runner = CPUIntensiveTaskRunner()
+            self._cpu_intensive_task_runner = CPUIntensiveTaskRunner(
+                self.config.scgi_config.task_runner,
+                self.config.scgi_config.task_runner_threshold
+            )
 
         return self._cpu_intensive_task_runner
 
+    @property
+    def metrics_registry(self) -> MetricsRegistry:
+        if self._metrics_registry is None:
+            self._metrics_registry = MetricsRegistry()
+
+        return self._metrics_registry
+
+    @property
+    def tracer(self) -> Optional[Tracer]:
+        if self.config.debuglog_config.trace_requests == 0:
+            return None
+
+        if self._tracer is None:
+            self._tracer = Tracer(self.config.debuglog_config.trace_requests)
+
+        return self._tracer
+
+    @property
+    def sampling_profiler(self) -> SamplingProfiler:
+        if self._sampling_profiler is None:
+            self._sampling_profiler = SamplingProfiler(
+                get_logger(LoggerNames.PROFILER.name),
+                self.config.locations_config.log_dir,
+                ("MainThread", "CommunicationThread"),
+                PROFILER_SUBSYSTEMS,
+                PROFILER_INTERVAL,
+                PROFILER_MAX_OVERHEAD
+            )
+
+        return self._sampling_profiler
+
+    @property
+    def loop_watchdog(self) -> LoopWatchdog:
+        if self._loop_watchdog is None:
+            self._loop_watchdog = LoopWatchdog(
+                get_logger(LoggerNames.WATCHDOG.name),
+                self.metrics_registry,
+                LOOP_WATCHDOG_PERIOD,
+                LOOP_LAG_THRESHOLD
+            )
+            self._loop_watchdog.watch(self.main_loop, "main")
+            if self.communication_loop is not self.main_loop:
+                self._loop_watchdog.watch(self.communication_loop,
+                                          "communication")
+
+        return self._loop_watchdog
+
     @property
     def alias_service(self) -> AliasService:
         if self._alias_service is None:
@@ -134,7 +243,9 @@ class Container:
     @property
     def plc_activity_service(self) -> PlcActivityService:
         if self._plc_activity_service is None:
-            self._plc_activity_service = PlcActivityService()
+            self._plc_activity_service = PlcActivityService(
+                self.metrics_registry
+            )
 
         return self._plc_activity_service
 
@@ -152,19 +263,58 @@ class Container:
 
         return self._push_activity_service
 
+    @property
+    def websocket_activity_service(self) -> WebSocketActivityService:
+        if self._websocket_activity_service is None:
+            self._websocket_activity_service = WebSocketActivityService()
+
+        return self._websocket_activity_service
+
     @property
     def file_watcher(self) -> FileWatcher:
         if self._file_watcher is None:
-            log = get_logger(LoggerNames.FILE_WATCHER.name)
+            config_reloader = self.config_reloader
+
+            # called from the watchdog thread
+            def reload() -> None:
+                asyncio.run_coroutine_threadsafe(config_reloader.reload(),
+                                                 self.main_loop)
+
             self._file_watcher = FileWatcher(
                 self.main_loop,
-                log,
+                get_logger(LoggerNames.FILE_WATCHER.name),
                 APP_DIR,
-                {CONFIG_FILE: lambda: FileWatcher.restart(log)}
+                {CONFIG_FILE: reload}
             )
 
         return self._file_watcher
 
+    @property
+    def config_reloader(self) -> ConfigReloader:
+        if self._config_reloader is None:
+            log = get_logger(LoggerNames.FILE_WATCHER.name)
+
+            async def restart() -> None:
+                if self.snapshot_service is not None:
+                    await self.snapshot_service.save()
+                if self.worker_pool is not None:
+                    self.worker_pool.stop()
+                FileWatcher.restart(log)
+
+            self._config_reloader = ConfigReloader(
+                log,
+                CONFIG_FILE,
+                self.config,
+                DEFAULT_CONFIG,
+                self.alias_service,
+                self.plc_info_service,
+                self.socket_service,
+                self.plc_cache,
+                restart
+            )
+
+        return self._config_reloader
+
     # endregion
 
     @property
@@ -212,6 +362,12 @@ class Container:
                 self.plc_activity_service,
                 self.udp_activity_service,
                 self.plc_status_service,
+                self.read_plan_cache,
+                self.websocket_activity_service,
+                self.cpu_intensive_task_runner,
+                self.plc_cache,
+                self.tracer,
+                self.sampling_profiler,
                 self.config.cache_config.valid_period,
                 self.config.cache_config.request_period,
                 self.config.push_config.enabled
@@ -304,10 +460,84 @@ class Container:
                 self.config.cache_config.cleanup_period_s,
                 self.config.cache_config.request_period,
                 self.config.cache_config.valid_period,
+                CacheBudget(
+                    self.config.cache_config.max_entries,
+                    self.config.cache_config.max_size_kb * 1024
+                ),
+                timedelta(minutes=PLC_CACHE_IDLE_PERIOD)
             )
 
         return self._plc_cache
 
+    @property
+    def revalidation_coordinator(self) -> RevalidationCoordinator:
+        if self._revalidation_coordinator is None:
+            self._revalidation_coordinator = RevalidationCoordinator(
+                get_logger(LoggerNames.PLC_COMM.name),
+                MAX_BACKGROUND_REFRESHES
+            )
+
+        return self._revalidation_coordinator
+
+    @property
+    def write_coalescer(self) -> Optional[WriteCoalescer]:
+        if self.config.scgi_config.write_coalesce_ms == 0:
+            return None
+
+        if self._write_coalescer is None:
+            self._write_coalescer = WriteCoalescer(
+                get_logger(LoggerNames.PLC_COMM.name),
+                timedelta(
+                    milliseconds=self.config.scgi_config.write_coalesce_ms
+                )
+            )
+
+        return self._write_coalescer
+
+    @property
+    def cache_poller(self) -> Optional[CachePoller]:
+        if (
+            self.plc_cache is None or
+            self.config.cache_config.poll_period.total_seconds() == 0
+        ):
+            return None
+
+        if self._cache_poller is None:
+            self._cache_poller = CachePoller(
+                get_logger(LoggerNames.PLC_COMM.name),
+                self.plc_communication_service.refresh,
+                self.alias_service,
+                self.config.cache_config.poll_period,
+                self.config.cache_config.poll_idle_period,
+                self.config.cache_config.poll_tags
+            )
+            self.plc_communication_service.set_cache_poller(
+                self._cache_poller
+            )
+
+        return self._cache_poller
+
+    @property
+    def snapshot_service(self) -> Optional[SnapshotService]:
+        if self.config.cache_config.snapshot_period.total_seconds() == 0:
+            return None
+
+        if self._snapshot_service is None:
+            self._snapshot_service = SnapshotService(
+                get_logger(LoggerNames.SNAPSHOT.name),
+                self.main_loop,
+                self.config.locations_config.app_dir.joinpath(
+                    SNAPSHOT_FILE_NAME
+                ),
+                self.config.cache_config.snapshot_period,
+                self.config.cache_config.snapshot_max_age,
+                self.plc_info_service,
+                self.plc_activity_service,
+                self.plc_cache
+            )
+
+        return self._snapshot_service
+
     @property
     def plc_communication_service(self) -> PlcCommService:
         if self._plc_communication_service is None:
@@ -319,12 +549,24 @@ class Container:
                 self.plc_client_manager,
                 self.plc_cache,
                 self.data_logger_cache,
+                self.read_plan_cache,
+                self.revalidation_coordinator,
+                self.write_coalescer,
                 self.cpu_intensive_task_runner,
-                self.config.scgi_config.only_user_variables
+                self.config.scgi_config.only_user_variables,
+                self.config.scgi_config.read_after_write,
+                self.metrics_registry
             )
 
         return self._plc_communication_service
 
+    @property
+    def read_plan_cache(self) -> ReadPlanCache:
+        if self._read_plan_cache is None:
+            self._read_plan_cache = ReadPlanCache(READ_PLAN_CACHE_SIZE)
+
+        return self._read_plan_cache
+
     @property
     def rw_service(self) -> RWService:
         if self._rw_service is None:
@@ -349,7 +591,8 @@ class Container:
                 self.socket_service,
                 self.config.push_config.enabled,
                 self.config.abus_config.timeout_ms,
-                self.config.abus_config.number_of_retries
+                self.config.abus_config.number_of_retries,
+                self.metrics_registry
             )
 
         return self._router
@@ -382,8 +625,14 @@ class Container:
         return self._udp_transceiver
 
     @property
-    def can_transceiver(self) -> CanTransceiver:
+    def can_transceiver(self) -> Optional['CanTransceiver']:
+        if not self.config.can_config.enabled:
+            return None
+
         if self._can_transceiver is None:
+            from scgi_server.local.input_output.abus_stack.can_protocol \
+                .can_transceiver import CanTransceiver
+
             self._can_transceiver = CanTransceiver(
                 self.communication_loop,
                 get_logger(LoggerNames.CAN.name),
@@ -396,8 +645,11 @@ class Container:
         return self._can_transceiver
 
     @property
-    def iex_transceiver(self) -> IexTransceiver:
+    def iex_transceiver(self) -> 'IexTransceiver':
         if self._iex_transceiver is None:
+            from scgi_server.local.input_output.abus_stack.can_protocol \
+                .iex_transceiver import IexTransceiver
+
             self._iex_transceiver = IexTransceiver(
                 get_logger(LoggerNames.CAN.name),
                 self.abus_transceiver
@@ -414,12 +666,38 @@ class Container:
                 self.rw_service,
                 self.scgi_activity_service,
                 self.alias_service,
+                self.program_response_cache,
+                self.query_plan_cache,
                 self.config.scgi_config.reply_with_descriptions,
-                self.config.scgi_config.access_token
+                self.config.scgi_config.access_token,
+                self.config.scgi_config.compression_min_bytes,
+                self.metrics_registry,
+                self.tracer
             )
 
         return self._scgi_server
 
+    @property
+    def program_response_cache(self) -> ProgramResponseCache:
+        if self._program_response_cache is None:
+            self._program_response_cache = ProgramResponseCache(
+                self.plc_status_service,
+                self.alias_service,
+                PROGRAM_RESPONSE_CACHE_SIZE
+            )
+
+        return self._program_response_cache
+
+    @property
+    def query_plan_cache(self) -> QueryPlanCache:
+        if self._query_plan_cache is None:
+            self._query_plan_cache = QueryPlanCache(
+                self.alias_service,
+                QUERY_PLAN_CACHE_SIZE
+            )
+
+        return self._query_plan_cache
+
     @property
     def tcp_server(self) -> TCPServer:
         if self._tcp_server is None:
@@ -430,11 +708,66 @@ class Container:
                 self.config.scgi_config.scgi_bind_address,
                 self.config.scgi_config.scgi_port,
                 self.config.scgi_config.tls_enabled,
-                self.config.scgi_config.access_token
+                self.config.scgi_config.access_token,
+                self.websocket_activity_service,
+                self.config.scgi_config.ws_queue_size,
+                self.config.scgi_config.ws_drop_policy,
+                self.subscription_service,
+                reuse_port=self.config.scgi_config.workers > 0,
+                metrics=self.metrics_registry
             )
 
         return self._tcp_server
 
+    @property
+    def subscription_service(self) -> SubscriptionService:
+        if self._subscription_service is None:
+            self._subscription_service = SubscriptionService(
+                get_logger(LoggerNames.SUBSCRIPTION.name),
+                self.rw_service,
+                self.alias_service,
+                self.config.scgi_config.reply_with_descriptions,
+                MIN_SUBSCRIPTION_INTERVAL
+            )
+
+        return self._subscription_service
+
+    @property
+    def rw_ipc_server(self) -> Optional[RWIpcServer]:
+        if self.config.scgi_config.workers == 0:
+            return None
+
+        if self._rw_ipc_server is None:
+            self._rw_ipc_server = RWIpcServer(
+                get_logger(LoggerNames.WORKER.name),
+                self.main_loop,
+                self.config.locations_config.app_dir.joinpath(
+                    IPC_DIR_NAME, RW_IPC_SOCKET_NAME
+                ),
+                self.rw_service
+            )
+
+        return self._rw_ipc_server
+
+    @property
+    def worker_pool(self) -> Optional[WorkerPool]:
+        if self.config.scgi_config.workers == 0:
+            return None
+
+        if self._worker_pool is None:
+            self._worker_pool = WorkerPool(
+                get_logger(LoggerNames.WORKER.name),
+                self.main_loop,
+                self.config.scgi_config.workers,
+                self.rw_ipc_server.path,
+                self.config.locations_config.app_dir.joinpath(
+                    IPC_DIR_NAME, WS_RELAY_SOCKET_NAME
+                ),
+                WORKER_CHECK_PERIOD
+            )
+
+        return self._worker_pool
+
     # endregion
 
     @property
@@ -475,6 +808,12 @@ class Container:
                 self.tcp_server,
                 self.plc_info_cleaner,
                 self.file_watcher,
+                self.cache_poller,
+                self.snapshot_service,
+                self.rw_ipc_server,
+                self.worker_pool,
+                self.sampling_profiler,
+                self.loop_watchdog,
                 self.config.eth_config.enabled,
                 self.config.can_config.enabled
             )
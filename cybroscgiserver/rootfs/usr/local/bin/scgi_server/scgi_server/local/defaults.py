@@ -13,3 +13,64 @@ RW_NAD = 1002
 AUTODETECT_NAD = 1003
 
 ABUS_BROADCAST_PORT = 8442
+
+# responses larger than this are compressed outside of the event loop [bytes]
+COMPRESSION_OFFLOAD_BYTES = 64 * 1024
+# number of serialized program dependent responses (alc file, variable list)
+# kept in memory
+PROGRAM_RESPONSE_CACHE_SIZE = 16
+# number of parsed scgi query strings kept in memory
+QUERY_PLAN_CACHE_SIZE = 256
+# number of resolved plc read plans (command frames and decoders) kept in
+# memory
+READ_PLAN_CACHE_SIZE = 512
+# number of parsed tag names kept in memory, repeated requests of the same
+# tags are not parsed again
+TAG_NAME_CACHE_SIZE = 8192
+# shortest update interval of websocket tag subscriptions [s]
+MIN_SUBSCRIPTION_INTERVAL = 0.1
+# cache of a controller which was not read or written for this long is
+# removed [minutes]
+PLC_CACHE_IDLE_PERIOD = 10
+# maximum number of cache refreshes running in the background at once
+MAX_BACKGROUND_REFRESHES = 4
+# file in the application directory that keeps known controllers and cached
+# values across restarts
+SNAPSHOT_FILE_NAME = "snapshot.json"
+# unix sockets used by scgi worker processes to pass read/write requests and
+# websocket connections to the main process, in a directory of the
+# application directory accessible only by the server user
+IPC_DIR_NAME = "ipc"
+RW_IPC_SOCKET_NAME = "scgi_rw.sock"
+WS_RELAY_SOCKET_NAME = "scgi_ws.sock"
+# how long a starting scgi worker waits for the main process [s]
+WORKER_CONNECT_TIMEOUT = 10
+# how often dead scgi workers are restarted [s]
+WORKER_CHECK_PERIOD = 5
+# how often the sampling profiler samples stacks of the main and
+# communication loops [s]
+PROFILER_INTERVAL = 0.01
+# share of time the sampling profiler may spend sampling, the interval is
+# stretched when sampling takes longer, e.g. for deep stacks
+PROFILER_MAX_OVERHEAD = 0.02
+# how long the profiler runs when started by SIGUSR1 [s]
+PROFILER_SIGNAL_DURATION = 30
+# longest profile that can be requested by writing sys.profiler [s]
+PROFILER_MAX_DURATION = 600
+# subsystems the profiler attributes samples to, by fragment of the module
+# path; the innermost matching module on the stack wins
+PROFILER_SUBSYSTEMS = (
+    ("abus_stack/udp/", "udp codec"),
+    ("abus_stack/abus/abus_transceiver", "udp codec"),
+    ("abus_stack/abus/transport_frame", "udp codec"),
+    ("abus_stack/abus/command_frame", "udp codec"),
+    ("abus_stack/abus/abus_exchanger", "exchanger"),
+    ("alc_service/alc_parser", "alc parser"),
+    ("scgi/rw_responses_xml_serializer", "xml serializer"),
+)
+# how often the watchdog checks that the main and communication loops are
+# responsive [s]
+LOOP_WATCHDOG_PERIOD = 0.25
+# loop blocked for longer than this is reported with a stack sample of the
+# blocking code [s]
+LOOP_LAG_THRESHOLD = 1.0
@@ -16,3 +16,8 @@ class LoggerNames(Enum):
     SOCKET = auto()
     ALIAS_SERVICE = auto()
     FILE_WATCHER = auto()
+    SUBSCRIPTION = auto()
+    SNAPSHOT = auto()
+    WORKER = auto()
+    PROFILER = auto()
+    WATCHDOG = auto()
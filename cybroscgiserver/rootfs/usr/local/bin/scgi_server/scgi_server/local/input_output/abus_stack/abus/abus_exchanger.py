@@ -2,9 +2,12 @@ import asyncio
 import logging
 import sys
 from asyncio import AbstractEventLoop, Future
+from collections import deque
 from datetime import timedelta
-from typing import Tuple, Optional
+from typing import Tuple, Optional, Deque
 
+from lib.general.metrics import MetricsRegistry, LATENCY_BUCKETS
+from lib.general.tracing import Trace, current_trace
 from local.input_output.abus_stack.abus.abus_message import AbusMessage
 from scgi_server.local.general.errors import ExchangerTimeoutError
 from scgi_server.local.input_output.abus_stack.abus.abus_message import AbusMessage
@@ -17,12 +20,40 @@ class AbusExchanger:
                  loop: AbstractEventLoop,
                  sender: 'Router',
                  timeout: timedelta,
-                 retry: int):
+                 retry: int,
+                 metrics: MetricsRegistry,
+                 name: str):
         self._communication_loop: AbstractEventLoop = loop
         self._sender: 'Router' = sender
 
-        # sequence of (request, future) tuples where future will be resolved
-        # with future response or error
+        self._queue_wait = metrics.histogram(
+            "abus_queue_wait_seconds",
+            "Time requests wait in the exchanger queue",
+            LATENCY_BUCKETS,
+            ("exchanger",)
+        ).labels(name)
+        self._retransmits = metrics.counter(
+            "abus_retransmits_total",
+            "Requests sent again after a response timeout",
+            ("exchanger",)
+        ).labels(name)
+        metrics.gauge(
+            "abus_queue_depth",
+            "Requests waiting in the exchanger queue",
+            ("exchanger",)
+        ).labels(name).set_function(lambda: len(self._enqueue_times))
+        metrics.gauge(
+            "abus_queue_oldest_seconds",
+            "Time the oldest request waits in the exchanger queue",
+            ("exchanger",)
+        ).labels(name).set_function(self._oldest_request_age)
+
+        # enqueue times of requests waiting in the queue, the oldest first,
+        # read by other threads when metrics are collected
+        self._enqueue_times: Deque[float] = deque()
+
+        # sequence of (request, future, enqueue time, trace) tuples where
+        # future will be resolved with future response or error
         if sys.version_info < (3, 10):
             self._requests_queue = asyncio.Queue(loop=self._communication_loop)
         else:
@@ -47,11 +78,23 @@ class AbusExchanger:
             while True:
                 request: AbusMessage
                 #future: Future
-                (request, future) = await self._requests_queue.get()
+                (
+                    request,
+                    future,
+                    enqueue_time,
+                    trace
+                ) = await self._requests_queue.get()
+                self._enqueue_times.popleft()
+                dequeue_time = self._communication_loop.time()
+                self._queue_wait.observe(dequeue_time - enqueue_time)
+                if trace is not None:
+                    trace.add_span("queue_wait", enqueue_time, dequeue_time,
+                                   request.to_nad)
 
                 try:
                     response = await self._exchange_with_retry_and_timeout(
-                        request
+                        request,
+                        trace
                     )
                     future.set_result(response)
                 except ExchangerTimeoutError as e:
@@ -62,6 +105,10 @@ class AbusExchanger:
 
     async def exchange_threadsafe(self,
                                   request: AbusMessage) -> Future:
+        if asyncio.get_running_loop() is self._communication_loop:
+            # single loop mode, no thread switch needed
+            return await self._exchange_on_communication_loop(request)
+
         return await asyncio.wrap_future(
             asyncio.run_coroutine_threadsafe(
                 self._exchange_on_communication_loop(request),
@@ -74,20 +121,45 @@ class AbusExchanger:
                                               ) -> Future:
         future_response = self._communication_loop.create_future()
 
-        self._requests_queue.put_nowait((request, future_response))
+        enqueue_time = self._communication_loop.time()
+        self._enqueue_times.append(enqueue_time)
+        # the queue is handled by a task of its own, trace of the request
+        # has to be passed along
+        self._requests_queue.put_nowait(
+            (request, future_response, enqueue_time, current_trace())
+        )
 
         return await future_response
 
+    def _oldest_request_age(self) -> float:
+        try:
+            return self._communication_loop.time() - self._enqueue_times[0]
+        except IndexError:
+            return 0
+
     async def _exchange_with_retry_and_timeout(self,
-                                               request: AbusMessage
+                                               request: AbusMessage,
+                                               trace: Optional[Trace]
                                                ) -> AbusMessage:
         retry = self._retry
 
         while retry > 0:
+            start = self._communication_loop.time()
             try:
-                return await self._exchange(request)
+                response = await self._exchange(request)
+                if trace is not None:
+                    trace.add_span("response", start,
+                                   self._communication_loop.time(),
+                                   request.to_nad)
+                return response
             except asyncio.TimeoutError:
+                if trace is not None:
+                    trace.add_span("timeout", start,
+                                   self._communication_loop.time(),
+                                   request.to_nad)
                 retry -= 1
+                if retry > 0:
+                    self._retransmits.inc()
         raise ExchangerTimeoutError()
 
     async def _exchange(self, request: AbusMessage) -> AbusMessage:
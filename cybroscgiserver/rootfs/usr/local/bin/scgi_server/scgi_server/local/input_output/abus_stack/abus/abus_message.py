@@ -1,5 +1,4 @@
-from dataclasses import dataclass
-from typing import List, Tuple
+from typing import List, Tuple, NamedTuple
 
 from scgi_server.local.input_output.abus_stack.abus.command_frame import CommandFrame, \
     Direction, CommandFrameUtil, Type
@@ -8,8 +7,7 @@ from scgi_server.local.input_output.abus_stack.can_protocol.iex_frame import Iex
 from scgi_server.local.input_output.abus_stack.udp.udp_message import UdpMessage
 
 
-@dataclass()
-class AbusMessage:
+class AbusMessage(NamedTuple):
     addr: Tuple[str, int]
     from_nad: int
     to_nad: int
@@ -1,4 +1,4 @@
-from typing import Optional, Union, List
+from typing import Optional, Union, List, TYPE_CHECKING
 
 from lib.general.conditional_logger import ConditionalLogger
 from scgi_server.local.input_output.abus_stack.abus.abus_message import \
@@ -6,14 +6,16 @@ from scgi_server.local.input_output.abus_stack.abus.abus_message import \
 from scgi_server.local.input_output.abus_stack.abus.errors import AbusError
 from scgi_server.local.input_output.abus_stack.can_protocol.iex_frame import \
     IexFrame
-from scgi_server.local.input_output.abus_stack.can_protocol.iex_transceiver \
-    import IexTransceiver
 from scgi_server.local.input_output.abus_stack.router import Router
 from scgi_server.local.input_output.abus_stack.udp.udp_message import \
     UdpMessage
 from scgi_server.local.input_output.abus_stack.udp.udp_transceiver import \
     UdpTransceiver
 
+if TYPE_CHECKING:
+    from scgi_server.local.input_output.abus_stack.can_protocol \
+        .iex_transceiver import IexTransceiver
+
 
 class AbusTransceiver:
     def __init__(self,
@@ -28,12 +30,13 @@ class AbusTransceiver:
         self._eth_enabled: bool = eth_enabled
 
         self._udp_sender: Optional[UdpTransceiver] = None
-        self._iex_sender: Optional[IexTransceiver] = None
+        # can stack is imported only when can is enabled
+        self._iex_sender: Optional['IexTransceiver'] = None
 
     def set_udp_sender(self, sender: UdpTransceiver) -> None:
         self._udp_sender = sender
 
-    def set_can_sender(self, sender: IexTransceiver) -> None:
+    def set_can_sender(self, sender: 'IexTransceiver') -> None:
         self._iex_sender = sender
 
     def send(self, abus_msg: AbusMessage) -> None:
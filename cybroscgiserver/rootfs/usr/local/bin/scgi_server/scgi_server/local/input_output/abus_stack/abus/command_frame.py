@@ -1,7 +1,6 @@
 import struct
-from dataclasses import dataclass
 from enum import Enum
-from typing import List
+from typing import List, NamedTuple
 
 from scgi_server.local.input_output.abus_stack.abus.errors import AbusError
 
@@ -36,8 +35,7 @@ class Type(Enum):
     BROADCAST = 0x64
 
 
-@dataclass(frozen=True)
-class CommandFrame:
+class CommandFrame(NamedTuple):
     MSG_TYPE_COMMAND = 0
 
     msg_direction: Direction
@@ -1,10 +1,14 @@
 from asyncio import AbstractEventLoop
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 
 import can
 
 from lib.general.conditional_logger import ConditionalLogger
 
+if TYPE_CHECKING:
+    from scgi_server.local.input_output.abus_stack.can_protocol \
+        .iex_transceiver import IexTransceiver
+
 
 class CanTransceiver(can.Listener):
     def __init__(self,
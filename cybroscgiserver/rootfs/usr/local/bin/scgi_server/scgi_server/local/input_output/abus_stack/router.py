@@ -3,6 +3,7 @@ from datetime import timedelta
 from typing import Optional, Dict
 
 from lib.general.conditional_logger import ConditionalLogger
+from lib.general.metrics import MetricsRegistry
 from scgi_server.local.defaults import PUSH_NAD, RW_NAD, AUTODETECT_NAD
 from scgi_server.local.input_output.abus_stack.abus.abus_exchanger import \
     AbusExchanger
@@ -30,7 +31,8 @@ class Router:
                  socket_service: SocketService,
                  push_enabled: bool,
                  abus_timeout_ms: timedelta,
-                 abus_number_of_retries: int):
+                 abus_number_of_retries: int,
+                 metrics: MetricsRegistry):
         self._log: ConditionalLogger = log
         self._sender: Optional['AbusTransceiver'] = None
         self._receivers_by_nad: Dict[int, AbusExchanger] = {}
@@ -42,7 +44,9 @@ class Router:
                 communication_loop,
                 self,
                 abus_timeout_ms,
-                abus_number_of_retries
+                abus_number_of_retries,
+                metrics,
+                "push"
             )
             self._receivers_by_nad[PUSH_NAD] = push_exchanger
             push_service.set_exchanger(push_exchanger)
@@ -52,7 +56,9 @@ class Router:
             communication_loop,
             self,
             abus_timeout_ms,
-            abus_number_of_retries
+            abus_number_of_retries,
+            metrics,
+            "detection"
         )
         self._receivers_by_nad[AUTODETECT_NAD] = detection_exchanger
         detection_service.set_exchanger(detection_exchanger)
@@ -61,7 +67,9 @@ class Router:
             communication_loop,
             self,
             abus_timeout_ms,
-            abus_number_of_retries
+            abus_number_of_retries,
+            metrics,
+            "rw"
         )
         self._receivers_by_nad[RW_NAD] = rw_exchanger
         rw_service.set_exchanger(rw_exchanger)
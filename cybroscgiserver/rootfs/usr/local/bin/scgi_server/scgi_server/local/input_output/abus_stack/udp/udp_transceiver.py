@@ -34,12 +34,15 @@ class UdpTransceiver:
         self._sender: Optional[UdpProtocol] = None
 
     async def start(self) -> Tuple[str, int]:
-        transport, _ = await asyncio.wrap_future(
-            asyncio.run_coroutine_threadsafe(
-                self._start(),
-                self._communication_loop
+        if self._main_loop is self._communication_loop:
+            transport, _ = await self._start()
+        else:
+            transport, _ = await asyncio.wrap_future(
+                asyncio.run_coroutine_threadsafe(
+                    self._start(),
+                    self._communication_loop
+                )
             )
-        )
 
         self._own_bind_addr: Tuple[str, int] = (
             transport.get_extra_info("socket").getsockname()[:2]
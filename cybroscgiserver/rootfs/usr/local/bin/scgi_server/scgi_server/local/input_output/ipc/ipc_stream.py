@@ -0,0 +1,51 @@
+import asyncio
+import os
+import pickle
+import struct
+from asyncio import StreamReader, StreamWriter, AbstractServer
+from pathlib import Path
+from typing import Any, Callable, Awaitable
+
+# 4 byte big endian length of the pickled message
+_LENGTH = struct.Struct(">I")
+
+
+async def read_message(reader: StreamReader) -> Any:
+    """Reads message written by `write_message`, raises
+    `asyncio.IncompleteReadError` when the other side closed the stream.
+    """
+    header = await reader.readexactly(_LENGTH.size)
+    (length,) = _LENGTH.unpack(header)
+    return pickle.loads(await reader.readexactly(length))
+
+
+def write_message(writer: StreamWriter, message: Any) -> None:
+    """Writes message to a unix socket shared only by processes of this
+    server.
+    """
+    data = pickle.dumps(message, pickle.HIGHEST_PROTOCOL)
+    writer.write(_LENGTH.pack(len(data)) + data)
+
+
+async def start_private_unix_server(
+        client_connected_cb: Callable[[StreamReader, StreamWriter],
+                                      Awaitable[None]],
+        path: Path
+) -> AbstractServer:
+    """Starts unix server accessible only by the user of this process.
+    Messages are unpickled, so the socket is created in a directory with
+    mode 0700, which nobody else can enter even before the mode of the
+    socket itself is set.
+
+    :raises PermissionError: when the directory belongs to another user
+    """
+    directory = path.parent
+    directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+    if directory.stat().st_uid != os.getuid():
+        raise PermissionError(f"{directory} is owned by another user")
+    os.chmod(directory, 0o700)
+
+    server = await asyncio.start_unix_server(client_connected_cb,
+                                             path=str(path))
+    os.chmod(path, 0o600)
+    return server
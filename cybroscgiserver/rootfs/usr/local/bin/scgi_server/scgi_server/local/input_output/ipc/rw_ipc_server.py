@@ -0,0 +1,97 @@
+import asyncio
+from asyncio import StreamReader, StreamWriter, AbstractEventLoop
+from pathlib import Path
+from typing import Optional
+
+from lib.general.conditional_logger import ConditionalLogger
+from lib.general.misc import create_task_callback
+from scgi_server.local.input_output.ipc.ipc_stream import read_message, \
+    write_message, start_private_unix_server
+from scgi_server.local.services.rw_service.errors import RWServiceError
+from scgi_server.local.services.rw_service.rw_plan import RWPlan
+from scgi_server.local.services.rw_service.rw_service import RWService
+
+
+class RWIpcServer:
+    """Processes read/write plans of scgi worker processes, so all
+    controllers are accessed from this process only.
+
+    Each worker keeps one connection. A request is a (request id, plan)
+    tuple, the reply is a (request id, responses, error) tuple. Requests are
+    processed concurrently, replies are sent in order of completion.
+
+    Errors are sent as `ValueError` for invalid requests and
+    `RWServiceError` otherwise, created from the message of the original
+    error, which may not be picklable.
+    """
+    def __init__(self,
+                 log: ConditionalLogger,
+                 loop: AbstractEventLoop,
+                 path: Path,
+                 rw_service: RWService):
+        self._log: ConditionalLogger = log
+        self._loop: AbstractEventLoop = loop
+        self._path: Path = path
+        self._rw_service: RWService = rw_service
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    async def start(self) -> None:
+        self._server = await start_private_unix_server(self._handle,
+                                                       self._path)
+        self._log.info(lambda: f"Listening on {self._path}")
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+
+    async def _handle(self,
+                      reader: StreamReader,
+                      writer: StreamWriter) -> None:
+        tasks = set()
+        try:
+            while True:
+                request_id, plan = await read_message(reader)
+                task = self._loop.create_task(
+                    self._process(writer, request_id, plan)
+                )
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                task.add_done_callback(create_task_callback(self._log))
+        except asyncio.IncompleteReadError:
+            self._log.debug("Worker disconnected")
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def _process(self,
+                       writer: StreamWriter,
+                       request_id: int,
+                       plan: RWPlan) -> None:
+        try:
+            responses = await self._rw_service.process_plan(plan)
+            reply = (request_id, responses, None)
+        except ValueError as e:
+            reply = (request_id, None, ValueError(str(e)))
+        except Exception as e:
+            reply = (request_id, None, RWServiceError(str(e)))
+
+        if writer.is_closing():
+            return
+
+        try:
+            write_message(writer, reply)
+        except Exception as e:
+            self._log.error(f"Can't send reply to worker: {e}")
+            try:
+                write_message(writer, (
+                    request_id, None, RWServiceError(f"Can't send reply: {e}")
+                ))
+            except Exception as e:
+                # the worker times out waiting for the reply
+                self._log.error(f"Can't send error reply to worker: {e}")
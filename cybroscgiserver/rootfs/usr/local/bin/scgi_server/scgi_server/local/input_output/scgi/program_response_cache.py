@@ -0,0 +1,89 @@
+from collections import OrderedDict
+from hashlib import sha1
+from typing import List, Optional, Tuple
+
+from lib.input_output.scgi.r_response import RResponse
+from lib.services.alias_service import AliasService
+from scgi_server.local.services.rw_service.scgi_communication.rw_request \
+    import RWRequest
+from scgi_server.local.services.status_services.plc_status_service \
+    .plc_status_service import PlcStatusService
+
+
+class ProgramResponseCache:
+    """Caches serialized responses of requests that depend only on the
+    program loaded in the controllers (`cNAD.sys.variables` and
+    `cNAD.sys.alc_file`). Entries are identified by an ETag derived from the
+    requested tags, program crc of each controller and its alias.
+    """
+    PROGRAM_TAG_NAMES = frozenset(("variables", "alc_file"))
+
+    def __init__(self,
+                 plc_status_service: PlcStatusService,
+                 alias_service: AliasService,
+                 max_size: int):
+        self._plc_status_service: PlcStatusService = plc_status_service
+        self._alias_service: AliasService = alias_service
+        self._max_size: int = max_size
+        self._bodies: OrderedDict[str, str] = OrderedDict()
+
+    def create_etag(self,
+                    r_requests: List[RWRequest],
+                    w_requests: List[RWRequest],
+                    e_responses: List[RResponse]) -> Optional[str]:
+        """Creates ETag for the request, returns None when the response
+        depends on anything else than the controller program.
+        """
+        if len(r_requests) == 0 or len(w_requests) > 0 or len(e_responses) > 0:
+            return None
+
+        key: List[Tuple[str, str, int]] = []
+        for request in r_requests:
+            if (request.target != RWRequest.Target.PLC_SYSTEM
+                    or request.tag_name not in self.PROGRAM_TAG_NAMES):
+                return None
+
+            crc = self._plc_status_service[request.nad].alc_crc
+            if crc is None:
+                return None
+
+            alias = self._alias_service.to_alias(f"c{request.nad}")
+            key.append((request.name, alias, crc))
+
+        return f'"{sha1(repr(key).encode()).hexdigest()}"'
+
+    @staticmethod
+    def etag_for_encoding(etag: str, encoding: Optional[str]) -> str:
+        """Returns ETag of the response body compressed with `encoding`,
+        strong ETags must differ between content codings.
+        """
+        if encoding is None:
+            return etag
+        return f'{etag[:-1]}-{encoding}"'
+
+    @staticmethod
+    def matches(etag: str, if_none_match: Optional[str]) -> bool:
+        """Checks whether ETag matches value of If-None-Match header.
+        """
+        if if_none_match is None:
+            return False
+
+        for item in if_none_match.split(","):
+            item = item.strip()
+            if item == "*" or item.removeprefix("W/") == etag:
+                return True
+
+        return False
+
+    def get(self, etag: str) -> Optional[str]:
+        try:
+            self._bodies.move_to_end(etag)
+            return self._bodies[etag]
+        except KeyError:
+            return None
+
+    def set(self, etag: str, body: str) -> None:
+        self._bodies[etag] = body
+        self._bodies.move_to_end(etag)
+        while len(self._bodies) > self._max_size:
+            self._bodies.popitem(last=False)
@@ -0,0 +1,62 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional
+
+from lib.input_output.scgi.r_response import RResponse
+from lib.services.alias_service import AliasService
+from scgi_server.local.services.rw_service.rw_plan import RWPlan
+from scgi_server.local.services.rw_service.scgi_communication.rw_request \
+    import RWRequest
+
+
+@dataclass(frozen=True)
+class QueryPlan:
+    """Parsed SCGI query string with requests already resolved through
+    aliases and grouped by controller.
+    """
+    r_requests: List[RWRequest]
+    w_requests: List[RWRequest]
+    e_responses: List[RResponse]
+    alias_error_tags: List[str]
+    rw_plan: RWPlan
+
+
+class QueryPlanCache:
+    """LRU cache of query plans by raw query string. Cache is cleared when
+    aliases change.
+    """
+    def __init__(self, alias_service: AliasService, max_size: int):
+        self._alias_service: AliasService = alias_service
+        self._max_size: int = max_size
+        self._plans: OrderedDict[str, QueryPlan] = OrderedDict()
+        self._alias_generation: int = alias_service.generation
+
+    def get(self, query_string: str) -> Optional[QueryPlan]:
+        self._check_aliases()
+        try:
+            self._plans.move_to_end(query_string)
+            return self._plans[query_string]
+        except KeyError:
+            return None
+
+    def set(self, query_string: str, plan: QueryPlan) -> None:
+        """Stores plan, plans containing write requests are not stored since
+        written values usually differ between requests.
+        """
+        if len(plan.w_requests) > 0:
+            return
+
+        self._check_aliases()
+        self._plans[query_string] = plan
+        self._plans.move_to_end(query_string)
+        while len(self._plans) > self._max_size:
+            self._plans.popitem(last=False)
+
+    def clear(self) -> None:
+        self._plans.clear()
+
+    def _check_aliases(self) -> None:
+        generation = self._alias_service.generation
+        if generation != self._alias_generation:
+            self._alias_generation = generation
+            self.clear()
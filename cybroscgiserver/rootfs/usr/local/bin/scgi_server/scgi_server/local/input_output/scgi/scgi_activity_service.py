@@ -6,6 +6,10 @@ class ScgiActivityService:
         self._server_start_datetime: datetime = datetime.now()
         self._requests_received_count: int = 0
         self._responses_sent_count: int = 0
+        self._compressed_responses_count: int = 0
+        self._uncompressed_bytes: int = 0
+        self._compressed_bytes: int = 0
+        self._compression_cpu_time: float = 0.0
 
     @property
     def requests_received_count(self) -> int:
@@ -19,8 +23,36 @@ class ScgiActivityService:
     def server_uptime(self) -> datetime:
         return datetime.now() - self._server_start_datetime
 
+    @property
+    def compressed_responses_count(self) -> int:
+        return self._compressed_responses_count
+
+    @property
+    def compression_ratio(self) -> float:
+        """Ratio between original and compressed size of all compressed
+        responses.
+        """
+        if self._compressed_bytes == 0:
+            return 1.0
+        return self._uncompressed_bytes / self._compressed_bytes
+
+    @property
+    def compression_cpu_time(self) -> float:
+        """Total cpu time spent compressing responses [s].
+        """
+        return self._compression_cpu_time
+
     def report_request_received(self) -> None:
         self._requests_received_count += 1
 
     def report_response_sent(self) -> None:
-        self._responses_sent_count += 1
\ No newline at end of file
+        self._responses_sent_count += 1
+
+    def report_response_compressed(self,
+                                   uncompressed_size: int,
+                                   compressed_size: int,
+                                   cpu_time: float) -> None:
+        self._compressed_responses_count += 1
+        self._uncompressed_bytes += uncompressed_size
+        self._compressed_bytes += compressed_size
+        self._compression_cpu_time += cpu_time
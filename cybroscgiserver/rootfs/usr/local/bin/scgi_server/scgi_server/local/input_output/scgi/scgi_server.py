@@ -1,17 +1,30 @@
-from typing import Optional, List
+from asyncio import get_running_loop
+from functools import partial
+from time import monotonic
+from timeit import default_timer
+from typing import Optional, List, Dict, Iterable
 
 from lib.general.conditional_logger import ConditionalLogger
+from lib.general.metrics import MetricsRegistry, LATENCY_BUCKETS
+from lib.general.tracing import Tracer, current_trace, span
+from lib.input_output.http.compression import select_encoding, compress
 from lib.input_output.http.messages import \
-    HttpRequestMessage, HttpResponseMessage
+    HttpRequestMessage, HttpResponseMessage, get_header
 from lib.input_output.scgi.r_response import RResponse
 from lib.input_output.scgi.rw_responses_xml_serializer import \
     RRResponsesXmlSerializer
 from lib.services.alias_service import AliasService, AliasError
-from scgi_server.local.input_output.scgi.operation import OperationUtil
+from scgi_server.local.defaults import COMPRESSION_OFFLOAD_BYTES
+from scgi_server.local.input_output.scgi.operation import \
+    OperationUtil, Operation
+from scgi_server.local.input_output.scgi.program_response_cache import \
+    ProgramResponseCache
+from scgi_server.local.input_output.scgi.query_plan_cache import \
+    QueryPlanCache, QueryPlan
 from scgi_server.local.input_output.scgi.scgi_activity_service import \
     ScgiActivityService
 from scgi_server.local.services.rw_service.errors import InvalidTagNameError
-from scgi_server.local.services.rw_service.rw_service import RWService
+from scgi_server.local.services.rw_service.rw_planner import RWPlanner
 from scgi_server.local.services.rw_service.scgi_communication.rw_request \
     import RWRequest
 
@@ -19,33 +32,66 @@ from scgi_server.local.services.rw_service.scgi_communication.rw_request \
 class ScgiServer:
     def __init__(self,
                  log: ConditionalLogger,
-                 rw_service: RWService,
+                 rw_service: RWPlanner,
                  scgi_activity_service: ScgiActivityService,
                  alias_service: AliasService,
+                 program_response_cache: Optional[ProgramResponseCache],
+                 query_plan_cache: QueryPlanCache,
                  reply_with_descriptions: bool,
-                 access_token: Optional[str]):
+                 access_token: Optional[str],
+                 compression_min_bytes: int,
+                 metrics: MetricsRegistry,
+                 tracer: Optional[Tracer]):
         self._log: ConditionalLogger = log
-        self._rw_service: RWService = rw_service
+        self._rw_service: RWPlanner = rw_service
         self._scgi_activity_service: ScgiActivityService = (
             scgi_activity_service
         )
         self._reply_with_descriptions: bool = reply_with_descriptions
         self._access_token: Optional[str] = access_token
         self._alias_service: AliasService = alias_service
+        # not available in scgi worker processes, program of controllers
+        # is known only to the main process
+        self._program_response_cache: Optional[ProgramResponseCache] = (
+            program_response_cache
+        )
+        self._query_plan_cache: QueryPlanCache = query_plan_cache
+        self._compression_min_bytes: int = compression_min_bytes
+        # requests are traced only when tracing is enabled
+        self._tracer: Optional[Tracer] = tracer
         self._controller_not_found_msg = str(HttpResponseMessage.not_found(
             body="Controller doesn't exist"
         ))
+        self._request_seconds = metrics.histogram(
+            "scgi_request_seconds",
+            "Time needed to answer scgi requests",
+            LATENCY_BUCKETS
+        ).labels()
+        self._serialization_seconds = metrics.histogram(
+            "scgi_serialization_seconds",
+            "Time needed to serialize responses to xml",
+            LATENCY_BUCKETS
+        ).labels()
 
     async def on_data(self, data: bytes) -> bytes:
         self._scgi_activity_service.report_request_received()
 
-        response_str = await self._on_data(data)
-        response = response_str.encode()
+        start = default_timer()
+        if self._tracer is None:
+            response = await self._on_data(data)
+        else:
+            with self._tracer.trace():
+                response = await self._on_data(data)
+        self._request_seconds.observe(default_timer() - start)
 
         self._scgi_activity_service.report_response_sent()
 
         return response
 
+    @staticmethod
+    def _to_bytes(response: HttpResponseMessage) -> bytes:
+        return response.serialize().encode()
+
     @staticmethod
     def _create_device_not_found(name: str) -> RResponse:
         return RResponse.create(
@@ -55,76 +101,189 @@ class ScgiServer:
             code=RResponse.Code.DEVICE_NOT_FOUND
         )
 
-    async def _on_data(self, data: bytes) -> str:
+    async def _on_data(self, data: bytes) -> bytes:
         try:
             try:
                 msg = HttpRequestMessage.parse_request(data.decode())
                 if msg.uri == '/favicon.ico':
-                    return str(HttpResponseMessage.not_found())
+                    return self._to_bytes(HttpResponseMessage.not_found())
 
                 if self._access_token is not None:
                     auth = msg.headers.get('Authorization', ' ').split(" ")[1]
                     if auth != self._access_token:
                         self._log.error("Unauthorized: Access token mismatch")
-                        return str(HttpResponseMessage.unauthorized())
+                        return self._to_bytes(
+                            HttpResponseMessage.unauthorized()
+                        )
 
                 _, query_string = msg.uri.split("?")
 
-                (
-                    read_operations,
-                    write_operations,
-                    error_operations
-                ) = OperationUtil.bytes_to_operations(query_string,
-                                                      self._alias_service)
+                plan = self._query_plan_cache.get(query_string)
+                if plan is None:
+                    (
+                        read_operations,
+                        write_operations,
+                        error_operations
+                    ) = OperationUtil.bytes_to_operations(query_string,
+                                                          self._alias_service)
             except Exception as e:
                 self._log.debug("Bad request", exc_info=e)
                 self._log.error(f"Bad request: {e}")
-                return str(HttpResponseMessage.bad_request())
-
-            e_responses = [
-                self._create_device_not_found(operation.key)
-                for operation in error_operations
-            ]
-
-            r_requests: List[RWRequest] = []
-            for op in read_operations:
-                try:
-                    r_requests.append(RWRequest.create(op.key, op.value))
-                except InvalidTagNameError:
-                    e_responses.append(self._create_device_not_found(op.key))
-
-            w_requests: List[RWRequest] = []
-            for op in write_operations:
-                try:
-                    w_requests.append(RWRequest.create(op.key, op.value))
-                except InvalidTagNameError:
-                    e_responses.append(self._create_device_not_found(op.key))
+                return self._to_bytes(HttpResponseMessage.bad_request())
+
+            trace = current_trace()
+            if trace is not None:
+                # the trace starts right before parsing
+                trace.description = msg.uri
+                trace.add_span("parse", trace.start, monotonic())
+
+            if plan is None:
+                with span("plan"):
+                    plan = await self._create_query_plan(read_operations,
+                                                         write_operations,
+                                                         error_operations)
+                self._query_plan_cache.set(query_string, plan)
+
+            if self._program_response_cache is None:
+                etag = None
+            else:
+                etag = self._program_response_cache.create_etag(
+                    plan.r_requests, plan.w_requests, plan.e_responses
+                )
+            if etag is not None:
+                xml = self._program_response_cache.get(etag)
+                if xml is not None:
+                    return await self._create_ok_response(msg, xml, etag)
 
             try:
-                responses = await self._rw_service.on_rw_requests(r_requests,
-                                                                  w_requests)
+                with span("rw"):
+                    responses = await self._rw_service.process_plan(
+                        plan.rw_plan
+                    )
             except ValueError as ex:
                 self._log.debug("Bad request", exc_info=ex)
                 self._log.error(f"Bad request: {ex}")
-                return str(HttpResponseMessage.bad_request())
+                return self._to_bytes(HttpResponseMessage.bad_request())
 
-            xml = RRResponsesXmlSerializer.to_xml(
-                responses + e_responses,
-                [op.key for op in error_operations],
-                self._reply_with_descriptions,
-                self._alias_service
-            )
+            with span("serialize"):
+                start = default_timer()
+                xml = RRResponsesXmlSerializer.to_xml(
+                    responses + plan.e_responses,
+                    plan.alias_error_tags,
+                    self._reply_with_descriptions,
+                    self._alias_service
+                )
+                self._serialization_seconds.observe(default_timer() - start)
 
-            return str(HttpResponseMessage.ok(
-                headers={
-                    'Access-Control-Allow-Origin': '*',
-                    'Content-Type': 'text/xml',
-                    'Content-Length': str(len(xml)),
-                    'Connection': 'close'
-                },
-                body=xml
-            ))
+            if etag is not None:
+                self._program_response_cache.set(etag, xml)
+            return await self._create_ok_response(msg, xml, etag)
         except Exception as e:
             self._log.debug("Internal Server Error", exc_info=e)
             self._log.error(f"Internal Server Error: {e}")
-            return str(HttpResponseMessage.internal_server_error())
+            return self._to_bytes(HttpResponseMessage.internal_server_error())
+
+    async def _create_query_plan(
+        self,
+        read_operations: Iterable[Operation],
+        write_operations: List[Operation],
+        error_operations: List[Operation]
+    ) -> QueryPlan:
+        e_responses = [
+            self._create_device_not_found(operation.key)
+            for operation in error_operations
+        ]
+
+        r_requests: List[RWRequest] = []
+        for op in read_operations:
+            try:
+                r_requests.append(RWRequest.create(op.key, op.value))
+            except InvalidTagNameError:
+                e_responses.append(self._create_device_not_found(op.key))
+
+        w_requests: List[RWRequest] = []
+        for op in write_operations:
+            try:
+                w_requests.append(RWRequest.create(op.key, op.value))
+            except InvalidTagNameError:
+                e_responses.append(self._create_device_not_found(op.key))
+
+        return QueryPlan(
+            r_requests,
+            w_requests,
+            e_responses,
+            [op.key for op in error_operations],
+            await self._rw_service.create_plan(r_requests, w_requests)
+        )
+
+    @staticmethod
+    def _create_etag_headers(etag: str) -> Dict[str, str]:
+        return {
+            'ETag': etag,
+            'Cache-Control': 'no-cache'
+        }
+
+    async def _create_ok_response(self,
+                                  msg: HttpRequestMessage,
+                                  xml: str,
+                                  etag: Optional[str] = None) -> bytes:
+        """Creates OK response with xml body, the body is compressed when
+        it is large enough and the client accepts compressed content.
+
+        A response with ETag is answered with Not Modified when the client
+        has the same representation, each content coding has its own ETag.
+        """
+        body = xml.encode()
+        headers = {
+            'Access-Control-Allow-Origin': '*',
+            'Content-Type': 'text/xml'
+        }
+
+        encoding = None
+        if 0 < self._compression_min_bytes <= len(body):
+            encoding = select_encoding(
+                get_header(msg.headers, 'Accept-Encoding')
+            )
+
+        if etag is not None:
+            etag = ProgramResponseCache.etag_for_encoding(etag, encoding)
+            if ProgramResponseCache.matches(
+                etag, get_header(msg.headers, 'If-None-Match')
+            ):
+                return self._to_bytes(HttpResponseMessage.not_modified(
+                    headers={
+                        'Access-Control-Allow-Origin': '*',
+                        **self._create_etag_headers(etag),
+                        'Connection': 'close'
+                    }
+                ))
+            headers.update(self._create_etag_headers(etag))
+
+        if encoding is not None:
+            body = await self._compress(body, encoding)
+            headers['Content-Encoding'] = encoding
+            headers['Vary'] = 'Accept-Encoding'
+
+        headers['Content-Length'] = str(len(body))
+        headers['Connection'] = 'close'
+
+        return self._to_bytes(HttpResponseMessage.ok(headers=headers)) + body
+
+    async def _compress(self, body: bytes, encoding: str) -> bytes:
+        with span("compress"):
+            if len(body) >= COMPRESSION_OFFLOAD_BYTES:
+                compressed, cpu_time = (
+                    await get_running_loop().run_in_executor(
+                        None, partial(compress, body, encoding)
+                    )
+                )
+            else:
+                compressed, cpu_time = compress(body, encoding)
+
+        self._scgi_activity_service.report_response_compressed(
+            len(body), len(compressed), cpu_time
+        )
+        self._log.debug(lambda: f"Response compressed using {encoding}, "
+                                f"{len(body)} -> {len(compressed)} bytes")
+
+        return compressed
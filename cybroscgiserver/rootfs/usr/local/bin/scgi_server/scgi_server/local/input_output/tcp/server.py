@@ -1,17 +1,30 @@
 import asyncio
 import socket
 from asyncio import StreamReader, StreamWriter, AbstractEventLoop
+from pathlib import Path
 from typing import Optional, List
 
 from lib.general.conditional_logger import ConditionalLogger
+from lib.general.metrics import MetricsRegistry
 from lib.general.tls import create_server_tls_context
+from lib.input_output.http.messages import HttpRequestMessage, \
+    HttpResponseMessage, get_header
+from lib.input_output.websocket.frame import WebSocketFrame
+from lib.input_output.websocket.send_queue import DropPolicy
+from scgi_server.local.input_output.ipc.ipc_stream import \
+    start_private_unix_server
 from scgi_server.local.input_output.scgi.scgi_server import ScgiServer
 from scgi_server.local.input_output.websocket.server_handler import \
     WebSocketServerHandler
+from scgi_server.local.input_output.websocket.websocket_activity_service \
+    import WebSocketActivityService
+from scgi_server.local.services.subscription_service.subscription_service \
+    import SubscriptionService
 
 
 class TCPServer:
     PAYLOAD_BYTES = 16 * 1024
+    METRICS_URI = b"/metrics"
 
     def __init__(self,
                  log: ConditionalLogger,
@@ -20,7 +33,14 @@ class TCPServer:
                  bind_address: str,
                  port: int,
                  tls_enabled: bool,
-                 access_token: Optional[str]):
+                 access_token: Optional[str],
+                 websocket_activity_service: WebSocketActivityService,
+                 ws_queue_size: int,
+                 ws_drop_policy: DropPolicy,
+                 subscription_service: Optional[SubscriptionService] = None,
+                 reuse_port: bool = False,
+                 ws_relay_path: Optional[Path] = None,
+                 metrics: Optional[MetricsRegistry] = None):
         self._log: ConditionalLogger = log
         self._loop: AbstractEventLoop = loop
         self._handler: ScgiServer = handler
@@ -28,10 +48,28 @@ class TCPServer:
         self._port = port
         self._tls_enabled: bool = tls_enabled
         self._access_token: Optional[str] = access_token
+        self._websocket_activity_service: WebSocketActivityService = (
+            websocket_activity_service
+        )
+        self._ws_queue_size: int = ws_queue_size
+        self._ws_drop_policy: DropPolicy = ws_drop_policy
+        self._subscription_service: Optional[SubscriptionService] = (
+            subscription_service
+        )
+
+        # port is shared with scgi worker processes
+        self._reuse_port: bool = reuse_port
+        # websocket connections are passed to the main process, used by scgi
+        # worker processes
+        self._ws_relay_path: Optional[Path] = ws_relay_path
+        # served on /metrics, requests are relayed to the main process when
+        # not available
+        self._metrics: Optional[MetricsRegistry] = metrics
 
         self._websockets: List[WebSocketServerHandler] = []
 
         self._server: Optional['Server'] = None
+        self._relay_server: Optional['Server'] = None
 
     async def start(self):
         if self._tls_enabled:
@@ -53,6 +91,8 @@ class TCPServer:
                              socket.SOCK_STREAM)
         if ipv6:
             sock.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_V6ONLY, 0)
+        if self._reuse_port:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
         sock.bind((self._bind_address, self._port))
 
         self._server = await asyncio.start_server(
@@ -63,36 +103,129 @@ class TCPServer:
         )
         (host, port, *rest) = self._server.sockets[0].getsockname()
         self._log.info(lambda: f"Listening on {host}:{port}")
-        await self._server.wait_closed()
-        sock.close()
+
+    async def start_ws_relay(self, path: Path) -> None:
+        """Accepts websocket connections relayed by scgi worker processes.
+        """
+        self._relay_server = await start_private_unix_server(self._handle,
+                                                             path)
 
     def stop(self):
         self._log.info(lambda: f"Stopping server")
         self._server.close()
+        if self._relay_server is not None:
+            self._relay_server.close()
+
+    def _is_metrics_request(self, request_bytes: bytes) -> bool:
+        request_line = request_bytes.split(b"\r\n", 1)[0].split(b" ")
+        return (
+            len(request_line) == 3 and
+            request_line[1].split(b"?", 1)[0] == self.METRICS_URI
+        )
+
+    def _create_metrics_response(self, request_bytes: bytes) -> bytes:
+        try:
+            msg = HttpRequestMessage.parse_request(request_bytes.decode())
+        except ValueError:
+            return HttpResponseMessage.bad_request().serialize().encode()
+
+        if self._access_token is not None:
+            auth = get_header(msg.headers, 'Authorization', ' ')
+            if auth.split(" ")[-1] != self._access_token:
+                self._log.error("Unauthorized: Access token mismatch")
+                return HttpResponseMessage.unauthorized().serialize().encode()
+
+        body = self._metrics.render().encode()
+        headers = {
+            'Content-Type': 'text/plain; version=0.0.4; charset=utf-8',
+            'Content-Length': str(len(body)),
+            'Connection': 'close'
+        }
+        return HttpResponseMessage.ok(headers=headers).serialize().encode() \
+            + body
+
+    async def _relay(self,
+                     request_bytes: bytes,
+                     reader: StreamReader,
+                     writer: StreamWriter) -> None:
+        """Passes websocket connection or metrics request to the main
+        process, which owns subscriptions, socket messages and controller
+        communication.
+        """
+        try:
+            relay_reader, relay_writer = await asyncio.open_unix_connection(
+                str(self._ws_relay_path)
+            )
+        except OSError as e:
+            self._log.error(f"Can't relay websocket connection: {e}")
+            writer.close()
+            return
+
+        relay_writer.write(request_bytes)
+        await asyncio.gather(self._pipe(reader, relay_writer),
+                             self._pipe(relay_reader, writer))
+
+    async def _pipe(self, reader: StreamReader, writer: StreamWriter) -> None:
+        try:
+            while True:
+                data = await reader.read(self.PAYLOAD_BYTES)
+                if data == b'':
+                    break
+                writer.write(data)
+                await writer.drain()
+        except (ConnectionError, OSError) as e:
+            self._log.debug(lambda: f"Websocket relay closed: {e}")
+        finally:
+            writer.close()
 
     async def send_to_clients(self, data: bytes):
-        """Sends WebSocket message to all connected WebSocket clients.
+        """Sends WebSocket message to all connected WebSocket clients. The
+        frame is serialized once and queued for each client, slow clients do
+        not delay the others.
         """
-        return await asyncio.gather(*(
-            ws.send_payload(data) for ws in self._websockets
-        ))
+        if len(self._websockets) == 0:
+            return
+
+        frame_bytes = WebSocketFrame.for_payload(data).serialize()
+        for ws in list(self._websockets):
+            ws.send_serialized(frame_bytes)
 
     async def _handle(self,
                       reader: StreamReader,
                       writer: StreamWriter) -> None:
         request_bytes = await reader.read(self.PAYLOAD_BYTES)
         if request_bytes != b'':
-            if request_bytes.find(b'Connection: Upgrade') != -1:
+            if self._is_metrics_request(request_bytes):
+                if self._metrics is None:
+                    await self._relay(request_bytes, reader, writer)
+                    return
+
+                writer.write(self._create_metrics_response(request_bytes))
+                await writer.drain()
+                writer.close()
+            elif request_bytes.find(b'Connection: Upgrade') != -1:
+                if self._ws_relay_path is not None:
+                    await self._relay(request_bytes, reader, writer)
+                    return
+
                 ws = WebSocketServerHandler(
                     self._log,
                     request_bytes,
                     reader,
                     writer,
-                    access_token=self._access_token
+                    access_token=self._access_token,
+                    subscription_service=self._subscription_service,
+                    queue_size=self._ws_queue_size,
+                    drop_policy=self._ws_drop_policy
                 )
                 self._websockets.append(ws)
-                await ws.loop()
-                self._websockets.remove(ws)
+                self._websocket_activity_service.report_client_connected(ws)
+                try:
+                    await ws.loop()
+                finally:
+                    self._websockets.remove(ws)
+                    self._websocket_activity_service \
+                        .report_client_disconnected(ws)
             else:
                 response_bytes = await self._handler.on_data(request_bytes)
                 writer.write(response_bytes)
@@ -2,28 +2,44 @@ import asyncio
 from asyncio import StreamReader, StreamWriter
 from base64 import b64encode
 from hashlib import sha1
-from typing import Optional
+from typing import Optional, List, Tuple
 
 from lib.general.conditional_logger import ConditionalLogger
 from lib.input_output.http.messages import \
     HttpRequestMessage, HttpResponseMessage
+from lib.input_output.websocket.decoder import WebSocketFrameDecoder
 from lib.input_output.websocket.frame import Opcode, \
-    WebSocketFrame
+    WebSocketFrame, WebSocketProtocolError
+from lib.input_output.websocket.send_queue import WebSocketSendQueue, \
+    DropPolicy, SendQueueFull
+from scgi_server.local.services.subscription_service.subscription_service \
+    import SubscriptionService
 
 
 class WebSocketServerHandler:
     magic = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+    READ_BYTES = 8 * 1024
 
     def __init__(self,
                  log: ConditionalLogger,
                  handshake_request: bytes,
                  reader: StreamReader,
                  writer: StreamWriter,
-                 access_token: Optional[str] = None):
+                 access_token: Optional[str] = None,
+                 subscription_service: Optional[SubscriptionService] = None,
+                 queue_size: int = 64,
+                 drop_policy: DropPolicy = DropPolicy.DROP_OLDEST):
         self._log: ConditionalLogger = log
         self._reader: StreamReader = reader
         self._writer: StreamWriter = writer
         self._access_token: Optional[str] = access_token
+        self._queue: WebSocketSendQueue = WebSocketSendQueue(queue_size,
+                                                             drop_policy)
+        self._writer_task: Optional[asyncio.Task] = None
+        self._closing: bool = False
+        self._subscription_service: Optional[SubscriptionService] = (
+            subscription_service
+        )
 
         request = HttpRequestMessage.parse_request(handshake_request.decode())
         self._web_socket_key: str = request.headers['Sec-WebSocket-Key']
@@ -33,10 +49,61 @@ class WebSocketServerHandler:
             None if auth_hdr is None else auth_hdr.split(' ')[1]
         )
 
+    @property
+    def peer(self) -> str:
+        peername: Optional[Tuple] = self._writer.get_extra_info("peername")
+        if not peername:
+            # unknown or relayed by a scgi worker over a unix socket
+            return "?"
+        return f"{peername[0]}:{peername[1]}"
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.depth
+
+    @property
+    def dropped_count(self) -> int:
+        return self._queue.dropped_count
+
+    @property
+    def sent_count(self) -> int:
+        return self._queue.sent_count
+
     async def _send(self, data: bytes) -> None:
         self._writer.write(data)
         await self._writer.drain()
 
+    def send_serialized(self, data: bytes) -> None:
+        """Queues already serialized frame, never waits for the client.
+        Depending on drop policy a slow client loses the oldest queued frame
+        or gets disconnected.
+        """
+        if self._closing:
+            return
+
+        try:
+            self._queue.put(data)
+        except SendQueueFull:
+            self._log.warning(lambda: f"WS client {self.peer} is too slow, "
+                                      f"closing connection")
+            self._close()
+
+    async def _write_queued(self) -> None:
+        """Writes queued frames to the client socket.
+        """
+        try:
+            while True:
+                self._writer.write(await self._queue.get())
+                await self._writer.drain()
+        except (ConnectionError, RuntimeError) as e:
+            self._log.warning(f"WS send to {self.peer} failed: {e}")
+            self._close()
+
+    def _close(self) -> None:
+        # closing the transport also ends pending read in the receive loop
+        self._closing = True
+        self._writer.close()
+
     def _accept_value(self) -> bytes:
         """Create Sec-WebSocket-Accept value from received Sec-WebSocket-Key
         value.
@@ -62,10 +129,10 @@ class WebSocketServerHandler:
         await self._send(self._handshake_response().encode())
 
     async def send_frame(self, frame: WebSocketFrame) -> None:
-        """Serializes and send frame.
+        """Serializes and queues frame.
         """
-        self._log.debug(f"WS send {frame}")
-        await self._send(frame.serialize())
+        self._log.debug(lambda: f"WS send {frame}")
+        self.send_serialized(frame.serialize())
 
     async def send_payload(self, data: bytes) -> None:
         """Create WS frame for data and sends serialized frame.
@@ -83,33 +150,71 @@ class WebSocketServerHandler:
             )
         else:
             await self.send_handshake_response()
+            self._writer_task = asyncio.create_task(self._write_queued())
+
+            decoder = WebSocketFrameDecoder()
+            while not self._closing:
+                try:
+                    msg = await self._reader.read(self.READ_BYTES)
+                except ConnectionError as e:
+                    self._log.warning(f"WS receive failed: {e}")
+                    break
 
-            while True:
-                msg = await self._reader.read(8120)
                 if len(msg) == 0:
                     self._log.warning("received zero data, closing connection")
                     break
 
-                frame = WebSocketFrame.deserialize(msg)
-                self._log.debug(f"WS recv {frame}")
-
-                # client side messages must use mask
-                if not frame.has_mask:
-                    self._log.warning("Non-masked client message, "
-                                      "closing connection")
+                try:
+                    frames = decoder.feed(msg)
+                except WebSocketProtocolError as e:
+                    self._log.warning(f"Invalid client message, closing "
+                                      f"connection: {e}")
                     break
 
-                # close connection on client request
-                if frame.opcode == Opcode.CLOSE:
-                    self._log.info("Closing websocket connection")
+                if not await self._handle_frames(frames):
                     break
 
-                # respond to ping
-                if frame.opcode == Opcode.PING:
-                    pong_frame = WebSocketFrame.pong(frame.payload)
-                    await self.send_frame(pong_frame)
+            if self._subscription_service is not None:
+                self._subscription_service.remove(self)
 
-                await asyncio.sleep(1)
+            self._writer_task.cancel()
 
+        self._closing = True
         self._writer.close()
-        await self._writer.wait_closed()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    async def _handle_frames(self, frames: List[WebSocketFrame]) -> bool:
+        """Handles received frames, returns False when the connection should
+        be closed.
+        """
+        for frame in frames:
+            self._log.debug(lambda: f"WS recv {frame}")
+
+            # client side messages must use mask
+            if not frame.has_mask:
+                self._log.warning("Non-masked client message, "
+                                  "closing connection")
+                return False
+
+            # close connection on client request
+            if frame.opcode == Opcode.CLOSE:
+                self._log.info("Closing websocket connection")
+                return False
+
+            # respond to ping
+            if frame.opcode == Opcode.PING:
+                pong_frame = WebSocketFrame.pong(frame.payload)
+                await self.send_frame(pong_frame)
+
+            # subscription requests
+            if (
+                frame.opcode == Opcode.TEXT and
+                self._subscription_service is not None
+            ):
+                await self._subscription_service.on_message(self,
+                                                            frame.payload)
+
+        return True
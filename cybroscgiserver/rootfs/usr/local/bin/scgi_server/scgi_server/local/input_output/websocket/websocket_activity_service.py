@@ -0,0 +1,45 @@
+from typing import List, Protocol
+
+
+class WebSocketClientStats(Protocol):
+    @property
+    def peer(self) -> str:
+        ...
+
+    @property
+    def queue_depth(self) -> int:
+        ...
+
+    @property
+    def dropped_count(self) -> int:
+        ...
+
+    @property
+    def sent_count(self) -> int:
+        ...
+
+
+class WebSocketActivityService:
+    def __init__(self):
+        self._clients: List[WebSocketClientStats] = []
+        self._disconnected_dropped_count: int = 0
+
+    @property
+    def clients(self) -> List[WebSocketClientStats]:
+        return list(self._clients)
+
+    @property
+    def dropped_count(self) -> int:
+        """Total number of messages dropped because of slow clients.
+        """
+        return self._disconnected_dropped_count + sum(
+            client.dropped_count for client in self._clients
+        )
+
+    def report_client_connected(self, client: WebSocketClientStats) -> None:
+        self._clients.append(client)
+
+    def report_client_disconnected(self,
+                                   client: WebSocketClientStats) -> None:
+        self._clients.remove(client)
+        self._disconnected_dropped_count += client.dropped_count
@@ -28,6 +28,26 @@ class PlcInfoService:
     def load_static_plc_infos(self):
         self._load_static_plc_infos(self._static_plcs_configs)
 
+    async def update_static_plc_infos(
+        self,
+        static_plcs_configs: List[StaticPlcConfig]
+    ) -> None:
+        """Removes static controllers which are no longer configured and
+        loads new or changed ones.
+        """
+        old_configs = self._static_plcs_configs
+        self._static_plcs_configs = static_plcs_configs
+
+        nads = {config.nad for config in static_plcs_configs}
+        for plc_info in list(self.get_static_plc_infos()):
+            if plc_info.nad not in nads:
+                await self.remove_plc_info(plc_info.nad)
+
+        self._load_static_plc_infos([
+            config for config in static_plcs_configs
+            if config not in old_configs
+        ])
+
     def set_plc_client_manager(self, plc_client_manager: PlcClientManager):
         self._plc_client_manager = plc_client_manager
 
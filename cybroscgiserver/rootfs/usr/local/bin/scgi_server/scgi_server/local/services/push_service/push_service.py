@@ -3,6 +3,7 @@ from asyncio import AbstractEventLoop
 from typing import Optional
 
 from lib.general.conditional_logger import ConditionalLogger
+from lib.general.misc import create_task_callback
 from scgi_server.local.defaults import MAX_FRAME_BYTES, PUSH_NAD, \
     ABUS_BROADCAST_PORT
 from scgi_server.local.general.errors import ExchangerTimeoutError
@@ -50,8 +51,13 @@ class PushService:
     def receive(self, abus_msg: AbusMessage) -> None:
         """communication loop"""
         if abus_msg.is_push:
-            asyncio.run_coroutine_threadsafe(self._handle_push(abus_msg),
-                                             self._loop)
+            if asyncio.get_running_loop() is self._loop:
+                # single loop mode
+                task = self._loop.create_task(self._handle_push(abus_msg))
+                task.add_done_callback(create_task_callback(self._log))
+            else:
+                asyncio.run_coroutine_threadsafe(self._handle_push(abus_msg),
+                                                 self._loop)
 
     async def _handle_push(self, abus_msg: AbusMessage) -> None:
         self._push_activity_service.report_push_request_received()
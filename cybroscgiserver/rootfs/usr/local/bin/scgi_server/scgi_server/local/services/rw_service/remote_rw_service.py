@@ -0,0 +1,98 @@
+import asyncio
+from asyncio import StreamReader, StreamWriter, AbstractEventLoop, Future
+from pathlib import Path
+from typing import Optional, Dict, List, Callable
+
+from lib.general.conditional_logger import ConditionalLogger
+from lib.general.misc import create_task_callback
+from lib.input_output.scgi.r_response import RResponse
+from lib.services.cpu_intensive_task_runner import CPUIntensiveTaskRunner
+from scgi_server.local.input_output.ipc.ipc_stream import read_message, \
+    write_message
+from scgi_server.local.services.rw_service.errors import RWServiceError
+from scgi_server.local.services.rw_service.rw_plan import RWPlan
+from scgi_server.local.services.rw_service.rw_planner import RWPlanner
+
+
+class RemoteRWService(RWPlanner):
+    """Read/write service of a scgi worker process. Requests are planned in
+    the worker and the plan is processed by the main process, which owns the
+    controller communication, see `RWIpcServer`.
+    """
+    def __init__(self,
+                 log: ConditionalLogger,
+                 loop: AbstractEventLoop,
+                 path: Path,
+                 cpu_intensive_task_runner: CPUIntensiveTaskRunner,
+                 timeout_s: float,
+                 on_disconnected: Callable[[], None]):
+        super().__init__(cpu_intensive_task_runner)
+        self._log: ConditionalLogger = log
+        self._loop: AbstractEventLoop = loop
+        self._path: Path = path
+        # longest wait for the main process to process a plan
+        self._timeout_s: float = timeout_s
+        self._on_disconnected: Callable[[], None] = on_disconnected
+        self._writer: Optional[StreamWriter] = None
+        self._next_request_id: int = 0
+        self._pending: Dict[int, Future] = {}
+
+    async def connect(self, timeout_s: float) -> None:
+        """Connects to the main process, which may still be starting.
+        """
+        deadline = self._loop.time() + timeout_s
+        while True:
+            try:
+                reader, self._writer = await asyncio.open_unix_connection(
+                    str(self._path)
+                )
+                break
+            except OSError:
+                if self._loop.time() > deadline:
+                    raise
+                await asyncio.sleep(0.1)
+
+        task = self._loop.create_task(self._receive(reader))
+        task.add_done_callback(create_task_callback(self._log))
+
+    async def process_plan(self,
+                           plan: RWPlan,
+                           task_id: Optional[int] = None) -> List[RResponse]:
+        if self._writer is None or self._writer.is_closing():
+            raise ConnectionError("Not connected to the main process")
+
+        request_id = self._next_request_id
+        self._next_request_id += 1
+        future = self._loop.create_future()
+        self._pending[request_id] = future
+
+        try:
+            write_message(self._writer, (request_id, plan))
+            return await asyncio.wait_for(future, self._timeout_s)
+        except asyncio.TimeoutError:
+            raise RWServiceError(f"Main process didn't reply within "
+                                 f"{self._timeout_s:g} s")
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def _receive(self, reader: StreamReader) -> None:
+        try:
+            while True:
+                request_id, responses, error = await read_message(reader)
+                future = self._pending.get(request_id)
+                if future is None or future.done():
+                    continue
+                if error is None:
+                    future.set_result(responses)
+                else:
+                    future.set_exception(error)
+        except asyncio.IncompleteReadError:
+            self._log.info("Main process disconnected")
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(
+                        ConnectionError("Main process disconnected")
+                    )
+            self._writer.close()
+            self._on_disconnected()
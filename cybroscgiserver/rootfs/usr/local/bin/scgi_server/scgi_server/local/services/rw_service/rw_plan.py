@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+from typing import List, Dict
+
+from scgi_server.local.services.rw_service.scgi_communication.rw_request \
+    import RWRequest
+
+
+@dataclass(frozen=True)
+class RWPlan:
+    """Read/write requests classified by target and grouped by controller,
+    ready to be processed by `RWService`.
+    """
+    sys_status_r_requests: List[RWRequest]
+    sys_status_w_requests: List[RWRequest]
+    plc_status_r_requests_by_nad: Dict[int, List[RWRequest]]
+    plc_r_requests_by_nad: Dict[int, List[RWRequest]]
+    plc_w_requests_by_nad: Dict[int, List[RWRequest]]
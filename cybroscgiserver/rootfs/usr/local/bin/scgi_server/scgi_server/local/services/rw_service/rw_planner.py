@@ -0,0 +1,144 @@
+from abc import ABC, abstractmethod
+from typing import Optional, List, Dict, Tuple
+
+from lib.input_output.scgi.r_response import RResponse
+from lib.services.cpu_intensive_task_runner import \
+    CPUIntensiveTaskRunner
+from scgi_server.local.services.rw_service.rw_plan import RWPlan
+from scgi_server.local.services.rw_service.scgi_communication.rw_request \
+    import RWRequest
+
+
+class RWPlanner(ABC):
+    """Plans read/write requests of scgi clients. Plans are processed by
+    `RWService` in the main process and by `RemoteRWService` in scgi
+    worker processes.
+    """
+    def __init__(self, cpu_intensive_task_runner: CPUIntensiveTaskRunner):
+        self._cpu_intensive_task_runner: CPUIntensiveTaskRunner = (
+            cpu_intensive_task_runner
+        )
+
+    async def on_rw_requests(self,
+                             r_requests: Optional[List[RWRequest]] = None,
+                             w_requests: Optional[List[RWRequest]] = None,
+                             task_id: Optional[int] = None) -> List[RResponse]:
+        plan = await self.create_plan(r_requests, w_requests)
+        return await self.process_plan(plan, task_id)
+
+    async def create_plan(self,
+                          r_requests: Optional[List[RWRequest]] = None,
+                          w_requests: Optional[List[RWRequest]] = None
+                          ) -> RWPlan:
+        """Classifies requests by target and groups them by controller. The
+        plan depends only on the requests, so it may be reused for repeated
+        requests.
+        """
+        if r_requests is None:
+            r_requests = []
+        if w_requests is None:
+            w_requests = []
+
+        sys_status_w_requests = [
+            request for request in w_requests
+            if request.target == RWRequest.Target.SYSTEM
+        ]
+        if len(sys_status_w_requests) > 0:
+            w_requests = [
+                request for request in w_requests
+                if request.target != RWRequest.Target.SYSTEM
+            ]
+
+        sys_status_r_requests: List[RWRequest]
+        plc_status_r_requests: List[RWRequest]
+        plc_r_requests: List[RWRequest]
+        (
+            sys_status_r_requests,
+            plc_status_r_requests,
+            plc_r_requests
+        ) = await self._cpu_intensive_task_runner.run(
+            self._classify_read_requests_by_target,
+            r_requests
+        )
+
+        plc_status_r_requests_by_nad: Dict[int, List[RWRequest]]
+        plc_r_requests_by_nad: Dict[int, List[RWRequest]]
+        plc_w_requests_by_nad: Dict[int, List[RWRequest]]
+        (
+            plc_status_r_requests_by_nad,
+            plc_r_requests_by_nad,
+            plc_w_requests_by_nad
+        ) = (
+            await self._cpu_intensive_task_runner.run(
+                self._group_requests_by_nad,
+                plc_status_r_requests
+            ),
+            await self._cpu_intensive_task_runner.run(
+                self._group_requests_by_nad,
+                plc_r_requests
+            ),
+            await self._cpu_intensive_task_runner.run(
+                self._group_requests_by_nad,
+                w_requests
+            )
+        )
+
+        return RWPlan(
+            sys_status_r_requests,
+            sys_status_w_requests,
+            plc_status_r_requests_by_nad,
+            plc_r_requests_by_nad,
+            plc_w_requests_by_nad
+        )
+
+    @abstractmethod
+    async def process_plan(self,
+                           plan: RWPlan,
+                           task_id: Optional[int] = None) -> List[RResponse]:
+        pass
+
+    @staticmethod
+    def _classify_read_requests_by_target(
+        requests: List[RWRequest]
+    ) -> Tuple[
+        List[RWRequest],
+        List[RWRequest],
+        List[RWRequest]
+    ]:
+        """Separates requests by type onto list of system request,
+        list of plc system requests and plc requests.
+        """
+        sys_status_requests: List[RWRequest] = []
+        plc_status_requests: List[RWRequest] = []
+        plc_requests: List[RWRequest] = []
+
+        for request in requests:
+            if request.target == RWRequest.Target.SYSTEM:
+                sys_status_requests.append(request)
+            elif request.target == RWRequest.Target.PLC_SYSTEM:
+                plc_status_requests.append(request)
+            elif request.target == RWRequest.Target.PLC:
+                plc_requests.append(request)
+
+        return (
+            sys_status_requests,
+            plc_status_requests,
+            plc_requests
+        )
+
+    @staticmethod
+    def _group_requests_by_nad(requests: List[RWRequest]
+                               ) -> Dict[int, List[RWRequest]]:
+        result = {}
+
+        for request in requests:
+            nad = request.nad
+            try:
+                requests_for_nad = result[nad]
+            except KeyError:
+                requests_for_nad = []
+                result[nad] = requests_for_nad
+
+            requests_for_nad.append(request)
+
+        return result
@@ -1,29 +1,37 @@
-import re
-from dataclasses import dataclass
 from enum import Enum
-from typing import Optional, Tuple
+from typing import Optional, Tuple, NamedTuple, Dict
 
+from scgi_server.local.defaults import TAG_NAME_CACHE_SIZE
 from scgi_server.local.services.rw_service.errors import InvalidTagNameError
 from scgi_server.local.services.rw_service.scgi_communication.operation_type import \
     OperationType
 
 
-@dataclass(frozen=True)
-class RWRequest:
+class RWRequest(NamedTuple):
     @classmethod
     def create(cls,
                name: str,
                value: Optional[str] = None,
                idx: Optional[int] = None):
-        if len(name) == 0:
-            raise InvalidTagNameError(name)
+        try:
+            read_request = _read_requests[name]
+        except KeyError:
+            read_request = cls._create_read_request(name)
+
+        if value is None and idx is None:
+            return read_request
 
         operation_type = OperationType.READ \
             if value is None \
             else OperationType.WRITE
-        (target, tag_name, nad) = cls._determine_target_tag_name_and_nad(name)
 
-        return cls(name, tag_name, value, operation_type, target, nad, idx)
+        return cls(name,
+                   read_request.tag_name,
+                   value,
+                   operation_type,
+                   read_request.target,
+                   read_request.nad,
+                   idx)
 
     class Target(Enum):
         SYSTEM = 0,
@@ -38,6 +46,25 @@ class RWRequest:
     nad: int
     idx: Optional[int]
 
+    @classmethod
+    def _create_read_request(cls, name: str) -> 'RWRequest':
+        """Parses tag name and keeps the read request, requests are
+        immutable so the same instance is returned for the same name.
+        """
+        if len(name) == 0:
+            raise InvalidTagNameError(name)
+
+        (target, tag_name, nad) = cls._determine_target_tag_name_and_nad(name)
+        result = cls(name, tag_name, None, OperationType.READ, target, nad,
+                     None)
+
+        if len(_read_requests) >= TAG_NAME_CACHE_SIZE:
+            # oldest first
+            del _read_requests[next(iter(_read_requests))]
+        _read_requests[name] = result
+
+        return result
+
     @classmethod
     def _determine_target_tag_name_and_nad(
         cls,
@@ -48,11 +75,11 @@ class RWRequest:
         if plc_name == "sys":
             return cls.Target.SYSTEM, rest_of_name, None
 
-        match = re.search(r'^c(\d+)$', plc_name)
+        nad_str = plc_name[1:]
 
-        if match is not None:
+        if plc_name[:1] == "c" and nad_str.isdigit():
             try:
-                nad = int(match[1])
+                nad = int(nad_str)
             except ValueError:
                 raise InvalidTagNameError(name)
 
@@ -66,3 +93,7 @@ class RWRequest:
                         nad)
         else:
             raise InvalidTagNameError(name)
+
+
+# parsed read requests by tag name
+_read_requests: Dict[str, RWRequest] = {}
@@ -7,7 +7,7 @@ from scgi_server.local.services.rw_service.subservices.plc_comm_service.plc_clie
 from scgi_server.local.services.rw_service.subservices.plc_comm_service.plc_client_manager.plc_client.status import PlcStatus
 
 
-@dataclass
+@dataclass(slots=True)
 class PlcActivity:
     class DeviceStatus(Enum):
         UNKNOWN = auto()
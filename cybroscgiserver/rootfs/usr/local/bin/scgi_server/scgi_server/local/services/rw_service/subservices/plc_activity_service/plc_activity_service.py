@@ -1,6 +1,8 @@
 from datetime import datetime
 from typing import Optional, Dict
 
+from lib.general.metrics import MetricsRegistry, LATENCY_BUCKETS, \
+    COUNT_BUCKETS
 from scgi_server.local.services.rw_service.subservices.plc_activity_service.plc_activity \
     import PlcActivity
 
@@ -10,8 +12,24 @@ class PlcActivityService:
     Manages activity information for every plc
     """
 
-    def __init__(self):
+    def __init__(self, metrics: MetricsRegistry):
         self._activities: Dict[int, PlcActivity] = {}
+        self._exchange_seconds = metrics.histogram(
+            "plc_exchange_seconds",
+            "Duration of successful a-bus exchanges with controllers",
+            LATENCY_BUCKETS,
+            ("nad",)
+        )
+        self._exchanges = metrics.counter(
+            "plc_exchanges_total",
+            "Finished a-bus exchanges with controllers",
+            ("nad", "result")
+        )
+        self._read_frames = metrics.histogram(
+            "plc_read_frames",
+            "A-bus frames needed to read variables of a request",
+            COUNT_BUCKETS
+        ).labels()
 
     def __getitem__(self, nad):
         try:
@@ -31,12 +49,18 @@ class PlcActivityService:
         activity.successful_exchanges_count += 1
         activity.bytes_transferred += bytes_count
         activity.last_exchange_duration = duration
+        self._exchange_seconds.labels(nad).observe(duration.total_seconds())
+        self._exchanges.labels(nad, "ok").inc()
 
     def report_exchange_failed(self, nad: int):
         activity = self[nad]
         activity.last_failed_exchange_time = datetime.now()
         activity.failed_exchanges_count += 1
         activity.last_exchange_duration = None
+        self._exchanges.labels(nad, "timeout").inc()
+
+    def report_read_frames(self, frame_count: int) -> None:
+        self._read_frames.observe(frame_count)
 
     def report_alc_crc_used(self, nad: int, alc_crc: Optional[int]):
         self[nad].last_used_alc_crc = alc_crc
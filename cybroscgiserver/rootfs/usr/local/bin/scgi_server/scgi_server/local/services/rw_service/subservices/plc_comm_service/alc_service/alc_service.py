@@ -1,9 +1,11 @@
+import asyncio
 import functools
 import os
 import re
 from asyncio import AbstractEventLoop
 from pathlib import Path
-from typing import AsyncGenerator, Optional, Dict, Tuple
+from time import perf_counter
+from typing import Optional, Dict, Tuple, List
 
 from lib.general.conditional_logger import ConditionalLogger
 from lib.general.misc import create_task_callback
@@ -25,32 +27,56 @@ class AlcService:
         self._loop: AbstractEventLoop = loop
         self._alc_dir: Path = alc_dir
         self._crc_to_alc: Dict[int, Dict[str, VarInfo]] = {}
+        self._loading: Optional[asyncio.Task] = None
 
     async def initialize_with_alc_files(self) -> None:
-        async for crc, alc in self._read_alc_files():
-            self._crc_to_alc[crc] = alc
-
-    async def _read_alc_files(
-        self
-    ) -> AsyncGenerator[Tuple[int, Dict[str, VarInfo]], None]:
+        """Loads all alc files, files are read and parsed concurrently.
+        """
+        start = perf_counter()
+        files = await self._loop.run_in_executor(None, self._list_alc_files)
+        alcs = await asyncio.gather(*(self._load_alc(f) for _, f in files))
+
+        for (crc, _), alc in zip(files, alcs):
+            if alc is not None:
+                # alc fetched from a controller in the meantime is the same
+                self._crc_to_alc.setdefault(crc, alc)
+
+        self._log.info(lambda: f"Loaded {len(files)} alc files in "
+                               f"{(perf_counter() - start) * 1000:.0f} ms")
+
+    def start_loading_alc_files(self) -> None:
+        """Loads alc files in the background.
+        """
+        self._loading = self._loop.create_task(
+            self.initialize_with_alc_files()
+        )
+        self._loading.add_done_callback(create_task_callback(self._log))
+
+    async def wait_for_alc_files(self) -> None:
+        """Waits until alc files started by `start_loading_alc_files` are
+        loaded.
+        """
+        if self._loading is not None and not self._loading.done():
+            await asyncio.shield(self._loading)
+
+    def _list_alc_files(self) -> List[Tuple[int, Path]]:
         if not self._alc_dir.exists():
             os.makedirs(self._alc_dir.resolve(), mode=0o755, exist_ok=False)
-        else:
-            for f in self._alc_dir.iterdir():
-                if not f.is_file():
-                    continue
+            return []
+
+        result = []
+        for f in self._alc_dir.iterdir():
+            if not f.is_file():
+                continue
 
-                crc = self._filename_to_crc(f.name)
-                if crc is None:
-                    self._log.error(lambda:
-                                    f"Invalid alc filename \"{f.name}\"")
-                    continue
+            crc = self._filename_to_crc(f.name)
+            if crc is None:
+                self._log.error(lambda: f"Invalid alc filename \"{f.name}\"")
+                continue
 
-                alc = await self._load_alc(f)
-                if alc is None:
-                    continue
+            result.append((crc, f))
 
-                yield crc, alc
+        return result
 
     def set_alc_text(self, alc_text: str, crc: int) -> None:
         self._loop \
@@ -67,7 +93,12 @@ class AlcService:
         self._crc_to_alc[crc] = alc
 
     async def _load_alc(self, path: Path) -> Optional[Dict[str, VarInfo]]:
-        alc_text = await self._load_alc_text(path)
+        return await self._loop.run_in_executor(None,
+                                                self._load_alc_blocking,
+                                                path)
+
+    def _load_alc_blocking(self, path: Path) -> Optional[Dict[str, VarInfo]]:
+        alc_text = self._load_alc_text_blocking(path)
         if alc_text is None:
             return None
         return AlcParser.parse(alc_text)
@@ -1,11 +1,10 @@
-from dataclasses import dataclass
+from typing import NamedTuple
 
 from scgi_server.local.services.rw_service.subservices \
     .plc_comm_service.data_type import DataType
 
 
-@dataclass(frozen=True)
-class VarInfo:
+class VarInfo(NamedTuple):
     # Attr [1]
     id: int
     # Name [7]
@@ -0,0 +1,91 @@
+from collections import OrderedDict
+from typing import Tuple, Protocol
+
+# estimated memory used by a single cache entry apart from its strings (item,
+# dictionary slots, expiry heap and lru entries) [bytes]
+ENTRY_OVERHEAD_BYTES = 256
+
+
+class EvictableCache(Protocol):
+    def evict(self, name: str) -> None:
+        ...
+
+
+class CacheBudget:
+    """Limits number of entries and estimated memory of all plc caches
+    together. Least recently used entries are evicted first, regardless of
+    the controller they belong to.
+    """
+    def __init__(self, max_entries: int, max_bytes: int):
+        # 0 means unlimited
+        self._max_entries: int = max_entries
+        self._max_bytes: int = max_bytes
+
+        # (nad, name) -> (cache, estimated size)
+        self._lru: OrderedDict[
+            Tuple[int, str], Tuple[EvictableCache, int]
+        ] = OrderedDict()
+        self._bytes: int = 0
+        self._evictions: int = 0
+
+    @property
+    def entries(self) -> int:
+        return len(self._lru)
+
+    @property
+    def bytes(self) -> int:
+        return self._bytes
+
+    @property
+    def evictions(self) -> int:
+        return self._evictions
+
+    @staticmethod
+    def estimate_size(name: str, value: str, description: str) -> int:
+        return (ENTRY_OVERHEAD_BYTES + len(name) + len(value) +
+                len(description))
+
+    def add(self, nad: int, name: str, cache: EvictableCache, size: int
+            ) -> None:
+        """Registers new or updated entry and evicts least recently used
+        entries when the budget is exceeded.
+        """
+        key = (nad, name)
+        previous = self._lru.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous[1]
+
+        self._lru[key] = (cache, size)
+        self._bytes += size
+
+        self._evict_exceeding()
+
+    def set_limits(self, max_entries: int, max_bytes: int) -> None:
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._evict_exceeding()
+
+    def touch(self, nad: int, name: str) -> None:
+        try:
+            self._lru.move_to_end((nad, name))
+        except KeyError:
+            pass
+
+    def remove(self, nad: int, name: str) -> None:
+        entry = self._lru.pop((nad, name), None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def _evict_exceeding(self) -> None:
+        while len(self._lru) > 1 and self._is_exceeded():
+            (_, evicted_name), (evicted_cache, evicted_size) = \
+                self._lru.popitem(last=False)
+            self._bytes -= evicted_size
+            self._evictions += 1
+            evicted_cache.evict(evicted_name)
+
+    def _is_exceeded(self) -> bool:
+        return (
+            (self._max_entries != 0 and len(self._lru) > self._max_entries) or
+            (self._max_bytes != 0 and self._bytes > self._max_bytes)
+        )
@@ -0,0 +1,156 @@
+import asyncio
+from datetime import timedelta
+from math import inf
+from time import monotonic
+from typing import Callable, Awaitable, Dict, List, Tuple, Any
+
+from lib.general.conditional_logger import ConditionalLogger
+from lib.general.misc import create_task_callback
+from lib.services.alias_service import AliasService
+from scgi_server.local.services.rw_service.errors import InvalidTagNameError
+from scgi_server.local.services.rw_service.scgi_communication.rw_request \
+    import RWRequest
+
+# fractional part of the golden ratio, spreads start offsets of any number of
+# controllers evenly over the poll period
+_STAGGER_STEP = 0.6180339887
+
+
+class CachePoller:
+    """Keeps a working set of variables fresh in the plc cache.
+
+    The working set of each controller consists of variables requested by
+    clients in the last `idle_period` and of the variables listed in the
+    configuration. Each controller is refreshed with a single read per
+    period, controllers are started with different offsets so the reads
+    don't happen all at once.
+    """
+    def __init__(self,
+                 log: ConditionalLogger,
+                 refresh: Callable[[int, List[RWRequest]], Awaitable[Any]],
+                 alias_service: AliasService,
+                 period: timedelta,
+                 idle_period: timedelta,
+                 static_tags: List[str],
+                 clock: Callable[[], float] = monotonic,
+                 sleep: Callable[[float], Awaitable[None]] = asyncio.sleep):
+        self._log: ConditionalLogger = log
+        self._refresh: Callable[[int, List[RWRequest]], Awaitable[Any]] = (
+            refresh
+        )
+        self._alias_service: AliasService = alias_service
+        self._period_s: float = period.total_seconds()
+        self._idle_period_s: float = idle_period.total_seconds()
+        # names or aliases of controllers, resolved when polling starts
+        self._static_tags: List[str] = static_tags
+        self._clock: Callable[[], float] = clock
+        self._sleep: Callable[[float], Awaitable[None]] = sleep
+
+        # nad -> tag name -> (request, time of the last client request)
+        self._working_sets: Dict[
+            int, Dict[str, Tuple[RWRequest, float]]
+        ] = {}
+        self._tasks: Dict[int, asyncio.Task] = {}
+        self._started_count: int = 0
+
+    @property
+    def polled_tags_count(self) -> int:
+        return sum(len(tags) for tags in self._working_sets.values())
+
+    def start(self) -> None:
+        """Adds configured variables to the working set and starts polling.
+        """
+        for name in self._static_tags:
+            try:
+                request = RWRequest.create(
+                    self._alias_service.to_nad_name(name)
+                )
+            except InvalidTagNameError:
+                self._log.error(f"Invalid poll tag: {name}")
+                continue
+
+            if request.target != RWRequest.Target.PLC:
+                self._log.error(f"Only controller variables can be polled, "
+                                f"skipping {name}")
+                continue
+
+            self._add(request.nad, request, inf)
+
+    def stop(self) -> None:
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+        self._working_sets.clear()
+
+    def touch(self, nad: int, requests: List[RWRequest]) -> None:
+        """Reports variables requested by client.
+        """
+        now = self._clock()
+        for request in requests:
+            self._add(nad, request, now)
+
+    def is_polled(self, nad: int, tag_name: str) -> bool:
+        try:
+            return tag_name in self._working_sets[nad]
+        except KeyError:
+            return False
+
+    def _add(self, nad: int, request: RWRequest, time: float) -> None:
+        working_set = self._working_sets.setdefault(nad, {})
+        try:
+            if working_set[request.tag_name][1] == inf:
+                return
+        except KeyError:
+            pass
+        working_set[request.tag_name] = (request, time)
+
+        if nad not in self._tasks:
+            offset = (self._started_count * _STAGGER_STEP) % 1.0
+            self._started_count += 1
+
+            task = asyncio.get_running_loop().create_task(
+                self._poll(nad, offset * self._period_s)
+            )
+            task.add_done_callback(create_task_callback(self._log))
+            self._tasks[nad] = task
+
+    def _evict(self, nad: int, now: float) -> List[RWRequest]:
+        """Removes idle variables and returns remaining working set.
+        """
+        working_set = self._working_sets[nad]
+        idle = [
+            tag_name
+            for tag_name, (_, time) in working_set.items()
+            if now - time > self._idle_period_s
+        ]
+        for tag_name in idle:
+            del working_set[tag_name]
+
+        if len(idle) > 0:
+            self._log.debug(lambda: f"c{nad} stopped polling {len(idle)} "
+                                    f"idle variables")
+
+        return [request for request, _ in working_set.values()]
+
+    async def _poll(self, nad: int, offset_s: float) -> None:
+        self._log.debug(lambda: f"c{nad} polling started, offset "
+                                f"{offset_s:.2f}s")
+        await self._sleep(offset_s)
+
+        while True:
+            started = self._clock()
+            requests = self._evict(nad, started)
+            if len(requests) == 0:
+                del self._working_sets[nad]
+                del self._tasks[nad]
+                self._log.debug(lambda: f"c{nad} polling stopped")
+                return
+
+            try:
+                await self._refresh(nad, requests)
+            except Exception as e:
+                self._log.error(f"c{nad} background refresh failed: {e}")
+
+            await self._sleep(
+                max(0.0, self._period_s - (self._clock() - started))
+            )
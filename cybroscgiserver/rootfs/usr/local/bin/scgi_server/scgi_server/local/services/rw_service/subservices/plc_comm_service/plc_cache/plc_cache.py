@@ -1,10 +1,10 @@
 from asyncio import AbstractEventLoop
 from datetime import timedelta
-from typing import Dict
-
-from rx import timer
-from rx.scheduler.eventloop import AsyncIOScheduler
+from time import monotonic
+from typing import Dict, List, Tuple, Callable
 
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_cache.cache_budget import CacheBudget
 from scgi_server.local.services.rw_service.subservices.plc_comm_service \
     .plc_cache.single_plc_cache import SinglePlcCache
 
@@ -14,20 +14,60 @@ class PlcCache:
                  loop: AbstractEventLoop,
                  cleanup_period: timedelta,
                  request_period: timedelta,
-                 valid_period: timedelta):
+                 valid_period: timedelta,
+                 budget: CacheBudget,
+                 idle_period: timedelta,
+                 clock: Callable[[], float] = monotonic):
         self._loop: AbstractEventLoop = loop
+        # time.monotonic, replaced in tests
+        self._clock: Callable[[], float] = clock
         self._plc_caches: Dict[int, SinglePlcCache] = {}
         self._request_period: timedelta = request_period
         self._valid_period: timedelta = valid_period
+        self._budget: CacheBudget = budget
+        self._idle_period_s: float = idle_period.total_seconds()
 
         cleanup_period_s = cleanup_period.total_seconds()
+        self._cleanup_enabled: bool = cleanup_period_s != 0
 
+        # caches of idle controllers are removed even when cleanup of
+        # expired items is disabled
+        if not self._cleanup_enabled:
+            cleanup_period_s = self._idle_period_s
+
+        self._cleanup_period_s: float = cleanup_period_s
         if cleanup_period_s != 0:
-            timer(
-                cleanup_period_s,
-                cleanup_period_s,
-                AsyncIOScheduler(loop)
-            ).subscribe(lambda _: self._cleanup())
+            loop.call_later(cleanup_period_s, self._on_cleanup_timer)
+
+    @property
+    def plc_count(self) -> int:
+        return len(self._plc_caches)
+
+    @property
+    def entries(self) -> int:
+        return self._budget.entries
+
+    @property
+    def bytes(self) -> int:
+        return self._budget.bytes
+
+    @property
+    def evictions(self) -> int:
+        return self._budget.evictions
+
+    def set_periods(self,
+                    request_period: timedelta,
+                    valid_period: timedelta) -> None:
+        """Changes periods of values stored from now on, values already in
+        the cache keep their expiry time.
+        """
+        self._request_period = request_period
+        self._valid_period = valid_period
+        for cache in self._plc_caches.values():
+            cache.set_periods(request_period, valid_period)
+
+    def set_limits(self, max_entries: int, max_bytes: int) -> None:
+        self._budget.set_limits(max_entries, max_bytes)
 
     def __getitem__(self, nad: int) -> SinglePlcCache:
         try:
@@ -36,11 +76,39 @@ class PlcCache:
             result = SinglePlcCache(
                 self._loop,
                 self._request_period,
-                self._valid_period
+                self._valid_period,
+                nad,
+                self._budget,
+                self._clock
             )
             self._plc_caches[nad] = result
             return result
 
+    def get_snapshot(self) -> Dict[int, List[Tuple[str, str, str, float]]]:
+        """Returns name, value, description and age [s] of valid items of
+        each controller.
+        """
+        return {
+            nad: cache.get_snapshot()
+            for nad, cache in self._plc_caches.items()
+        }
+
+    def _on_cleanup_timer(self) -> None:
+        self._cleanup()
+        self._loop.call_later(self._cleanup_period_s, self._on_cleanup_timer)
+
     def _cleanup(self) -> None:
-        for nad in self._plc_caches:
-            self._plc_caches[nad].cleanup()
+        now = self._clock()
+
+        for nad in list(self._plc_caches):
+            cache = self._plc_caches[nad]
+            if self._cleanup_enabled:
+                cache.cleanup(now)
+
+            if (
+                not cache.has_pending_futures and
+                (len(cache) == 0 or
+                 now - cache.last_access > self._idle_period_s)
+            ):
+                cache.clear()
+                del self._plc_caches[nad]
@@ -1,12 +1,20 @@
+import asyncio
+import struct
 from dataclasses import dataclass
-from typing import Dict, Set, List
+from typing import Dict, Set, List, Union
 
 from lib.general.conditional_logger import ConditionalLogger
 from lib.input_output.scgi.r_response import RResponse
 from scgi_server.local.services.rw_service.scgi_communication.rw_request \
     import RWRequest
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .data_type import DataType
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_rw_request import PlcRWRequest
 from scgi_server.local.services.rw_service.subservices.plc_comm_service \
     .plc_cache.cache_value_condition import CacheValueCondition
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_cache.plc_cache import PlcCache
 from scgi_server.local.services.rw_service.subservices.plc_comm_service \
     .plc_cache.single_plc_cache import SinglePlcCache, CacheValue
 
@@ -25,9 +33,17 @@ class PlcCacheFacade:
 
     def __init__(self,
                  log: ConditionalLogger,
-                 cache: SinglePlcCache):
+                 plc_cache: PlcCache,
+                 nad: int):
         self._log: ConditionalLogger = log
-        self._cache: SinglePlcCache = cache
+        self._plc_cache: PlcCache = plc_cache
+        self._nad: int = nad
+
+    @property
+    def _cache(self) -> SinglePlcCache:
+        # looked up each time, cache of an idle controller is removed and
+        # created again on next access
+        return self._plc_cache[self._nad]
 
     def start_futures(self, requests: List[RWRequest]) -> None:
         for request in requests:
@@ -43,42 +59,82 @@ class PlcCacheFacade:
             else:
                 self._cache.cancel_future(name)
 
+    def write_through(self, requests: List[PlcRWRequest]) -> None:
+        """Stores successfully written values, as they would be read back
+        from the controller.
+        """
+        for request in requests:
+            try:
+                value = self._to_read_value(request)
+            except (struct.error, TypeError):
+                self._cache.invalidate(request.var_name)
+                continue
+
+            self._cache.set_value(request.var_name,
+                                  str(value),
+                                  request.alc_data.description)
+
+    @staticmethod
+    def _to_read_value(request: PlcRWRequest) -> Union[int, float]:
+        if request.idx is not None:
+            raise TypeError("indexed write")
+
+        alc_data = request.alc_data
+        if alc_data.size == 1:
+            fmt = "<B"
+        elif alc_data.size == 2:
+            fmt = "<h"
+        elif alc_data.data_type == DataType.REAL:
+            fmt = "<f"
+        else:
+            fmt = "<l"
+
+        # same conversion as reading the value from the controller
+        return struct.unpack(fmt, struct.pack(fmt, request.value))[0]
+
     async def read(self, requests: List[RWRequest]) -> ReadResult:
         fresh = {}
         stinky = {}
         not_available_immediately = set()
 
+        values = self._cache.get_values(
+            request.tag_name for request in requests
+        )
+
         for request in requests:
-            name = request.tag_name
-            try:
-                value = self._cache.get_value(name)
-                if value.condition == CacheValueCondition.FRESH:
-                    fresh[request] = (
-                        self._create_r_response_from_cached_value(request,
-                                                                  value)
-                    )
-                elif value.condition == CacheValueCondition.STINKY:
-                    stinky[request] = (
-                        self._create_r_response_from_cached_value(request,
-                                                                  value)
-                    )
-                else:
-                    not_available_immediately.add(request)
-            except KeyError:
+            value = values.get(request.tag_name)
+            if value is None:
+                not_available_immediately.add(request)
+            elif value.condition == CacheValueCondition.FRESH:
+                fresh[request] = (
+                    self._create_r_response_from_cached_value(request, value)
+                )
+            elif value.condition == CacheValueCondition.STINKY:
+                stinky[request] = (
+                    self._create_r_response_from_cached_value(request, value)
+                )
+            else:
                 not_available_immediately.add(request)
 
+        # wait for reads in progress of all missing variables together
+        pending = list(not_available_immediately)
+        results = await asyncio.gather(
+            *(self._cache.get_future_value(request.tag_name)
+              for request in pending),
+            return_exceptions=True
+        )
+
         not_available = set()
 
-        for request in not_available_immediately:
-            name = request.tag_name
-            try:
-                value = await self._cache.get_future_value(name)
+        for request, result in zip(pending, results):
+            if isinstance(result, BaseException):
+                # no read in progress or the read failed
+                not_available.add(request)
+            else:
                 fresh[request] = (
                     self._create_r_response_from_cached_value(request,
-                                                              value)
+                                                              result)
                 )
-            except KeyError:
-                not_available.add(request)
 
         return ReadResult(fresh, stinky, not_available)
 
@@ -0,0 +1,102 @@
+import asyncio
+from typing import Dict, Set, List, Callable, Awaitable, Any, Optional
+
+from lib.general.conditional_logger import ConditionalLogger
+from lib.general.misc import create_task_callback
+from scgi_server.local.services.rw_service.scgi_communication.rw_request \
+    import RWRequest
+
+
+class RevalidationCoordinator:
+    """Refreshes cached variables in the background.
+
+    A variable which is already being refreshed is not requested again, so
+    a burst of requests for the same stale variables results in a single
+    read from the controller. Number of concurrently running refreshes is
+    limited.
+    """
+    def __init__(self, log: ConditionalLogger, max_concurrency: int):
+        self._log: ConditionalLogger = log
+        self._max_concurrency: int = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # nad -> tag names being refreshed
+        self._in_flight: Dict[int, Set[str]] = {}
+        self._deduplicated_count: int = 0
+
+    @property
+    def in_flight_count(self) -> int:
+        return sum(len(tags) for tags in self._in_flight.values())
+
+    @property
+    def deduplicated_count(self) -> int:
+        """Number of variable refreshes skipped because the same variable
+        was already being refreshed.
+        """
+        return self._deduplicated_count
+
+    def schedule(self,
+                 nad: int,
+                 requests: List[RWRequest],
+                 refresh: Callable[[List[RWRequest]], Awaitable[Any]]
+                 ) -> None:
+        """Starts background refresh of variables which are not already
+        being refreshed.
+        """
+        requests = self._claim(nad, requests)
+        if len(requests) == 0:
+            return
+
+        (asyncio.get_running_loop()
+         .create_task(self._refresh(nad, requests, refresh))
+         .add_done_callback(create_task_callback(self._log)))
+
+    async def run(self,
+                  nad: int,
+                  requests: List[RWRequest],
+                  refresh: Callable[[List[RWRequest]], Awaitable[Any]]
+                  ) -> None:
+        """Refreshes variables which are not already being refreshed and
+        waits for the refresh to finish.
+        """
+        requests = self._claim(nad, requests)
+        if len(requests) > 0:
+            await self._refresh(nad, requests, refresh)
+
+    def _claim(self,
+               nad: int,
+               requests: List[RWRequest]) -> List[RWRequest]:
+        in_flight = self._in_flight.setdefault(nad, set())
+
+        claimed = []
+        for request in requests:
+            if request.tag_name in in_flight:
+                self._deduplicated_count += 1
+            else:
+                in_flight.add(request.tag_name)
+                claimed.append(request)
+
+        if len(in_flight) == 0:
+            del self._in_flight[nad]
+
+        return claimed
+
+    async def _refresh(self,
+                       nad: int,
+                       requests: List[RWRequest],
+                       refresh: Callable[[List[RWRequest]], Awaitable[Any]]
+                       ) -> None:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        try:
+            async with self._semaphore:
+                self._log.debug(lambda: f"c{nad} revalidating "
+                                        f"{len(requests)} variables")
+                await refresh(requests)
+        finally:
+            in_flight = self._in_flight[nad]
+            in_flight.difference_update(
+                request.tag_name for request in requests
+            )
+            if len(in_flight) == 0:
+                del self._in_flight[nad]
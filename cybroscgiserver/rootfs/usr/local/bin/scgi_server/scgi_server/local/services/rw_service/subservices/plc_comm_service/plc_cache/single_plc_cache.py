@@ -1,13 +1,16 @@
 from asyncio import AbstractEventLoop, Future
-from dataclasses import dataclass
-from datetime import datetime, timedelta
-from typing import Dict
-
+from datetime import timedelta
+from heapq import heappush, heappop, heapify
+from time import monotonic
+from typing import Dict, List, Tuple, Iterable, Optional, NamedTuple, \
+    Callable
+
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_cache.cache_budget import CacheBudget
 from scgi_server.local.services.rw_service.subservices.plc_comm_service.plc_cache.cache_value_condition import CacheValueCondition
 
 
-@dataclass(frozen=True)
-class CacheValue:
+class CacheValue(NamedTuple):
     value: str
     description: str
     condition: CacheValueCondition
@@ -18,72 +21,222 @@ class SinglePlcCache:
     Cache for single plc
     """
 
-    @dataclass(frozen=True)
     class Item:
-        value: str
-        description: str
-        expiry: datetime
+        __slots__ = ("value", "description", "expiry")
+
+        def __init__(self, value: str, description: str, expiry: float):
+            self.value: str = value
+            self.description: str = description
+            # time of the cache clock
+            self.expiry: float = expiry
 
     def __init__(self,
                  loop: AbstractEventLoop,
                  request_period: timedelta,
-                 valid_period: timedelta):
+                 valid_period: timedelta,
+                 nad: int = 0,
+                 budget: Optional[CacheBudget] = None,
+                 clock: Callable[[], float] = monotonic):
         self._loop: AbstractEventLoop = loop
-        self._request_period: timedelta = request_period
-        self._valid_period: timedelta = valid_period
-
-        self._name_to_item_dict: Dict[str, 'Item'] = {}
+        self._clock: Callable[[], float] = clock
+        self._request_period_s: float = request_period.total_seconds()
+        self._valid_period_s: float = valid_period.total_seconds()
+        self._nad: int = nad
+        self._budget: Optional[CacheBudget] = budget
+        self._last_access: float = clock()
+
+        self._name_to_item_dict: Dict[str, 'SinglePlcCache.Item'] = {}
         self._name_to_future_item_dict: Dict[str, Future] = {}
+        # (expiry, name), may contain outdated entries for names which were
+        # set again, those are skipped during cleanup
+        self._expiry_heap: List[Tuple[float, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._name_to_item_dict)
+
+    @property
+    def last_access(self) -> float:
+        """Time of the cache clock of the last read or write.
+        """
+        return self._last_access
+
+    def set_periods(self,
+                    request_period: timedelta,
+                    valid_period: timedelta) -> None:
+        """Changes periods of values stored from now on.
+        """
+        self._request_period_s = request_period.total_seconds()
+        self._valid_period_s = valid_period.total_seconds()
+
+    @property
+    def has_pending_futures(self) -> bool:
+        return len(self._name_to_future_item_dict) > 0
 
     def get_value(self, name: str) -> CacheValue:
         item = self._name_to_item_dict[name]
-        return self._item_to_value(item)
+        if self._budget is not None:
+            self._budget.touch(self._nad, name)
+        self._last_access = now = self._clock()
+        return self._item_to_value(item, now)
+
+    def get_values(self, names: Iterable[str]) -> Dict[str, CacheValue]:
+        """Gets values of all cached names, missing names are skipped.
+        Condition of all values is evaluated at the same time.
+        """
+        self._last_access = now = self._clock()
+        fresh_after = now + self._request_period_s
+        items = self._name_to_item_dict
+        budget = self._budget
+        result = {}
+
+        for name in names:
+            item = items.get(name)
+            if item is None:
+                continue
+
+            if budget is not None:
+                budget.touch(self._nad, name)
+
+            expiry = item.expiry
+            if expiry > fresh_after:
+                condition = CacheValueCondition.FRESH
+            elif expiry > now:
+                condition = CacheValueCondition.STINKY
+            else:
+                condition = CacheValueCondition.STALE
+
+            result[name] = CacheValue(item.value, item.description, condition)
+
+        return result
 
     async def get_future_value(self, name: str) -> CacheValue:
         item = await self._name_to_future_item_dict[name]
-        return self._item_to_value(item)
+        return self._item_to_value(item, self._clock())
 
     def set_value(self, name: str, value: str, description: str) -> None:
-        expiry = datetime.now() + self._valid_period
-        item = self.Item(value, description, expiry)
-        self._name_to_item_dict[name] = item
-
-        try:
-            future = self._name_to_future_item_dict[name]
-            if not future.done():
-                future.set_result(item)
-            del self._name_to_future_item_dict[name]
-        except KeyError:
-            pass
+        self._last_access = now = self._clock()
+        item = self._set_item(name, value, description,
+                              now + self._valid_period_s)
+
+        future = self._name_to_future_item_dict.pop(name, None)
+        if future is not None and not future.done():
+            future.set_result(item)
+
+    def restore_value(self, name: str, value: str, description: str) -> None:
+        """Stores value from a previous run. It is answered until the
+        request period elapses and refreshed on the first read.
+        """
+        if name in self._name_to_item_dict:
+            return
+        self._set_item(name, value, description,
+                       self._clock() + self._request_period_s)
+
+    def get_snapshot(self) -> List[Tuple[str, str, str, float]]:
+        """Returns name, value, description and age [s] of valid items.
+        """
+        now = self._clock()
+        return [
+            (name, item.value, item.description,
+             self._valid_period_s - (item.expiry - now))
+            for name, item in self._name_to_item_dict.items()
+            if item.expiry > now
+        ]
 
     def start_future(self, name: str) -> None:
-        self.cancel_future(name)
+        # a read already in progress is shared, cancelling its future would
+        # fail requests waiting for it
+        future = self._name_to_future_item_dict.get(name)
+        if future is not None and not future.done():
+            return
         self._name_to_future_item_dict[name] = self._loop.create_future()
 
     def cancel_future(self, name: str) -> None:
-        try:
-            self._name_to_future_item_dict[name].cancel()
-            del self._name_to_future_item_dict[name]
-        except KeyError:
-            pass
-
-    def cleanup(self) -> None:
-        keys = list(self._name_to_item_dict.keys())
-        for name in keys:
-            value = self.get_value(name)
-            if value.condition == CacheValueCondition.STALE:
-                del self._name_to_item_dict[name]
-
-    def _item_to_value(self, item: Item) -> CacheValue:
-        condition = self._expiry_to_condition(item.expiry)
-        return CacheValue(item.value, item.description, condition)
-
-    def _expiry_to_condition(self, expiry: datetime) -> CacheValueCondition:
-        stinky_time = expiry - self._request_period
-
-        now = datetime.now()
-
-        if now < stinky_time:
+        future = self._name_to_future_item_dict.pop(name, None)
+        if future is not None:
+            future.cancel()
+
+    def cleanup(self, now: Optional[float] = None) -> None:
+        """Removes stale items. Only items which expired since the last
+        cleanup are visited.
+        """
+        if now is None:
+            now = self._clock()
+
+        heap = self._expiry_heap
+        items = self._name_to_item_dict
+
+        while len(heap) > 0 and heap[0][0] <= now:
+            expiry, name = heappop(heap)
+            item = items.get(name)
+            if item is not None and item.expiry == expiry:
+                del items[name]
+                if self._budget is not None:
+                    self._budget.remove(self._nad, name)
+
+    def invalidate(self, name: str) -> None:
+        """Removes item, next read goes to the controller.
+        """
+        if self._name_to_item_dict.pop(name, None) is not None:
+            if self._budget is not None:
+                self._budget.remove(self._nad, name)
+
+    def evict(self, name: str) -> None:
+        """Removes item, called by the budget.
+        """
+        self._name_to_item_dict.pop(name, None)
+
+    def clear(self) -> None:
+        """Removes all items and cancels pending reads.
+        """
+        if self._budget is not None:
+            for name in self._name_to_item_dict:
+                self._budget.remove(self._nad, name)
+
+        for future in self._name_to_future_item_dict.values():
+            future.cancel()
+
+        self._name_to_item_dict.clear()
+        self._name_to_future_item_dict.clear()
+        self._expiry_heap.clear()
+
+    def _set_item(self,
+                  name: str,
+                  value: str,
+                  description: str,
+                  expiry: float) -> 'SinglePlcCache.Item':
+        item = self.Item(value, description, expiry)
+        self._name_to_item_dict[name] = item
+        if self._budget is not None:
+            self._budget.add(
+                self._nad,
+                name,
+                self,
+                CacheBudget.estimate_size(name, value, description)
+            )
+        heappush(self._expiry_heap, (expiry, name))
+        if len(self._expiry_heap) > 2 * len(self._name_to_item_dict) + 64:
+            self._compact_expiry_heap()
+
+        return item
+
+    def _compact_expiry_heap(self) -> None:
+        """Drops outdated heap entries of repeatedly updated names.
+        """
+        self._expiry_heap = [
+            (item.expiry, name)
+            for name, item in self._name_to_item_dict.items()
+        ]
+        heapify(self._expiry_heap)
+
+    def _item_to_value(self, item: Item, now: float) -> CacheValue:
+        return CacheValue(item.value,
+                          item.description,
+                          self._expiry_to_condition(item.expiry, now))
+
+    def _expiry_to_condition(self,
+                             expiry: float,
+                             now: float) -> CacheValueCondition:
+        if now < expiry - self._request_period_s:
             return CacheValueCondition.FRESH
         elif now < expiry:
             return CacheValueCondition.STINKY
@@ -7,6 +7,7 @@ from typing import Callable, Generator, Tuple, Optional, List
 from typing_extensions import Union
 
 from lib.general.conditional_logger import ConditionalLogger
+from lib.general.tracing import span
 from lib.services.cpu_intensive_task_runner import \
     CPUIntensiveTaskRunner
 from scgi_server.local.general.errors import ExchangerTimeoutError
@@ -109,9 +110,10 @@ class PlcClient:
             )
 
             start = default_timer()
-            response: AbusMessage = await self._exchanger.exchange_threadsafe(
-                request
-            )
+            with span("exchange", self._plc_info.nad):
+                response: AbusMessage = (
+                    await self._exchanger.exchange_threadsafe(request)
+                )
 
             self._plc_activity_service.report_exchange_succeeded(
                 self._plc_info.nad,
@@ -303,6 +305,28 @@ class PlcClient:
 
         return previous_results
 
+    async def read_random_memory_with_read_plan(
+        self,
+        frames: List[Tuple[CommandFrame, Tuple[int, int, int], struct.Struct]]
+    ) -> List[Union[int, float]]:
+        """Sends prebuilt read random memory command frames and decodes
+        responses with corresponding decoders. Values are ordered the same way
+        as in `read_random_memory` (1B, 2B, 4B values of all frames).
+        """
+        one_b_values: List[int] = []
+        two_b_values: List[int] = []
+        four_b_values: List[Union[int, float]] = []
+
+        for command_frame, (one_b_count, two_b_count, _), decoder in frames:
+            response = await self._send_and_extract_command(command_frame)
+            values = decoder.unpack_from(response.body_bytes)
+            two_b_offset = one_b_count + two_b_count
+            one_b_values.extend(values[:one_b_count])
+            two_b_values.extend(values[one_b_count:two_b_offset])
+            four_b_values.extend(values[two_b_offset:])
+
+        return one_b_values + two_b_values + four_b_values
+
     async def _read_random_memory_single_request(
         self,
         one_b_addrs: List[int],
@@ -1,5 +1,5 @@
 from asyncio import CancelledError, AbstractEventLoop, Future
-from typing import Optional, Dict
+from typing import Optional, Dict, Callable
 
 from lib.general.conditional_logger import ConditionalLogger
 from lib.general.misc import create_task_callback
@@ -19,6 +19,8 @@ from scgi_server.local.services.rw_service.subservices.plc_activity_service \
     .plc_activity_service import PlcActivityService
 from scgi_server.local.services.rw_service.subservices.plc_comm_service \
     .plc_client_manager.plc_client.plc_client import PlcClient
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_communicator import PlcCommunicator
 
 
 class PlcClientManager:
@@ -41,6 +43,12 @@ class PlcClientManager:
         self._max_frame_length: int = MAX_FRAME_BYTES
         self._plc_detection_service: PlcDetectionService = detection_service
         self._plc_clients_by_nad: Dict[int, Future] = {}
+        # communicators of resolved clients, created on first use and
+        # dropped when plc info of the controller changes
+        self._plc_communicators_by_nad: Dict[int, PlcCommunicator] = {}
+        self._create_plc_communicator: Optional[
+            Callable[[PlcClient], PlcCommunicator]
+        ] = None
         self._cpu_intensive_task_runner: CPUIntensiveTaskRunner = (
             cpu_intensive_task_runner
         )
@@ -50,6 +58,12 @@ class PlcClientManager:
     def set_exchanger(self, exchanger: AbusExchanger) -> None:
         self._exchanger = exchanger
 
+    def set_communicator_factory(
+            self,
+            create_plc_communicator: Callable[[PlcClient], PlcCommunicator]
+    ) -> None:
+        self._create_plc_communicator = create_plc_communicator
+
     def on_plc_info_set(self, plc_info: PlcInfo) -> None:
         if plc_info.origin == PlcInfo.Origin.PROXY:
             return
@@ -89,7 +103,25 @@ class PlcClientManager:
         except CancelledError:
             return None
 
+    async def get_communicator(self, nad: int) -> Optional[PlcCommunicator]:
+        """Returns communicator of the controller, None when the controller
+        is unknown or its ip is not known.
+        """
+        plc_client = await self.get(nad)
+
+        if plc_client is None or not plc_client.plc_info.has_ip:
+            return None
+
+        communicator = self._plc_communicators_by_nad.get(nad)
+        if communicator is None or communicator.plc_client is not plc_client:
+            communicator = self._create_plc_communicator(plc_client)
+            self._plc_communicators_by_nad[nad] = communicator
+
+        return communicator
+
     def _set(self, nad: int, plc_client: Optional[PlcClient]) -> None:
+        self._plc_communicators_by_nad.pop(nad, None)
+
         try:
             future_plc_client = self._plc_clients_by_nad[nad]
             if not future_plc_client.done():
@@ -108,6 +140,8 @@ class PlcClientManager:
         self._log.info(log_msg)
 
     def _remove(self, nad: int) -> None:
+        self._plc_communicators_by_nad.pop(nad, None)
+
         try:
             future_plc_client = self._plc_clients_by_nad[nad]
             future_plc_client.cancel()
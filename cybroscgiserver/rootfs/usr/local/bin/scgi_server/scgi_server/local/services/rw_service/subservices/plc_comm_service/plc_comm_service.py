@@ -1,9 +1,9 @@
-import asyncio
 from itertools import chain
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Callable, Awaitable
 
 from lib.general.conditional_logger import ConditionalLogger
-from lib.general.misc import create_task_callback
+from lib.general.metrics import MetricsRegistry
+from lib.general.tracing import span
 from lib.input_output.scgi.r_response import RResponse
 from lib.services.cpu_intensive_task_runner import \
     CPUIntensiveTaskRunner
@@ -22,16 +22,24 @@ from scgi_server.local.services.rw_service.subservices.plc_comm_service \
     .alc_service.alc_service import AlcService
 from scgi_server.local.services.rw_service.subservices.plc_comm_service \
     .alc_service.var_info import VarInfo
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_cache.cache_poller import CachePoller
 from scgi_server.local.services.rw_service.subservices.plc_comm_service \
     .plc_cache.plc_cache import PlcCache
 from scgi_server.local.services.rw_service.subservices.plc_comm_service \
     .plc_cache.plc_cache_facade import PlcCacheFacade
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_cache.revalidation_coordinator import RevalidationCoordinator
 from scgi_server.local.services.rw_service.subservices \
     .plc_comm_service.plc_client_manager.plc_client.plc_client import PlcClient
 from scgi_server.local.services.rw_service.subservices.plc_comm_service \
     .plc_client_manager.plc_client_manager import PlcClientManager
 from scgi_server.local.services.rw_service.subservices.plc_comm_service \
     .plc_communicator import PlcCommunicator
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .read_plan_cache import ReadPlanCache
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .write_coalescer import WriteCoalescer
 
 
 class PlcCommService:
@@ -44,8 +52,13 @@ class PlcCommService:
             plc_client_manager: PlcClientManager,
             plc_cache: PlcCache,
             data_logger_cache: DataLoggerCache,
+            read_plan_cache: ReadPlanCache,
+            revalidation_coordinator: RevalidationCoordinator,
+            write_coalescer: Optional[WriteCoalescer],
             cpu_intensive_task_runner: CPUIntensiveTaskRunner,
-            only_user_variables: bool
+            only_user_variables: bool,
+            read_after_write: bool,
+            metrics: MetricsRegistry
     ):
         self._log: ConditionalLogger = log
         self._plc_info_service: PlcInfoService = plc_info_service
@@ -54,22 +67,46 @@ class PlcCommService:
         self._plc_client_manager: PlcClientManager = plc_client_manager
         self._cache: PlcCache = plc_cache
         self._data_logger_cache: DataLoggerCache = data_logger_cache
+        self._read_plan_cache: ReadPlanCache = read_plan_cache
+        self._revalidation_coordinator: RevalidationCoordinator = (
+            revalidation_coordinator
+        )
+        self._write_coalescer: Optional[WriteCoalescer] = write_coalescer
         self._cpu_intensive_task_runner: CPUIntensiveTaskRunner = (
             cpu_intensive_task_runner
         )
         self._only_user_variables: bool = only_user_variables
+        self._read_after_write: bool = read_after_write
+        self._cache_poller: Optional[CachePoller] = None
+
+        cache_reads = metrics.counter(
+            "plc_cache_reads_total",
+            "Variables requested from the plc cache by result",
+            ("result",)
+        )
+        self._cache_fresh = cache_reads.labels("fresh")
+        self._cache_stinky = cache_reads.labels("stinky")
+        self._cache_miss = cache_reads.labels("miss")
+
+        self._plc_client_manager.set_communicator_factory(
+            self._create_plc_communicator
+        )
 
     def set_exchanger(self, exchanger: AbusExchanger):
         self._plc_client_manager.set_exchanger(exchanger)
 
+    def set_cache_poller(self, cache_poller: CachePoller) -> None:
+        self._cache_poller = cache_poller
+
     async def process_rw_requests(self,
                                   nad: int,
                                   r_requests: List[RWRequest],
                                   w_requests: List[RWRequest],
                                   task_id: int) -> List[RResponse]:
-        responses = await self._process_rw_requests(
-            nad, r_requests, w_requests, task_id
-        )
+        with span("plc", nad):
+            responses = await self._process_rw_requests(
+                nad, r_requests, w_requests, task_id
+            )
         self._log.debug(
             lambda: f"RW Results c{nad} - {len(responses)} responses"
         )
@@ -80,9 +117,9 @@ class PlcCommService:
                                    r_requests: List[RWRequest],
                                    w_requests: List[RWRequest],
                                    task_id: Optional[int]) -> List[RResponse]:
-        plc_client = await self._plc_client_manager.get(nad)
+        plc_communicator = await self._plc_client_manager.get_communicator(nad)
 
-        if plc_client is None or not plc_client.plc_info.has_ip:
+        if plc_communicator is None:
             return [
                 RResponse.create(
                     request.name,
@@ -95,23 +132,7 @@ class PlcCommService:
                 for request in r_requests
             ]
 
-        if self._cache is None:
-            cache_facade = None
-        else:
-            cache_facade = PlcCacheFacade(self._log, self._cache[nad])
-
-        plc_communicator = PlcCommunicator(
-            self._log,
-            plc_client,
-            cache_facade,
-            self._plc_activity_service,
-            self._get_alc,
-            self._update_plc_client_datetime,
-            self._update_plc_client_ip,
-            self._cpu_intensive_task_runner,
-            self._data_logger_cache,
-            self._only_user_variables
-        )
+        cache_facade = plc_communicator.cache
 
         if task_id is not None:
             if len(w_requests) > 0:
@@ -124,14 +145,39 @@ class PlcCommService:
             )
 
         if len(w_requests) > 0:
-            return await plc_communicator.process_rw_requests(r_requests,
-                                                              w_requests)
+            read_from_plc = self._read_after_write or cache_facade is None
+
+            if self._write_coalescer is None:
+                if read_from_plc:
+                    return await plc_communicator.process_rw_requests(
+                        r_requests, w_requests
+                    )
+                written = await plc_communicator.process_w_requests(
+                    w_requests
+                )
+            else:
+                written = await self._write_coalescer.write(
+                    nad,
+                    w_requests,
+                    plc_communicator.process_w_requests
+                )
+
+            if len(r_requests) == 0:
+                return []
+
+            # the cache would answer values of failed writes as valid,
+            # the controller answers actual values or errors
+            if read_from_plc or not written:
+                return await plc_communicator.process_rw_requests(r_requests,
+                                                                  [])
+            # written values are already in the cache (write-through)
 
         if cache_facade is None:
             return await plc_communicator.process_rw_requests(r_requests,
                                                               [])
         else:
-            cache_result = await cache_facade.read(r_requests)
+            with span("cache", nad):
+                cache_result = await cache_facade.read(r_requests)
 
             responses = list(chain(
                 cache_result.fresh.values(),
@@ -140,13 +186,25 @@ class PlcCommService:
             postponable_requests = list(cache_result.stinky.keys())
             urgent_requests = list(cache_result.not_available)
 
+            self._cache_fresh.inc(len(cache_result.fresh))
+            self._cache_stinky.inc(len(postponable_requests))
+            self._cache_miss.inc(len(urgent_requests))
+
+            if self._cache_poller is not None:
+                self._cache_poller.touch(nad, r_requests)
+                # polled variables are refreshed by the poller
+                postponable_requests = [
+                    request for request in postponable_requests
+                    if not self._cache_poller.is_polled(nad, request.tag_name)
+                ]
+
         if len(postponable_requests) > 0:
             self._log.debug("Fetch postponable")
-            (asyncio.get_running_loop()
-             .create_task(plc_communicator.process_rw_requests(
-                postponable_requests, []
-             ))
-             .add_done_callback(create_task_callback(self._log)))
+            self._revalidation_coordinator.schedule(
+                nad,
+                postponable_requests,
+                self._create_refresh(plc_communicator)
+            )
 
         if len(urgent_requests) > 0:
             responses += await plc_communicator.process_rw_requests(
@@ -155,6 +213,53 @@ class PlcCommService:
 
         return responses
 
+    async def refresh(self, nad: int, r_requests: List[RWRequest]) -> None:
+        """Reads variables from the controller and stores them to the
+        cache, used by the background poller.
+        """
+        plc_communicator = await self._plc_client_manager.get_communicator(nad)
+
+        if plc_communicator is None:
+            return
+
+        await self._revalidation_coordinator.run(
+            nad,
+            r_requests,
+            self._create_refresh(plc_communicator)
+        )
+
+    @staticmethod
+    def _create_refresh(
+            plc_communicator: PlcCommunicator
+    ) -> Callable[[List[RWRequest]], Awaitable[List[RResponse]]]:
+        async def refresh(r_requests: List[RWRequest]) -> List[RResponse]:
+            return await plc_communicator.process_rw_requests(r_requests, [])
+
+        return refresh
+
+    def _create_plc_communicator(self,
+                                 plc_client: PlcClient) -> PlcCommunicator:
+        if self._cache is None:
+            cache_facade = None
+        else:
+            cache_facade = PlcCacheFacade(self._log,
+                                          self._cache,
+                                          plc_client.plc_info.nad)
+
+        return PlcCommunicator(
+            self._log,
+            plc_client,
+            cache_facade,
+            self._plc_activity_service,
+            self._get_alc,
+            self._update_plc_client_datetime,
+            self._update_plc_client_ip,
+            self._cpu_intensive_task_runner,
+            self._data_logger_cache,
+            self._read_plan_cache,
+            self._only_user_variables
+        )
+
     async def _get_alc(self,
                        plc_client: PlcClient,
                        crc: int) -> Optional[Dict[str, VarInfo]]:
@@ -163,6 +268,13 @@ class PlcCommService:
         except KeyError:
             pass
 
+        # alc files are loaded in the background during startup
+        await self._alc_service.wait_for_alc_files()
+        try:
+            return self._alc_service[crc]
+        except KeyError:
+            pass
+
         try:
             self._log.info(lambda: f"New crc for c{plc_client.plc_info.nad}: "
                                    f"{crc}. Reload alc...")
@@ -189,27 +301,9 @@ class PlcCommService:
         return await self._plc_client_manager.get(nad)
 
     async def get_crc(self, nad: int) -> Optional[int]:
-        plc_client = await self._plc_client_manager.get(nad)
+        plc_communicator = await self._plc_client_manager.get_communicator(nad)
 
-        if plc_client is None or not plc_client.plc_info.has_ip:
+        if plc_communicator is None:
             return None
 
-        if self._cache is None:
-            cache_facade = None
-        else:
-            cache_facade = PlcCacheFacade(self._log, self._cache[nad])
-
-        plc_communicator = PlcCommunicator(
-            self._log,
-            plc_client,
-            cache_facade,
-            self._plc_activity_service,
-            self._get_alc,
-            self._update_plc_client_datetime,
-            self._update_plc_client_ip,
-            self._cpu_intensive_task_runner,
-            self._data_logger_cache,
-            self._only_user_variables
-        )
-
         return await plc_communicator.plc_head_check()
@@ -1,6 +1,6 @@
 import functools
 from itertools import chain
-from typing import List, Tuple, Optional, Union
+from typing import List, Tuple, Optional, Union, Callable
 
 from lib.general.conditional_logger import ConditionalLogger
 from lib.input_output.scgi.r_response import RResponse
@@ -19,6 +19,8 @@ from scgi_server.local.services.rw_service.subservices.plc_comm_service \
     .plc_rw_request import PlcRWRequest
 from scgi_server.local.services.rw_service.subservices.plc_comm_service \
     .plc_rw_requests import PlcRWRequests
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .read_plan_cache import ReadPlan
 
 
 class PlcCommServiceReadProcessor(PlcCommServiceRequestProcessor):
@@ -27,21 +29,31 @@ class PlcCommServiceReadProcessor(PlcCommServiceRequestProcessor):
                  client: PlcClient,
                  cpu_intensive_task_runner: CPUIntensiveTaskRunner,
                  only_user_variables: bool,
-                 on_cache_item_created=None):
+                 on_cache_item_created=None,
+                 on_read_plan_created: Optional[
+                     Callable[[ReadPlan], None]
+                 ] = None):
         super().__init__(
             log, client, cpu_intensive_task_runner, only_user_variables
         )
         self._on_cache_item_created = on_cache_item_created
+        self._on_read_plan_created = on_read_plan_created
 
     async def _process_plc_rw_requests(self, requests: PlcRWRequests):
         self._log.debug(lambda: f"Read c{self._nad} begin - {requests}")
 
-        valid = await self._process_valid(requests.one_byte,
-                                          requests.two_byte,
-                                          requests.four_byte)
-        invalid = self._process_invalid(requests.invalid)
+        valid, cache_item = await self._process_valid(requests.one_byte,
+                                                      requests.two_byte,
+                                                      requests.four_byte)
+        invalid_requests = requests.invalid
+        invalid = self._process_invalid(invalid_requests)
         responses = valid + invalid
 
+        if cache_item is not None and self._on_read_plan_created is not None:
+            self._on_read_plan_created(
+                ReadPlan.create(cache_item[0], invalid_requests, cache_item[1])
+            )
+
         self._log.debug(
             lambda: f"Read c{self._nad} succeeded - {len(responses)}"
         )
@@ -67,10 +79,35 @@ class PlcCommServiceReadProcessor(PlcCommServiceRequestProcessor):
 
             return self._create_r_responses_with_timeout(requests)
 
-    async def _process_valid(self,
-                             one_byte: List[PlcRWRequest],
-                             two_byte: List[PlcRWRequest],
-                             four_byte: List[PlcRWRequest]) -> List[RResponse]:
+    async def process_read_plan(self, plan: ReadPlan) -> List[RResponse]:
+        self._log.debug(lambda: f"Read c{self._nad} begin - "
+                                f"{len(plan.requests)} planned")
+
+        try:
+            values = await self._client.read_random_memory_with_read_plan(
+                plan.frames
+            )
+            valid = self._create_r_responses_with_success(plan.requests,
+                                                          values)
+        except ExchangerTimeoutError as e:
+            self._log.debug(lambda: f"Read c{self._nad} failed with timeout",
+                            exc_info=e)
+            self._log.error(lambda: f"Read c{self._nad} failed with timeout: "
+                                    f"{e}")
+
+            valid = self._create_r_responses_with_timeout(plan.requests)
+
+        return valid + self._process_invalid(plan.invalid_requests)
+
+    async def _process_valid(
+        self,
+        one_byte: List[PlcRWRequest],
+        two_byte: List[PlcRWRequest],
+        four_byte: List[PlcRWRequest]
+    ) -> Tuple[List[RResponse], Optional[Tuple[List[PlcRWRequest], List]]]:
+        """Reads valid requests, returns responses and the list of sent
+        command frames when the read succeeded.
+        """
         (
             one_b_addrs,
             two_b_addrs,
@@ -100,19 +137,22 @@ class PlcCommServiceReadProcessor(PlcCommServiceRequestProcessor):
                 on_command_frame_and_type_info_created
             )
 
+            cache_item = (requests, command_frame_and_type_info_list)
             if self._on_cache_item_created is not None:
-                self._on_cache_item_created((requests,
-                                             command_frame_and_type_info_list))
+                self._on_cache_item_created(cache_item)
 
-            return self._create_r_responses_with_success(requests,
-                                                         chain(*values))
+            return (
+                self._create_r_responses_with_success(requests,
+                                                      chain(*values)),
+                cache_item
+            )
         except ExchangerTimeoutError as e:
             self._log.debug(lambda: f"Read c{self._nad} failed with timeout",
                             exc_info=e)
             self._log.error(lambda: f"Read c{self._nad} failed with timeout: "
                                     f"{e}")
 
-            return self._create_r_responses_with_timeout(requests)
+            return self._create_r_responses_with_timeout(requests), None
 
     async def _prepare_addresses_and_types(self,
                                            one_byte,
@@ -5,12 +5,17 @@ from scgi_server.local.services.rw_service.subservices.plc_comm_service.data_typ
     DataType
 from scgi_server.local.services.rw_service.subservices.plc_comm_service.plc_comm_service_request_processor import \
     PlcCommServiceRequestProcessor
+from scgi_server.local.services.rw_service.subservices.plc_comm_service.plc_rw_request \
+    import PlcRWRequest
 from scgi_server.local.services.rw_service.subservices.plc_comm_service.plc_rw_requests \
     import PlcRWRequests
 
 
 class PlcCommServiceWriteProcessor(PlcCommServiceRequestProcessor):
-    async def _process_plc_rw_requests(self, requests: PlcRWRequests) -> None:
+    async def _process_plc_rw_requests(self, requests: PlcRWRequests
+                                       ) -> List[PlcRWRequest]:
+        """Writes valid requests, returns requests which were written.
+        """
         self._log.debug(lambda: f"Write c{self._nad} begin - {requests}")
 
         one_b_addrs: List[int] = []
@@ -41,8 +46,10 @@ class PlcCommServiceWriteProcessor(PlcCommServiceRequestProcessor):
                 four_b_types
             )
             self._log.debug(lambda: f"Write c{self._nad} succeeded")
+            return requests.one_byte + requests.two_byte + requests.four_byte
         except ExchangerTimeoutError as e:
             self._log.debug(lambda: f"Write c{self._nad} failed with timeout",
                             exc_info=e)
             self._log.error(lambda: f"Write c{self._nad} failed with timeout: "
                                     f"{e}")
+            return []
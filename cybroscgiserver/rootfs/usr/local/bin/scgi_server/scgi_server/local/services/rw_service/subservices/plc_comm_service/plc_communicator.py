@@ -1,7 +1,8 @@
 from dataclasses import dataclass
-from typing import Coroutine, Callable, Optional, Dict, List
+from typing import Coroutine, Callable, Optional, Dict, List, Tuple
 
 from lib.general.conditional_logger import ConditionalLogger
+from lib.general.tracing import span
 from lib.input_output.scgi.r_response import RResponse
 from lib.services.cpu_intensive_task_runner import \
     CPUIntensiveTaskRunner
@@ -26,10 +27,16 @@ from scgi_server.local.services.rw_service.subservices.plc_comm_service \
     .plc_comm_service_read_processor import PlcCommServiceReadProcessor
 from scgi_server.local.services.rw_service.subservices.plc_comm_service \
     .plc_comm_service_write_processor import PlcCommServiceWriteProcessor
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .read_plan_cache import ReadPlanCache, ReadPlan
 
 
 @dataclass
 class PlcCommunicator:
+    """Communicates with a single controller. Instances are long-lived, see
+    `PlcClientManager.get_communicator`, and are shared by concurrent
+    requests.
+    """
     CYBRO_2_MAGIC = 31415
     CYBRO_3_MAGIC = 31416
 
@@ -51,6 +58,7 @@ class PlcCommunicator:
         handle_plc_ip_update,
         cpu_intensive_task_runner: CPUIntensiveTaskRunner,
         data_logger_cache: DataLoggerCache,
+        read_plan_cache: ReadPlanCache,
         only_user_variables: bool
     ) -> None:
         self._log: ConditionalLogger = log
@@ -68,7 +76,22 @@ class PlcCommunicator:
             cpu_intensive_task_runner
         )
         self._data_logger_cache: DataLoggerCache = data_logger_cache
+        self._read_plan_cache: ReadPlanCache = read_plan_cache
         self._only_user_variables: bool = only_user_variables
+        self._read_processor: PlcCommServiceReadProcessor = (
+            self._create_read_processor()
+        )
+        self._write_processor: PlcCommServiceWriteProcessor = (
+            self._create_write_processor()
+        )
+
+    @property
+    def plc_client(self) -> PlcClient:
+        return self._plc_client
+
+    @property
+    def cache(self) -> Optional[PlcCacheFacade]:
+        return self._cache
 
     async def process_rw_requests(self,
                                   r_requests: List[RWRequest],
@@ -76,17 +99,28 @@ class PlcCommunicator:
         if self._cache is not None:
             self._cache.start_futures(r_requests)
 
-        responses = await self._process_rw_requests(r_requests, w_requests)
+        responses, _ = await self._process_rw_requests(r_requests,
+                                                       w_requests)
 
         if self._cache is not None:
             self._cache.write(responses)
 
         return responses
 
+    async def process_w_requests(self, w_requests: List[RWRequest]) -> bool:
+        """Writes variables without reading them, returns False when any
+        of them was not written, e.g. on timeout or unknown variable.
+        """
+        _, written = await self._process_rw_requests([], w_requests)
+        return written
+
     async def _process_rw_requests(self,
                                    r_requests: List[RWRequest],
                                    w_requests: List[RWRequest]
-                                   ) -> List[RResponse]:
+                                   ) -> Tuple[List[RResponse], bool]:
+        """Returns responses of read requests and whether all write
+        requests were written.
+        """
         tries_taken = 0
         max_tries = \
             2 if self._plc_client.plc_info.origin != PlcInfo.Origin.STATIC \
@@ -95,18 +129,21 @@ class PlcCommunicator:
         while tries_taken < max_tries:
             try:
                 if tries_taken > 0:
-                    self._plc_client = await self._update_plc_client_ip(
+                    plc_client = await self._update_plc_client_ip(
                         self._plc_client
                     )
-                if self._plc_client is not None:
-                    return await self._read_write(r_requests, w_requests)
-                else:
-                    break
+                    if plc_client is None:
+                        break
+                    self._set_plc_client(plc_client)
+                return await self._read_write(r_requests, w_requests)
             except ExchangerTimeoutError:
                 tries_taken += 1
 
-        return self._create_r_responses_with_code(r_requests,
-                                                  RResponse.Code.TIMEOUT)
+        return (
+            self._create_r_responses_with_code(r_requests,
+                                               RResponse.Code.TIMEOUT),
+            len(w_requests) == 0
+        )
 
     async def process_r_requests_for_data_logger(self,
                                                  r_requests: List[RWRequest],
@@ -120,14 +157,13 @@ class PlcCommunicator:
         while tries_taken < max_tries:
             try:
                 if tries_taken > 0:
-                    self._plc_client = await self._update_plc_client_ip(
+                    plc_client = await self._update_plc_client_ip(
                         self._plc_client
                     )
-                if self._plc_client is not None:
-                    return await self._read_for_data_logger(r_requests,
-                                                            task_id)
-                else:
-                    break
+                    if plc_client is None:
+                        break
+                    self._set_plc_client(plc_client)
+                return await self._read_for_data_logger(r_requests, task_id)
             except ExchangerTimeoutError:
                 tries_taken += 1
 
@@ -155,12 +191,12 @@ class PlcCommunicator:
                 crc
             )
 
-            return await PlcCommServiceReadProcessor(
-                self._log,
-                self._plc_client,
-                self._cpu_intensive_task_runner,
-                self._only_user_variables
-            ).process_cache_item(cached_item)
+            self._plc_activity_service.report_read_frames(
+                len(cached_item[1])
+            )
+            return await self._read_processor.process_cache_item(
+                cached_item
+            )
 
         self._log.debug(f"cache not found for (task: {task_id} crc: {crc})")
         self._data_logger_cache.set_future(task_id, crc)
@@ -185,12 +221,11 @@ class PlcCommunicator:
             def on_cache_item_created(new_cache_item):
                 nonlocal cache_item
                 cache_item = new_cache_item
+                self._plc_activity_service.report_read_frames(
+                    len(new_cache_item[1])
+                )
 
-            result = await PlcCommServiceReadProcessor(
-                self._log,
-                self._plc_client,
-                self._cpu_intensive_task_runner,
-                self._only_user_variables,
+            result = await self._create_read_processor(
                 on_cache_item_created=on_cache_item_created
             ).process(r_requests, alc)
 
@@ -211,17 +246,24 @@ class PlcCommunicator:
 
     async def _read_write(self,
                           r_requests: List[RWRequest],
-                          w_requests: List[RWRequest]) -> List[RResponse]:
+                          w_requests: List[RWRequest]
+                          ) -> Tuple[List[RResponse], bool]:
+        nad = self._plc_client.plc_info.nad
+        # nothing is written when the program is not known
+        all_written = len(w_requests) == 0
+
         try:
-            crc = await self.plc_head_check()
+            with span("plc_head_check", nad):
+                crc = await self.plc_head_check()
         except self.PlcHeadError:
             return self._create_r_responses_with_code(
                 r_requests,
                 RResponse.Code.PLC_HEAD_ERROR
-            )
+            ), all_written
 
         try:
-            alc = await self._get_alc(self._plc_client, crc)
+            with span("alc", nad):
+                alc = await self._get_alc(self._plc_client, crc)
         except RuntimeError:
             self._plc_activity_service.report_alc_crc_used(
                 self._plc_client.plc_info.nad,
@@ -230,7 +272,7 @@ class PlcCommunicator:
             return self._create_r_responses_with_code(
                 r_requests,
                 RResponse.Code.NO_ALC_ERROR
-            )
+            ), all_written
 
         self._plc_activity_service.report_alc_crc_used(
             self._plc_client.plc_info.nad,
@@ -241,21 +283,43 @@ class PlcCommunicator:
             return self._create_r_responses_with_code(
                 r_requests,
                 RResponse.Code.DEVICE_NOT_FOUND
-            )
+            ), all_written
 
         if len(w_requests) > 0:
-            await PlcCommServiceWriteProcessor(
-                self._log,
-                self._plc_client,
-                self._cpu_intensive_task_runner,
-                self._only_user_variables
-            ).process(w_requests, alc)
-
-        return await PlcCommServiceReadProcessor(
-            self._log,
-            self._plc_client,
-            self._cpu_intensive_task_runner,
-            self._only_user_variables
+            with span("write", nad):
+                written = await self._write_processor.process(w_requests,
+                                                              alc)
+            all_written = len(written) == len(w_requests)
+
+            if self._cache is not None:
+                self._cache.write_through(written)
+
+        if len(r_requests) == 0:
+            return [], all_written
+
+        with span("read", nad):
+            return await self._read(r_requests, alc, crc), all_written
+
+    async def _read(self,
+                    r_requests: List[RWRequest],
+                    alc: Dict[str, VarInfo],
+                    crc: int) -> List[RResponse]:
+        nad = self._plc_client.plc_info.nad
+        fingerprint = ReadPlanCache.fingerprint(r_requests)
+
+        plan = self._read_plan_cache.get(nad, crc, fingerprint)
+        if plan is not None:
+            self._plc_activity_service.report_read_frames(len(plan.frames))
+            return await self._read_processor.process_read_plan(plan)
+
+        def on_read_plan_created(new_plan: ReadPlan) -> None:
+            self._plc_activity_service.report_read_frames(
+                len(new_plan.frames)
+            )
+            self._read_plan_cache.set(nad, crc, fingerprint, new_plan)
+
+        return await self._create_read_processor(
+            on_read_plan_created=on_read_plan_created
         ).process(r_requests, alc)
 
     async def plc_head_check(self) -> int:
@@ -268,14 +332,18 @@ class PlcCommunicator:
         new_program_datetime = plc_head.program_timestamp
 
         if last_program_datetime is None:
-            self._plc_client = await self._update_plc_client_program_datetime(
-                self._plc_client,
-                new_program_datetime
+            self._set_plc_client(
+                await self._update_plc_client_program_datetime(
+                    self._plc_client,
+                    new_program_datetime
+                )
             )
         elif last_program_datetime != new_program_datetime:
-            self._plc_client = await self._update_plc_client_program_datetime(
-                self._plc_client,
-                new_program_datetime
+            self._set_plc_client(
+                await self._update_plc_client_program_datetime(
+                    self._plc_client,
+                    new_program_datetime
+                )
             )
 
             plc_head = await self._plc_client.read_plc_head()
@@ -288,6 +356,34 @@ class PlcCommunicator:
 
         return plc_head.code_crc
 
+    def _set_plc_client(self, plc_client: PlcClient) -> None:
+        # the manager creates a new communicator for the new client, this one
+        # is used only by requests already in progress
+        self._plc_client = plc_client
+        self._read_processor = self._create_read_processor()
+        self._write_processor = self._create_write_processor()
+
+    def _create_read_processor(self,
+                               on_cache_item_created=None,
+                               on_read_plan_created=None
+                               ) -> PlcCommServiceReadProcessor:
+        return PlcCommServiceReadProcessor(
+            self._log,
+            self._plc_client,
+            self._cpu_intensive_task_runner,
+            self._only_user_variables,
+            on_cache_item_created=on_cache_item_created,
+            on_read_plan_created=on_read_plan_created
+        )
+
+    def _create_write_processor(self) -> PlcCommServiceWriteProcessor:
+        return PlcCommServiceWriteProcessor(
+            self._log,
+            self._plc_client,
+            self._cpu_intensive_task_runner,
+            self._only_user_variables
+        )
+
     @classmethod
     def _is_status_ok(cls, status):
         return status.plc_status in (PlcStatus.RUN, PlcStatus.PAUSE) and \
@@ -1,20 +1,17 @@
-from dataclasses import dataclass
-from typing import Optional, Union
+from typing import Optional, Union, NamedTuple
 
 from scgi_server.local.services.rw_service.subservices.plc_comm_service.data_type import \
     DataType
 
 
-@dataclass(frozen=True)
-class AlcData:
+class AlcData(NamedTuple):
     addr: int
     size: int
     data_type: DataType
     description: str
 
 
-@dataclass(frozen=True)
-class PlcRWRequest:
+class PlcRWRequest(NamedTuple):
     @classmethod
     def create(cls,
                name: str,
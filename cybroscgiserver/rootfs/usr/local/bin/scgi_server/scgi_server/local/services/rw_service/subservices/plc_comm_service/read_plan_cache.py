@@ -0,0 +1,146 @@
+import struct
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Tuple, Optional, Dict, Iterable
+
+from scgi_server.local.input_output.abus_stack.abus.command_frame import \
+    CommandFrame
+from scgi_server.local.services.rw_service.scgi_communication.rw_request \
+    import RWRequest
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .data_type import DataType
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_rw_request import PlcRWRequest
+
+# (command frame, (1B, 2B, 4B items count), decoder of the response body)
+ReadPlanFrame = Tuple[CommandFrame, Tuple[int, int, int], struct.Struct]
+
+
+@dataclass(frozen=True)
+class ReadPlan:
+    """Resolved read of a set of tags: plc requests in the order of
+    returned values, prebuilt command frames and decoders for each frame.
+    """
+    requests: List[PlcRWRequest]
+    invalid_requests: List[PlcRWRequest]
+    frames: List[ReadPlanFrame]
+
+    @classmethod
+    def create(
+        cls,
+        requests: List[PlcRWRequest],
+        invalid_requests: List[PlcRWRequest],
+        command_frame_and_type_info_list: Iterable[
+            Tuple[CommandFrame, Tuple[int, int, int, List[DataType]]]
+        ]
+    ) -> 'ReadPlan':
+        return cls(
+            requests,
+            invalid_requests,
+            [
+                (
+                    command_frame,
+                    (one_b_count, two_b_count, four_b_count),
+                    cls._create_decoder(one_b_count, two_b_count, four_b_types)
+                )
+                for (
+                    command_frame,
+                    (one_b_count, two_b_count, four_b_count, four_b_types)
+                ) in command_frame_and_type_info_list
+            ]
+        )
+
+    @staticmethod
+    def _create_decoder(one_b_count: int,
+                        two_b_count: int,
+                        four_b_types: List[DataType]) -> struct.Struct:
+        four_b_format = "".join(
+            "f" if data_type == DataType.REAL else "l"
+            for data_type in four_b_types
+        )
+        return struct.Struct(f"<{one_b_count}B{two_b_count}h{four_b_format}")
+
+
+class ReadPlanCache:
+    """LRU cache of read plans by controller, program crc and requested
+    tags. Plans of a controller are dropped as soon as its crc changes.
+    """
+    def __init__(self, max_size: int):
+        self._max_size: int = max_size
+        self._plans: OrderedDict[
+            Tuple[int, int, Tuple[str, ...]], ReadPlan
+        ] = OrderedDict()
+        self._crc_by_nad: Dict[int, int] = {}
+        self._hits: int = 0
+        self._misses: int = 0
+        self._evictions: int = 0
+
+    @property
+    def size(self) -> int:
+        return len(self._plans)
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    @property
+    def evictions(self) -> int:
+        return self._evictions
+
+    @property
+    def hit_rate(self) -> float:
+        total = self._hits + self._misses
+        return 0.0 if total == 0 else self._hits / total
+
+    @staticmethod
+    def fingerprint(requests: Iterable[RWRequest]) -> Tuple[str, ...]:
+        """Requested tags in order, including repeated ones, since the plan
+        yields one response per request in the same order.
+        """
+        return tuple(request.tag_name for request in requests)
+
+    def get(self,
+            nad: int,
+            crc: int,
+            fingerprint: Tuple[str, ...]) -> Optional[ReadPlan]:
+        self._check_crc(nad, crc)
+
+        key = (nad, crc, fingerprint)
+        try:
+            plan = self._plans[key]
+        except KeyError:
+            self._misses += 1
+            return None
+
+        self._plans.move_to_end(key)
+        self._hits += 1
+        return plan
+
+    def set(self,
+            nad: int,
+            crc: int,
+            fingerprint: Tuple[str, ...],
+            plan: ReadPlan) -> None:
+        self._check_crc(nad, crc)
+
+        key = (nad, crc, fingerprint)
+        self._plans[key] = plan
+        self._plans.move_to_end(key)
+
+        while len(self._plans) > self._max_size:
+            self._plans.popitem(last=False)
+            self._evictions += 1
+
+    def _check_crc(self, nad: int, crc: int) -> None:
+        last_crc = self._crc_by_nad.get(nad)
+        if last_crc == crc:
+            return
+
+        self._crc_by_nad[nad] = crc
+        if last_crc is not None:
+            for key in [key for key in self._plans if key[0] == nad]:
+                del self._plans[key]
@@ -0,0 +1,79 @@
+import asyncio
+from datetime import timedelta
+from typing import Dict, List, Callable, Awaitable
+
+from lib.general.conditional_logger import ConditionalLogger
+from scgi_server.local.services.rw_service.scgi_communication.rw_request \
+    import RWRequest
+
+
+class _PendingWrite:
+    def __init__(self,
+                 loop: asyncio.AbstractEventLoop,
+                 write: Callable[[List[RWRequest]], Awaitable[bool]]):
+        # tag name -> last requested write
+        self.requests: Dict[str, RWRequest] = {}
+        self.write: Callable[[List[RWRequest]], Awaitable[bool]] = write
+        self.done: asyncio.Future = loop.create_future()
+
+
+class WriteCoalescer:
+    """Collects writes to the same controller for a short time and sends
+    them as a single write. When a variable is written several times within
+    the window, only the last value is written.
+    """
+    def __init__(self, log: ConditionalLogger, window: timedelta):
+        self._log: ConditionalLogger = log
+        self._window_s: float = window.total_seconds()
+        self._pending: Dict[int, _PendingWrite] = {}
+        self._coalesced_count: int = 0
+
+    @property
+    def coalesced_count(self) -> int:
+        """Number of writes replaced by a later write of the same variable.
+        """
+        return self._coalesced_count
+
+    async def write(self,
+                    nad: int,
+                    requests: List[RWRequest],
+                    write: Callable[[List[RWRequest]], Awaitable[bool]]
+                    ) -> bool:
+        """Adds writes to the pending write of the controller and waits
+        until it is sent. Returns result of `write`, i.e. whether all
+        variables of the coalesced write were written.
+        """
+        pending = self._pending.get(nad)
+        if pending is None:
+            loop = asyncio.get_running_loop()
+            pending = _PendingWrite(loop, write)
+            self._pending[nad] = pending
+            loop.call_later(self._window_s, self._flush, nad)
+
+        for request in requests:
+            if request.tag_name in pending.requests:
+                self._coalesced_count += 1
+            pending.requests[request.tag_name] = request
+
+        return await asyncio.shield(pending.done)
+
+    def _flush(self, nad: int) -> None:
+        pending = self._pending.pop(nad)
+        self._log.debug(lambda: f"c{nad} writing {len(pending.requests)} "
+                                f"coalesced variables")
+
+        task = asyncio.get_running_loop().create_task(
+            pending.write(list(pending.requests.values()))
+        )
+        task.add_done_callback(
+            lambda t: self._on_written(pending.done, t)
+        )
+
+    @staticmethod
+    def _on_written(done: asyncio.Future, task: asyncio.Task) -> None:
+        if task.cancelled():
+            done.cancel()
+        elif task.exception() is not None:
+            done.set_exception(task.exception())
+        else:
+            done.set_result(task.result())
@@ -0,0 +1,266 @@
+import asyncio
+import dataclasses
+import json
+import os
+import signal
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+from lib.general.conditional_logger import ConditionalLogger
+from lib.general.misc import create_task_callback
+from scgi_server.local.services.plc_info_service.plc_info import PlcInfo
+from scgi_server.local.services.plc_info_service.plc_info_service import \
+    PlcInfoService
+from scgi_server.local.services.rw_service.subservices.plc_activity_service \
+    .plc_activity_service import PlcActivityService
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_cache.plc_cache import PlcCache
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_client_manager.plc_client.plc_head import PlcHead
+
+SNAPSHOT_VERSION = 1
+
+
+class SnapshotService:
+    """Saves known controllers and cached values to a file and restores them
+    at startup, so the server doesn't have to detect controllers and read
+    all variables again after a restart.
+
+    Restored values are answered only until the cache request period
+    elapses, the first read after that refreshes them from the controller.
+    """
+    def __init__(self,
+                 log: ConditionalLogger,
+                 loop: asyncio.AbstractEventLoop,
+                 path: Path,
+                 period: timedelta,
+                 max_age: timedelta,
+                 plc_info_service: PlcInfoService,
+                 plc_activity_service: PlcActivityService,
+                 plc_cache: Optional[PlcCache]):
+        self._log: ConditionalLogger = log
+        self._loop: asyncio.AbstractEventLoop = loop
+        self._path: Path = path
+        self._period_s: float = period.total_seconds()
+        self._max_age_s: float = max_age.total_seconds()
+        self._plc_info_service: PlcInfoService = plc_info_service
+        self._plc_activity_service: PlcActivityService = plc_activity_service
+        self._plc_cache: Optional[PlcCache] = plc_cache
+        self._task: Optional[asyncio.Task] = None
+
+    async def restore(self) -> None:
+        """Loads the snapshot, must be called after static controllers are
+        loaded.
+        """
+        try:
+            snapshot = await self._loop.run_in_executor(None, self._read)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            self._log.error(f"Can't read snapshot {self._path}: {e}")
+            return
+
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            self._log.info(f"Ignoring snapshot of version "
+                           f"{snapshot.get('version')}")
+            return
+
+        now = time.time()
+        if now - snapshot["saved"] > self._max_age_s:
+            self._log.info("Snapshot is too old, ignoring it")
+            return
+
+        try:
+            plc_count = self._restore_plcs(snapshot["plcs"])
+            value_count = self._restore_values(snapshot["values"], now)
+        except (KeyError, TypeError, ValueError) as e:
+            self._log.error(f"Invalid snapshot {self._path}: {e}")
+            return
+
+        self._log.info(f"Restored {plc_count} controllers and {value_count} "
+                       f"values from snapshot")
+
+    def start(self) -> None:
+        """Starts periodic saving and saving on SIGTERM.
+        """
+        self._task = self._loop.create_task(self._run())
+        self._task.add_done_callback(create_task_callback(self._log))
+
+        try:
+            self._loop.add_signal_handler(signal.SIGTERM, self._on_terminate)
+        except (NotImplementedError, RuntimeError):
+            # not supported on windows
+            pass
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def save(self) -> None:
+        snapshot = self._create()
+        await self._loop.run_in_executor(None, self._write, snapshot)
+        self._log.debug(lambda: f"Snapshot saved to {self._path}")
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._period_s)
+            try:
+                await self.save()
+            except OSError as e:
+                self._log.error(f"Can't save snapshot: {e}")
+
+    def _on_terminate(self) -> None:
+        try:
+            self._write(self._create())
+        except OSError as e:
+            self._log.error(f"Can't save snapshot: {e}")
+
+        # terminate the same way as without the handler
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        os.kill(os.getpid(), signal.SIGTERM)
+
+    def _create(self) -> Dict[str, Any]:
+        now = time.time()
+
+        plcs = []
+        for plc_info in self._plc_info_service.get_plc_infos():
+            if plc_info.origin == PlcInfo.Origin.PROXY:
+                continue
+
+            activity = self._plc_activity_service[plc_info.nad]
+            plcs.append({
+                "nad": plc_info.nad,
+                "origin": plc_info.origin.value,
+                "ip": plc_info.ip,
+                "port": plc_info.port,
+                "program_datetime": self._datetime_to_str(
+                    plc_info.program_datetime
+                ),
+                "last_update_time": self._datetime_to_str(
+                    plc_info.last_update_time
+                ),
+                "alc_crc": activity.last_used_alc_crc,
+                "plc_head": self._plc_head_to_dict(activity.last_plc_head)
+            })
+
+        values = {}
+        if self._plc_cache is not None:
+            for nad, items in self._plc_cache.get_snapshot().items():
+                if len(items) > 0:
+                    values[str(nad)] = [
+                        (name, value, description, now - age)
+                        for name, value, description, age in items
+                    ]
+
+        return {
+            "version": SNAPSHOT_VERSION,
+            "saved": now,
+            "plcs": plcs,
+            "values": values
+        }
+
+    def _restore_plcs(self, plcs: list) -> int:
+        count = 0
+        max_age = timedelta(seconds=self._max_age_s)
+
+        for plc in plcs:
+            nad = plc["nad"]
+            origin = PlcInfo.Origin(plc["origin"])
+            program_datetime = self._str_to_datetime(plc["program_datetime"])
+            last_update_time = self._str_to_datetime(plc["last_update_time"])
+
+            try:
+                self._plc_info_service.get_plc_info(nad)
+                exists = True
+            except KeyError:
+                exists = False
+
+            if exists:
+                # static controller, only the program is taken over
+                if program_datetime is not None:
+                    self._plc_info_service.update_program_datetime(
+                        nad, program_datetime
+                    )
+            elif (
+                origin in (PlcInfo.Origin.AUTO, PlcInfo.Origin.PUSH) and
+                plc["ip"] is not None and
+                datetime.now() - last_update_time <= max_age
+            ):
+                self._plc_info_service.set_plc_info(
+                    self._plc_info_service.create(
+                        origin,
+                        nad,
+                        plc["ip"],
+                        plc["port"],
+                        None,
+                        program_datetime,
+                        last_update_time
+                    )
+                )
+            else:
+                continue
+
+            if plc["alc_crc"] is not None:
+                self._plc_activity_service.report_alc_crc_used(
+                    nad, plc["alc_crc"]
+                )
+            if plc["plc_head"] is not None:
+                self._plc_activity_service.report_plc_head_used(
+                    nad, self._dict_to_plc_head(plc["plc_head"])
+                )
+            count += 1
+
+        return count
+
+    def _restore_values(self, values: Dict[str, list], now: float) -> int:
+        if self._plc_cache is None:
+            return 0
+
+        count = 0
+        for nad_str, items in values.items():
+            cache = self._plc_cache[int(nad_str)]
+            for name, value, description, updated in items:
+                if now - updated <= self._max_age_s:
+                    cache.restore_value(name, value, description)
+                    count += 1
+
+        return count
+
+    def _read(self) -> Dict[str, Any]:
+        with open(self._path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write(self, snapshot: Dict[str, Any]) -> None:
+        tmp_path = self._path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, separators=(",", ":"))
+        os.replace(tmp_path, self._path)
+
+    @staticmethod
+    def _plc_head_to_dict(plc_head: Optional[PlcHead]
+                          ) -> Optional[Dict[str, Any]]:
+        if plc_head is None:
+            return None
+        result = dataclasses.asdict(plc_head)
+        result["program_timestamp"] = plc_head.program_timestamp.isoformat()
+        return result
+
+    @staticmethod
+    def _dict_to_plc_head(data: Dict[str, Any]) -> PlcHead:
+        return PlcHead(**{
+            **data,
+            "program_timestamp": datetime.fromisoformat(
+                data["program_timestamp"]
+            )
+        })
+
+    @staticmethod
+    def _datetime_to_str(value: Optional[datetime]) -> Optional[str]:
+        return None if value is None else value.isoformat()
+
+    @staticmethod
+    def _str_to_datetime(value: Optional[str]) -> Optional[datetime]:
+        return None if value is None else datetime.fromisoformat(value)
@@ -4,6 +4,7 @@ from typing import Callable, Coroutine
 
 from scgi_server.local.config.config.eth_config import SocketsType
 from lib.general.conditional_logger import ConditionalLogger
+from lib.general.misc import create_task_callback
 from lib.services.alias_service import AliasService
 from scgi_server.local.input_output.abus_stack.abus.abus_message import \
     AbusMessage
@@ -34,6 +35,10 @@ class SocketService:
         self._send_client_message_handler = send_client_message_handler
         self._sockets: SocketsType = sockets
 
+    def set_sockets(self, sockets: SocketsType) -> None:
+        self._sockets = sockets
+        self._log.info("Socket definitions updated")
+
     async def _propagate_socket_message(self, abus_msg: AbusMessage):
         """Serializes ABUS socket message to xml and sends it to clients via
         send_client_message_handler call.
@@ -57,6 +62,13 @@ class SocketService:
         """Process received ABUS socket message and send it to clients.
         """
         self._log.debug(f"Received socket message: {abus_msg}")
-        asyncio.run_coroutine_threadsafe(
-            self._propagate_socket_message(abus_msg), self._loop
-        )
+        if asyncio.get_running_loop() is self._loop:
+            # single loop mode
+            task = self._loop.create_task(
+                self._propagate_socket_message(abus_msg)
+            )
+            task.add_done_callback(create_task_callback(self._log))
+        else:
+            asyncio.run_coroutine_threadsafe(
+                self._propagate_socket_message(abus_msg), self._loop
+            )
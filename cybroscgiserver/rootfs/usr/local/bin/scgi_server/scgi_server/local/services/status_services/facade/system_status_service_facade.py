@@ -1,7 +1,9 @@
 import asyncio
+import math
 from typing import Coroutine, Callable, List, Tuple, Dict
 
 from lib.general.util import humanize_timedelta, tabulate
+from lib.services.cpu_intensive_task_runner import TaskTiming
 from lib.input_output.scgi.r_response import RResponse
 from scgi_server.local.services.rw_service.scgi_communication.rw_request \
     import RWRequest
@@ -37,6 +39,18 @@ class SystemStatusServiceFacade:
                 self._scgi_request_count,
                 "Total number of requests since startup."
             ),
+            "scgi_compressed_count": (
+                self._scgi_compressed_count,
+                "Total number of compressed responses since startup."
+            ),
+            "scgi_compression_ratio": (
+                self._scgi_compression_ratio,
+                "Average ratio between original and compressed response size."
+            ),
+            "scgi_compression_time": (
+                self._scgi_compression_time,
+                "Total cpu time spent compressing responses in milliseconds."
+            ),
             "push_port_status": (
                 self._push_port_status,
                 "Push port status can be 'active', 'inactive' or 'error'."
@@ -69,6 +83,63 @@ class SystemStatusServiceFacade:
                 self._cache_request,
                 "Cache request time in seconds."
             ),
+            "cache_entries": (
+                self._cache_entries,
+                "Number of cached variables of all controllers."
+            ),
+            "cache_size": (
+                self._cache_size,
+                "Estimated memory used by cached variables in kB."
+            ),
+            "cache_evictions": (
+                self._cache_evictions,
+                "Number of variables removed from cache to stay within limits."
+            ),
+            "cache_plc_count": (
+                self._cache_plc_count,
+                "Number of controllers with cached variables."
+            ),
+            "read_plan_count": (
+                self._read_plan_count,
+                "Number of cached controller read plans."
+            ),
+            "read_plan_hit_rate": (
+                self._read_plan_hit_rate,
+                "Percentage of controller reads served by a cached read plan."
+            ),
+            "ws_client_count": (
+                self._ws_client_count,
+                "Number of connected WebSocket clients."
+            ),
+            "ws_dropped_count": (
+                self._ws_dropped_count,
+                "Total number of WebSocket messages dropped for slow clients."
+            ),
+            "ws_client_list": (
+                self._ws_client_list,
+                "Formated list of WebSocket clients with send queue depth and "
+                "dropped messages."
+            ),
+            "task_timing_list": (
+                self._task_timing_list,
+                "Formated list of request processing tasks with the number "
+                "of runs per duration."
+            ),
+            "trace_list": (
+                self._trace_list,
+                "Formated list of the slowest scgi requests with processing "
+                "stages, when tracing is enabled."
+            ),
+            "profiler": (
+                self._profiler,
+                "Seconds until the sampling profiler stops, write the "
+                "number of seconds to profile, 0 to stop."
+            ),
+            "profile_list": (
+                self._profile_list,
+                "Formated list of the share of stack samples by thread and "
+                "subsystem of the last profile."
+            ),
             "udp_rx_count": (
                 self._udp_rx_count,
                 "Total number of received UDP packets."
@@ -79,6 +150,13 @@ class SystemStatusServiceFacade:
             )
         }
 
+        self._write_actions: Dict[
+            str,
+            Callable[[str], Coroutine[None, None, None]]
+        ] = {
+            "profiler": self._set_profiler
+        }
+
     async def process(self, requests: List[RWRequest]) -> List[RResponse]:
         coroutines = (self._process_request(request) for request in requests)
         responses = await asyncio.gather(*coroutines)
@@ -95,6 +173,16 @@ class SystemStatusServiceFacade:
                 request.name, request.tag_name, code=RResponse.Code.UNKNOWN
             )
 
+    async def write(self, requests: List[RWRequest]) -> None:
+        """Writes system tags, tags which are not writable are ignored.
+
+        :raises ValueError: when written value is not valid
+        """
+        for request in requests:
+            action = self._write_actions.get(request.tag_name)
+            if action is not None:
+                await action(request.value)
+
     async def get(self, tag_name: str) -> Tuple[str, str]:
         action, description = self._actions[tag_name]
         value = await action()
@@ -114,6 +202,17 @@ class SystemStatusServiceFacade:
     async def _scgi_request_count(self) -> str:
         return str(self._system_status_service.scgi_request_count)
 
+    async def _scgi_compressed_count(self) -> str:
+        return str(self._system_status_service.scgi_compressed_count)
+
+    async def _scgi_compression_ratio(self) -> str:
+        return f"{self._system_status_service.scgi_compression_ratio:.2f}"
+
+    async def _scgi_compression_time(self) -> str:
+        return str(
+            int(self._system_status_service.scgi_compression_time * 1000)
+        )
+
     async def _push_port_status(self) -> str:
         if self._system_status_service.is_push_port_active:
             return "active"
@@ -158,6 +257,106 @@ class SystemStatusServiceFacade:
     async def _cache_request(self) -> str:
         return str(self._system_status_service.cache_request_period.seconds)
 
+    async def _cache_entries(self) -> str:
+        return str(self._system_status_service.cache_entries)
+
+    async def _cache_size(self) -> str:
+        return str(self._system_status_service.cache_size // 1024)
+
+    async def _cache_evictions(self) -> str:
+        return str(self._system_status_service.cache_evictions)
+
+    async def _cache_plc_count(self) -> str:
+        return str(self._system_status_service.cache_plc_count)
+
+    async def _read_plan_count(self) -> str:
+        return str(self._system_status_service.read_plan_count)
+
+    async def _read_plan_hit_rate(self) -> str:
+        return f"{self._system_status_service.read_plan_hit_rate * 100:.1f}"
+
+    async def _ws_client_count(self) -> str:
+        return str(self._system_status_service.ws_client_count)
+
+    async def _ws_dropped_count(self) -> str:
+        return str(self._system_status_service.ws_dropped_count)
+
+    async def _ws_client_list(self) -> str:
+        data = [
+            [
+                client.peer,
+                str(client.queue_depth),
+                str(client.sent_count),
+                str(client.dropped_count)
+            ]
+            for client in self._system_status_service.ws_clients
+        ]
+
+        return tabulate(
+            [47, 5, 9, 9], ["client", "queue", "sent", "dropped"], data, " ",
+            False
+        )
+
+    async def _task_timing_list(self) -> str:
+        bounds = [
+            f"<{bound * 1000:g}ms" for bound in TaskTiming.BUCKETS[:-1]
+        ] + [f">{TaskTiming.BUCKETS[-2] * 1000:g}ms"]
+        data = [
+            [name, backend.value, str(timing.count),
+             f"{timing.mean_s * 1000:.3f}"] +
+            [str(count) for count in timing.buckets]
+            for (name, backend), timing in sorted(
+                self._system_status_service.task_timings.items(),
+                key=lambda item: item[0][0]
+            )
+        ]
+
+        return tabulate(
+            [60, 7, 9, 9] + [8] * len(bounds),
+            ["task", "runner", "count", "mean ms"] + bounds,
+            data, " ", False
+        )
+
+    async def _trace_list(self) -> str:
+        data = []
+        for trace in self._system_status_service.slowest_traces:
+            data.append([str(trace.request_id), trace.description[:60], "",
+                         f"{trace.duration * 1000:.1f}"])
+            data.extend(
+                [
+                    "",
+                    span.stage if span.target is None
+                    else f"{span.stage} c{span.target}",
+                    f"{span.start * 1000:.1f}",
+                    f"{span.duration * 1000:.1f}"
+                ]
+                for span in sorted(trace.spans, key=lambda s: s.start)
+            )
+
+        return tabulate(
+            [9, 60, 9, 9], ["request", "stage", "start ms", "ms"], data, " ",
+            False
+        )
+
+    async def _profiler(self) -> str:
+        return str(math.ceil(self._system_status_service.profiler_remaining_s))
+
+    async def _set_profiler(self, value: str) -> None:
+        self._system_status_service.set_profiler_duration(float(value))
+
+    async def _profile_list(self) -> str:
+        data = [
+            [thread, subsystem, f"{share * 100:.1f}"]
+            for (thread, subsystem), share in sorted(
+                self._system_status_service.last_profile.items()
+            )
+        ]
+
+        return tabulate(
+            [20, 15, 9], ["thread", "subsystem", "samples %"], data, " ",
+            False
+        )
+
     async def _udp_rx_count(self) -> str:
         return str(self._system_status_service.udp_rx_count)
 
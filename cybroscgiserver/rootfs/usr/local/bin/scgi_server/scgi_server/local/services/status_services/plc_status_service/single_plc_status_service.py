@@ -54,6 +54,10 @@ class SinglePlcStatusService:
     def has_alc(self) -> bool:
         return self.plc_activity.last_used_alc_crc is not None
 
+    @property
+    def alc_crc(self) -> Optional[int]:
+        return self.plc_activity.last_used_alc_crc
+
     @property
     def device_status(self) -> PlcActivity.DeviceStatus:
         return self.plc_activity.device_status
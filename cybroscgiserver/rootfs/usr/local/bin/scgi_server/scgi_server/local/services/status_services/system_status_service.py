@@ -1,14 +1,21 @@
 from dataclasses import dataclass
 from datetime import timedelta, datetime
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, Dict
 
 from scgi_server.local.services.rw_service.subservices.plc_comm_service.plc_client_manager.plc_client.status import \
     PlcStatus
+from lib.general.sampling_profiler import SamplingProfiler
+from lib.general.tracing import Tracer, Trace
+from lib.services.cpu_intensive_task_runner import \
+    CPUIntensiveTaskRunner, TaskRunnerBackend, TaskTiming
 from scgi_server.constants import APP_VERSION
+from scgi_server.local.defaults import PROFILER_MAX_DURATION
 from scgi_server.local.input_output.abus_stack.udp.udp_activity_service \
     import UdpActivityService
 from scgi_server.local.input_output.scgi.scgi_activity_service import \
     ScgiActivityService
+from scgi_server.local.input_output.websocket.websocket_activity_service \
+    import WebSocketActivityService, WebSocketClientStats
 from scgi_server.local.services.plc_info_service.plc_info import PlcInfo
 from scgi_server.local.services.plc_info_service.plc_info_service import \
     PlcInfoService
@@ -16,6 +23,10 @@ from scgi_server.local.services.push_service.push_activity_service import \
     PushActivityService
 from scgi_server.local.services.rw_service.subservices.plc_activity_service \
     .plc_activity_service import PlcActivityService
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_cache.plc_cache import PlcCache
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .read_plan_cache import ReadPlanCache
 from scgi_server.local.services.status_services.plc_status_service \
     .plc_status_service import PlcStatusService
 
@@ -87,6 +98,12 @@ class SystemStatusService:
                  plc_activity_service: PlcActivityService,
                  udp_activity_service: UdpActivityService,
                  plc_status_service: PlcStatusService,
+                 read_plan_cache: ReadPlanCache,
+                 websocket_activity_service: WebSocketActivityService,
+                 cpu_intensive_task_runner: CPUIntensiveTaskRunner,
+                 plc_cache: Optional[PlcCache],
+                 tracer: Optional[Tracer],
+                 sampling_profiler: SamplingProfiler,
                  cache_valid_period: timedelta,
                  cache_request_period: timedelta,
                  push_enabled: bool):
@@ -97,6 +114,12 @@ class SystemStatusService:
         self._udp_activity_service = udp_activity_service
         self._app_version = APP_VERSION
         self._plc_status_service = plc_status_service
+        self._read_plan_cache = read_plan_cache
+        self._websocket_activity_service = websocket_activity_service
+        self._cpu_intensive_task_runner = cpu_intensive_task_runner
+        self._plc_cache = plc_cache
+        self._tracer = tracer
+        self._sampling_profiler = sampling_profiler
         self._cache_valid_period: timedelta = cache_valid_period
         self._cache_request_period: timedelta = cache_request_period
         self._push_enabled: bool = push_enabled
@@ -109,6 +132,18 @@ class SystemStatusService:
     def scgi_request_count(self) -> int:
         return self._scgi_activity_service.requests_received_count
 
+    @property
+    def scgi_compressed_count(self) -> int:
+        return self._scgi_activity_service.compressed_responses_count
+
+    @property
+    def scgi_compression_ratio(self) -> float:
+        return self._scgi_activity_service.compression_ratio
+
+    @property
+    def scgi_compression_time(self) -> float:
+        return self._scgi_activity_service.compression_cpu_time
+
     @property
     def server_version(self) -> str:
         return self._app_version
@@ -125,6 +160,69 @@ class SystemStatusService:
     def cache_request_period(self) -> timedelta:
         return self._cache_request_period
 
+    @property
+    def cache_entries(self) -> int:
+        return 0 if self._plc_cache is None else self._plc_cache.entries
+
+    @property
+    def cache_size(self) -> int:
+        return 0 if self._plc_cache is None else self._plc_cache.bytes
+
+    @property
+    def cache_evictions(self) -> int:
+        return 0 if self._plc_cache is None else self._plc_cache.evictions
+
+    @property
+    def cache_plc_count(self) -> int:
+        return 0 if self._plc_cache is None else self._plc_cache.plc_count
+
+    @property
+    def read_plan_count(self) -> int:
+        return self._read_plan_cache.size
+
+    @property
+    def read_plan_hit_rate(self) -> float:
+        return self._read_plan_cache.hit_rate
+
+    @property
+    def ws_client_count(self) -> int:
+        return len(self._websocket_activity_service.clients)
+
+    @property
+    def ws_dropped_count(self) -> int:
+        return self._websocket_activity_service.dropped_count
+
+    @property
+    def ws_clients(self) -> List[WebSocketClientStats]:
+        return self._websocket_activity_service.clients
+
+    @property
+    def task_timings(self) -> Dict[
+        Tuple[str, TaskRunnerBackend], TaskTiming
+    ]:
+        return self._cpu_intensive_task_runner.timings
+
+    @property
+    def slowest_traces(self) -> List[Trace]:
+        return [] if self._tracer is None else self._tracer.slowest
+
+    @property
+    def profiler_remaining_s(self) -> float:
+        return self._sampling_profiler.remaining_s
+
+    @property
+    def last_profile(self) -> Dict[Tuple[str, str], float]:
+        return self._sampling_profiler.last_profile
+
+    def set_profiler_duration(self, duration_s: float) -> None:
+        """Starts profiling for `duration_s` seconds, stops it when zero."""
+        if duration_s > 0:
+            self._sampling_profiler.start(
+                min(duration_s, PROFILER_MAX_DURATION)
+            )
+        else:
+            self._sampling_profiler.stop()
+
     @property
     def is_push_port_active(self) -> bool:
         return self._push_enabled
@@ -0,0 +1,267 @@
+import asyncio
+import json
+from time import monotonic
+from typing import Dict, List, Optional, Set, Tuple, Protocol, Iterable
+
+from lib.general.conditional_logger import ConditionalLogger
+from lib.general.misc import create_task_callback
+from lib.input_output.scgi.r_response import RResponse
+from lib.input_output.scgi.rw_responses_xml_serializer import \
+    RRResponsesXmlSerializer
+from lib.services.alias_service import AliasService, AliasError
+from scgi_server.local.services.rw_service.errors import InvalidTagNameError
+from scgi_server.local.services.rw_service.rw_service import RWService
+from scgi_server.local.services.rw_service.scgi_communication.rw_request \
+    import RWRequest
+
+
+class Subscriber(Protocol):
+    async def send_payload(self, data: bytes) -> None:
+        ...
+
+
+class _Subscription:
+    """Tags subscribed by a single client.
+    """
+    def __init__(self):
+        # tag name -> interval [s]
+        self.intervals: Dict[str, float] = {}
+        # tag name -> time when the client may receive next update
+        self.next_send: Dict[str, float] = {}
+        # tag name -> last value sent to client
+        self.last_sent: Dict[str, Tuple[str, bool, RResponse.Code]] = {}
+
+    def remove(self, tag_name: str) -> None:
+        self.intervals.pop(tag_name, None)
+        self.next_send.pop(tag_name, None)
+        self.last_sent.pop(tag_name, None)
+
+
+class SubscriptionService:
+    """Streams tag values to WebSocket clients.
+
+    Clients send json text messages:
+        {"subscribe": ["c1000.tag1", "alpha.tag2"], "interval": 1}
+        {"unsubscribe": ["c1000.tag1"]}
+
+    Each tag is read through `RWService` at the shortest interval requested
+    by any client, all tags due at the same time are read in a single
+    request. Clients receive `data` xml documents containing only values
+    that changed since their last update.
+    """
+    def __init__(self,
+                 log: ConditionalLogger,
+                 rw_service: RWService,
+                 alias_service: AliasService,
+                 reply_with_descriptions: bool,
+                 min_interval_s: float):
+        self._log: ConditionalLogger = log
+        self._rw_service: RWService = rw_service
+        self._alias_service: AliasService = alias_service
+        self._reply_with_descriptions: bool = reply_with_descriptions
+        self._min_interval_s: float = min_interval_s
+
+        self._subscriptions: Dict[Subscriber, _Subscription] = {}
+        # tag name -> time of the next read
+        self._next_poll: Dict[str, float] = {}
+        self._wake_event: asyncio.Event = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def subscribers_count(self) -> int:
+        return len(self._subscriptions)
+
+    @property
+    def tags_count(self) -> int:
+        return len(self._next_poll)
+
+    async def on_message(self, client: Subscriber, payload: bytes) -> None:
+        """Handles subscription message received from client.
+        """
+        try:
+            message = json.loads(payload)
+            if not isinstance(message, dict):
+                raise ValueError("message must be an object")
+
+            if "subscribe" in message:
+                interval = float(message.get("interval", 1.0))
+                await self.subscribe(client,
+                                     self._tag_list(message["subscribe"]),
+                                     interval)
+            if "unsubscribe" in message:
+                self.unsubscribe(client,
+                                 self._tag_list(message["unsubscribe"]))
+        except (ValueError, TypeError) as e:
+            self._log.warning(f"Invalid subscription message: {e}")
+
+    async def subscribe(self,
+                        client: Subscriber,
+                        tag_names: Iterable[str],
+                        interval: float) -> None:
+        interval = max(interval, self._min_interval_s)
+        subscription = self._subscriptions.setdefault(client, _Subscription())
+        now = monotonic()
+
+        e_responses: List[RResponse] = []
+        for name in tag_names:
+            try:
+                tag_name = self._alias_service.to_nad_name_strict(name)
+                request = RWRequest.create(tag_name)
+            except (AliasError, InvalidTagNameError):
+                e_responses.append(RResponse.create(
+                    name, '', valid=False,
+                    code=RResponse.Code.DEVICE_NOT_FOUND
+                ))
+                continue
+
+            if (request.target == RWRequest.Target.PLC_SYSTEM
+                    and request.tag_name == "variables"):
+                e_responses.append(RResponse.create(
+                    name, request.tag_name, valid=False,
+                    code=RResponse.Code.UNKNOWN
+                ))
+                continue
+
+            subscription.intervals[tag_name] = interval
+            subscription.next_send[tag_name] = now
+            subscription.last_sent.pop(tag_name, None)
+            self._next_poll[tag_name] = now
+
+        self._log.debug(lambda: f"Subscribed {len(subscription.intervals)} "
+                                f"tags, {len(e_responses)} invalid")
+
+        if len(e_responses) > 0:
+            await self._send(client, e_responses)
+
+        self._start()
+
+    def unsubscribe(self,
+                    client: Subscriber,
+                    tag_names: Iterable[str]) -> None:
+        subscription = self._subscriptions.get(client)
+        if subscription is None:
+            return
+
+        for name in tag_names:
+            try:
+                subscription.remove(self._alias_service.to_nad_name(name))
+            except ValueError:
+                pass
+
+        if len(subscription.intervals) == 0:
+            del self._subscriptions[client]
+
+        self._remove_unused_tags()
+
+    def remove(self, client: Subscriber) -> None:
+        """Removes all subscriptions of disconnected client.
+        """
+        if self._subscriptions.pop(client, None) is not None:
+            self._remove_unused_tags()
+
+    @staticmethod
+    def _tag_list(value) -> List[str]:
+        if isinstance(value, str):
+            return [value]
+        if not isinstance(value, list):
+            raise TypeError("tags must be a list")
+        return [str(name) for name in value]
+
+    def _remove_unused_tags(self) -> None:
+        used: Set[str] = set()
+        for subscription in self._subscriptions.values():
+            used.update(subscription.intervals)
+
+        for tag_name in [tag for tag in self._next_poll if tag not in used]:
+            del self._next_poll[tag_name]
+
+        self._wake_event.set()
+
+    def _poll_interval(self, tag_name: str) -> Optional[float]:
+        intervals = [
+            subscription.intervals[tag_name]
+            for subscription in self._subscriptions.values()
+            if tag_name in subscription.intervals
+        ]
+        return min(intervals) if intervals else None
+
+    def _start(self) -> None:
+        self._wake_event.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+            self._task.add_done_callback(create_task_callback(self._log))
+
+    async def _run(self) -> None:
+        while len(self._next_poll) > 0:
+            self._wake_event.clear()
+
+            now = monotonic()
+            due = [tag for tag, t in self._next_poll.items() if t <= now]
+            if len(due) > 0:
+                await self._poll(due)
+
+            if len(self._next_poll) == 0:
+                break
+
+            timeout = min(self._next_poll.values()) - monotonic()
+            if timeout > 0:
+                try:
+                    await asyncio.wait_for(self._wake_event.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+
+        self._log.debug("No subscriptions left, polling stopped")
+
+    async def _poll(self, tag_names: List[str]) -> None:
+        try:
+            responses = await self._rw_service.on_rw_requests(
+                [RWRequest.create(tag_name) for tag_name in tag_names]
+            )
+        except Exception as e:
+            self._log.error(f"Subscription read failed: {e}")
+            responses = []
+
+        now = monotonic()
+        for tag_name in tag_names:
+            interval = self._poll_interval(tag_name)
+            if interval is not None:
+                self._next_poll[tag_name] = now + interval
+
+        responses_by_name: Dict[str, RResponse] = {
+            response.name: response
+            for response in responses
+            if type(response) is RResponse
+        }
+
+        for client, subscription in list(self._subscriptions.items()):
+            changed: List[RResponse] = []
+            for tag_name, response in responses_by_name.items():
+                if now < subscription.next_send.get(tag_name, float("inf")):
+                    continue
+
+                subscription.next_send[tag_name] = \
+                    now + subscription.intervals[tag_name]
+
+                value = (response.value, response.valid, response.code)
+                if subscription.last_sent.get(tag_name) != value:
+                    subscription.last_sent[tag_name] = value
+                    changed.append(response)
+
+            if len(changed) > 0:
+                await self._send(client, changed)
+
+    async def _send(self,
+                    client: Subscriber,
+                    responses: List[RResponse]) -> None:
+        xml = RRResponsesXmlSerializer.to_xml(
+            responses,
+            [],
+            self._reply_with_descriptions,
+            self._alias_service
+        )
+
+        try:
+            await client.send_payload(xml.encode())
+        except (ConnectionError, RuntimeError) as e:
+            self._log.warning(f"Subscriber send failed, removing: {e}")
+            self.remove(client)
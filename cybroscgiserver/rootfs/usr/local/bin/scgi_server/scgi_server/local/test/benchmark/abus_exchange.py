@@ -0,0 +1,124 @@
+"""Measures a-bus exchange latency and cpu time with the exchanger running on
+a separate communication thread and on the main loop (ABUS single_loop).
+
+The controller is simulated by a sender which answers each request on the
+communication loop, so only the cost of passing requests and responses
+between the loops is measured.
+
+Run from application directory:
+    python -m scgi_server.local.test.benchmark.abus_exchange
+"""
+import asyncio
+import statistics
+import time
+from datetime import timedelta
+from typing import List
+
+from lib.general.metrics import MetricsRegistry
+from lib.startup.runner import create_thread_loop
+from scgi_server.local.input_output.abus_stack.abus.abus_exchanger import \
+    AbusExchanger
+from scgi_server.local.input_output.abus_stack.abus.abus_message import \
+    AbusMessage
+
+RATE = 1000
+DURATION_S = 5
+
+
+class _EchoSender:
+    """Answers every request with a response of the same exchange tag."""
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self.exchanger = None
+
+    def send(self, request: AbusMessage) -> None:
+        response = AbusMessage(request.addr,
+                               request.to_nad,
+                               request.from_nad,
+                               request.transaction_id,
+                               None)
+        self._loop.call_soon(self.exchanger.receive, response)
+
+
+async def _measure(comm_loop: asyncio.AbstractEventLoop) -> List[float]:
+    sender = _EchoSender(comm_loop)
+    created = asyncio.get_running_loop().create_future()
+
+    def create_exchanger():
+        sender.exchanger = AbusExchanger(comm_loop,
+                                         sender,
+                                         timedelta(seconds=1),
+                                         1,
+                                         MetricsRegistry(),
+                                         "rw")
+        created.get_loop().call_soon_threadsafe(created.set_result, None)
+
+    comm_loop.call_soon_threadsafe(create_exchanger)
+    await created
+
+    latencies = []
+    interval = 1 / RATE
+    next_time = time.perf_counter()
+    for transaction_id in range(RATE * DURATION_S):
+        request = AbusMessage(("127.0.0.1", 8442),
+                              0,
+                              1000,
+                              transaction_id & 0xFFFF,
+                              None)
+        start = time.perf_counter()
+        await sender.exchanger.exchange_threadsafe(request)
+        latencies.append(time.perf_counter() - start)
+
+        next_time += interval
+        delay = next_time - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    return latencies
+
+
+def _cancel_tasks(loop: asyncio.AbstractEventLoop) -> None:
+    for task in asyncio.all_tasks(loop):
+        task.cancel()
+
+
+def _run(single_loop: bool):
+    main_loop = asyncio.new_event_loop()
+    if single_loop:
+        comm_loop, kill = main_loop, None
+    else:
+        comm_loop, kill = create_thread_loop("CommunicationThread")
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    latencies = main_loop.run_until_complete(_measure(comm_loop))
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+
+    if kill is not None:
+        comm_loop.call_soon_threadsafe(_cancel_tasks, comm_loop)
+        kill()
+    else:
+        _cancel_tasks(main_loop)
+        main_loop.run_until_complete(asyncio.sleep(0))
+    main_loop.close()
+
+    latencies.sort()
+    return (
+        statistics.mean(latencies) * 1e6,
+        latencies[int(len(latencies) * 0.99)] * 1e6,
+        cpu / wall * 100
+    )
+
+
+def main():
+    print(f"{RATE} exchanges/s for {DURATION_S} s")
+    print(f"{'mode':>8} {'mean':>10} {'p99':>10} {'cpu':>7}")
+    for name, single_loop in (("thread", False), ("single", True)):
+        mean_us, p99_us, cpu_percent = _run(single_loop)
+        print(f"{name:>8} {mean_us:>7.0f} us {p99_us:>7.0f} us "
+              f"{cpu_percent:>6.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Measures plc cache lookup and cleanup time with many cached variables.
+
+Run from application directory:
+    python -m scgi_server.local.test.benchmark.plc_cache
+"""
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from timeit import timeit
+
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_cache.cache_value_condition import CacheValueCondition
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_cache.single_plc_cache import SinglePlcCache
+
+ENTRIES = 100_000
+REQUEST_PERIOD = timedelta(seconds=5)
+VALID_PERIOD = timedelta(seconds=10)
+
+
+class _DatetimeCache:
+    # previous implementation, kept for comparison
+    @dataclass(frozen=True)
+    class Item:
+        value: str
+        description: str
+        expiry: datetime
+
+    @dataclass(frozen=True)
+    class Value:
+        value: str
+        description: str
+        condition: CacheValueCondition
+
+    def __init__(self):
+        self._items = {}
+
+    def set_value(self, name, value, description):
+        self._items[name] = self.Item(value, description,
+                                      datetime.now() + VALID_PERIOD)
+
+    def get_value(self, name):
+        item = self._items[name]
+        stinky_time = item.expiry - REQUEST_PERIOD
+        now = datetime.now()
+        if now < stinky_time:
+            condition = CacheValueCondition.FRESH
+        elif now < item.expiry:
+            condition = CacheValueCondition.STINKY
+        else:
+            condition = CacheValueCondition.STALE
+        return self.Value(item.value, item.description, condition)
+
+    def cleanup(self):
+        for name in list(self._items.keys()):
+            if self.get_value(name).condition == CacheValueCondition.STALE:
+                del self._items[name]
+
+
+def _ms(func, number: int = 5) -> float:
+    return timeit(func, number=number) / number * 1000
+
+
+def main():
+    loop = asyncio.new_event_loop()
+    names = [f"tag{i}" for i in range(ENTRIES)]
+
+    old = _DatetimeCache()
+    new = SinglePlcCache(loop, REQUEST_PERIOD, VALID_PERIOD)
+
+    def fill_old():
+        for name in names:
+            old.set_value(name, "0", "")
+
+    def fill_new():
+        for name in names:
+            new.set_value(name, "0", "")
+
+    rows = [
+        ("set", _ms(fill_old), _ms(fill_new)),
+        ("get", _ms(lambda: [old.get_value(n) for n in names]),
+         _ms(lambda: new.get_values(names))),
+        ("cleanup", _ms(old.cleanup), _ms(new.cleanup)),
+    ]
+
+    print(f"{ENTRIES} entries")
+    print(f"{'operation':>10} {'datetime':>12} {'monotonic':>12}")
+    for operation, old_ms, new_ms in rows:
+        print(f"{operation:>10} {old_ms:>9.1f} ms {new_ms:>9.1f} ms")
+
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Measures memory allocated and time spent by `PlcCommService` per read
+request of already planned tags, without the plc cache.
+
+The controller is simulated by a client which answers reads with zeros, so
+only objects created around the controller communication are measured.
+
+Run from application directory:
+    python -m scgi_server.local.test.benchmark.plc_communicator
+"""
+import asyncio
+import time
+import tracemalloc
+from datetime import datetime
+
+from lib.general.conditional_logger import get_logger
+from lib.general.metrics import MetricsRegistry
+from lib.services.cpu_intensive_task_runner import CPUIntensiveTaskRunner
+from scgi_server.local.services.plc_info_service.plc_info import PlcInfo
+from scgi_server.local.services.rw_service.scgi_communication.rw_request \
+    import RWRequest
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .alc_service.var_info import VarInfo
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .data_type import DataType
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_client_manager.plc_client.plc_head import PlcHead
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_client_manager.plc_client_manager import PlcClientManager
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_comm_service import PlcCommService
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .read_plan_cache import ReadPlanCache
+
+NAD = 1000
+CRC = 0x1234
+TAGS = 10
+REQUESTS = 10_000
+REPEATS = 5
+PROGRAM_DATETIME = datetime(2024, 1, 1)
+
+
+class _PlcActivityService:
+    def report_alc_crc_used(self, nad, crc):
+        pass
+
+    def report_read_frames(self, frame_count):
+        pass
+
+
+class _AlcService:
+    def __init__(self):
+        self._alc = {
+            f"tag{i}": VarInfo(0, f"tag{i}", False, 1, 0x100 + 2 * i, 0, 2,
+                               "", DataType.INT, "")
+            for i in range(TAGS)
+        }
+
+    def __getitem__(self, crc):
+        return self._alc
+
+
+class _PlcClient:
+    """Answers every read with zeros."""
+    def __init__(self, plc_info: PlcInfo):
+        self.plc_info = plc_info
+        self._plc_head = PlcHead(0, 31416, 0, CRC, 0, 0, PROGRAM_DATETIME, 1,
+                                 1, 0)
+
+    async def read_plc_head(self):
+        return self._plc_head
+
+    async def read_random_memory(self, one_b_addrs, two_b_addrs,
+                                 four_b_addrs, four_b_types,
+                                 on_command_frame_and_type_info_created):
+        on_command_frame_and_type_info_created(
+            None,
+            (len(one_b_addrs), len(two_b_addrs), len(four_b_addrs),
+             four_b_types)
+        )
+        return ([0] * len(one_b_addrs), [0] * len(two_b_addrs),
+                [0] * len(four_b_addrs))
+
+    async def read_random_memory_with_read_plan(self, frames):
+        return [0] * sum(sum(counts) for _, counts, _ in frames)
+
+
+class _PlcClientManager(PlcClientManager):
+    def _create_plc_client(self, plc_info):
+        return _PlcClient(plc_info)
+
+
+async def _run() -> None:
+    log = get_logger("benchmark")
+    loop = asyncio.get_running_loop()
+    runner = CPUIntensiveTaskRunner()
+    plc_client_manager = _PlcClientManager(log, log, loop, None,
+                                           _PlcActivityService(), None,
+                                           runner)
+    service = PlcCommService(log, None, _AlcService(), _PlcActivityService(),
+                             plc_client_manager, None, None,
+                             ReadPlanCache(100), None, None, runner, False,
+                             False, MetricsRegistry())
+    now = datetime.now()
+    plc_client_manager.on_plc_info_set(
+        PlcInfo(now, PlcInfo.Origin.STATIC, NAD, "127.0.0.1", 8442, None,
+                PROGRAM_DATETIME, now)
+    )
+    r_requests = [RWRequest.create(f"c{NAD}.tag{i}") for i in range(TAGS)]
+
+    # first request creates the read plan
+    await service.process_rw_requests(NAD, r_requests, [], None)
+
+    tracemalloc.start()
+    allocated = 0
+    for _ in range(REQUESTS):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        await service.process_rw_requests(NAD, r_requests, [], None)
+        _, peak = tracemalloc.get_traced_memory()
+        allocated += peak - before
+    tracemalloc.stop()
+
+    elapsed = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for _ in range(REQUESTS):
+            await service.process_rw_requests(NAD, r_requests, [], None)
+        elapsed = min(elapsed, time.perf_counter() - start)
+
+    print(f"{REQUESTS} requests of {TAGS} tags")
+    print(f"peak allocated per request: {allocated / REQUESTS:.0f} B")
+    print(f"best time per request: {elapsed / REQUESTS * 1e6:.1f} us")
+
+
+def main():
+    asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Measures memory and time needed for records of a read request of many
+tags: scgi requests, plc requests, responses and a-bus messages.
+
+Run from application directory:
+    python -m scgi_server.local.test.benchmark.records
+"""
+import time
+import tracemalloc
+
+from lib.input_output.scgi.r_response import RResponse
+from scgi_server.local.input_output.abus_stack.abus.abus_message import \
+    AbusMessage
+from scgi_server.local.input_output.abus_stack.abus.command_frame import \
+    CommandFrame, Direction
+from scgi_server.local.services.rw_service.scgi_communication.rw_request \
+    import RWRequest
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .alc_service.var_info import VarInfo
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .data_type import DataType
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_rw_request import PlcRWRequest, AlcData
+
+TAGS = 1000
+# tags read by a single read random memory frame
+TAGS_PER_FRAME = 50
+REPEATS = 20
+
+
+def _create_records(var_infos):
+    r_requests = [RWRequest.create(f"c1000.{name}") for name in var_infos]
+    plc_requests = [
+        PlcRWRequest.create(
+            request.name,
+            None,
+            request.tag_name,
+            alc_data=AlcData(var_info.address, var_info.size,
+                             var_info.data_type, var_info.description)
+        )
+        for request, var_info in zip(r_requests, var_infos.values())
+    ]
+    messages = [
+        AbusMessage(("127.0.0.1", 8442), 0, 1000, i,
+                    CommandFrame(Direction.REQ, 0, b""))
+        for i in range(0, TAGS, TAGS_PER_FRAME)
+    ]
+    responses = [
+        RResponse.create(request.name, request.var_name, "0",
+                         request.alc_data.description)
+        for request in plc_requests
+    ]
+    return r_requests, plc_requests, messages, responses
+
+
+def main():
+    var_infos = {
+        f"tag{i}": VarInfo(0, f"tag{i}", False, 1, 0x100 + 2 * i, 0, 2, "",
+                           DataType.INT, "")
+        for i in range(TAGS)
+    }
+
+    tracemalloc.start()
+    records = _create_records(var_infos)
+    size, _ = tracemalloc.get_traced_memory()
+    del records
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    alc = {
+        f"tag{i}": VarInfo(0, f"tag{i}", False, 1, 0x100 + 2 * i, 0, 2, "",
+                           DataType.INT, "")
+        for i in range(TAGS)
+    }
+    alc_size, _ = tracemalloc.get_traced_memory()
+    del alc
+    tracemalloc.stop()
+
+    elapsed = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        _create_records(var_infos)
+        elapsed = min(elapsed, time.perf_counter() - start)
+
+    print(f"request of {TAGS} tags")
+    print(f"records: {size / 1024:.1f} KiB, best {elapsed * 1000:.2f} ms")
+    print(f"alc of {TAGS} variables: {alc_size / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
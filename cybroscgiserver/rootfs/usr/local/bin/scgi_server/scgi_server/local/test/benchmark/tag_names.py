@@ -0,0 +1,27 @@
+"""Measures time needed to create read requests of repeatedly polled tags.
+
+Run from application directory:
+    python -m scgi_server.local.test.benchmark.tag_names
+"""
+from timeit import timeit
+
+from scgi_server.local.services.rw_service.scgi_communication.rw_request \
+    import RWRequest
+
+TAGS = 1000
+POLLS = 100
+
+
+def main():
+    names = [f"c{1000 + i % 10}.tag{i}" for i in range(TAGS)]
+
+    def poll():
+        return [RWRequest.create(name) for name in names]
+
+    elapsed = timeit(poll, number=POLLS) / POLLS
+    print(f"{TAGS} tags: {elapsed * 1000:.3f} ms per poll, "
+          f"{elapsed / TAGS * 1e9:.0f} ns per tag")
+
+
+if __name__ == "__main__":
+    main()
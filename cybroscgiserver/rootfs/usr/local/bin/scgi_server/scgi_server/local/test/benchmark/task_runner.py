@@ -0,0 +1,54 @@
+"""Measures splitting of read requests with each task runner backend and
+prints the task timings collected by the runner.
+
+Run from application directory:
+    python -m scgi_server.local.test.benchmark.task_runner
+"""
+import asyncio
+
+from lib.services.cpu_intensive_task_runner import CPUIntensiveTaskRunner, \
+    TaskRunnerBackend
+from scgi_server.local.defaults import MAX_FRAME_BYTES
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .data_type import DataType
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_client_manager.plc_client.plc_client_read_write_util import \
+    PlcClientReadWriteUtil
+
+SIZES = (100, 1000, 10000)
+RUNS = 50
+
+
+async def _measure(runner: CPUIntensiveTaskRunner, size: int) -> float:
+    rw_util = PlcClientReadWriteUtil(MAX_FRAME_BYTES)
+    params = (
+        list(range(size)),
+        list(range(size)),
+        list(range(size)),
+        [DataType.LONG] * size
+    )
+
+    for _ in range(RUNS):
+        await runner.run(rw_util.split_r_random_memory_params, params)
+
+    timing = next(iter(runner.timings.values()))
+    return timing.mean_s * 1000
+
+
+def main():
+    print(f"split_r_random_memory_params, mean of {RUNS} runs [ms]")
+    print(f"{'addresses':>10}" + "".join(
+        f"{backend.value:>10}" for backend in TaskRunnerBackend
+    ))
+
+    for size in SIZES:
+        row = f"{size:>10}"
+        for backend in TaskRunnerBackend:
+            runner = CPUIntensiveTaskRunner(backend, threshold=0)
+            row += f"{asyncio.run(_measure(runner, size)):>10.3f}"
+            runner.shutdown()
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Measures WebSocket mask/unmask throughput.
+
+Run from application directory:
+    python -m scgi_server.local.test.benchmark.websocket_masking
+"""
+from timeit import timeit
+
+from lib.input_output.websocket.decoder import WebSocketFrameDecoder
+from lib.input_output.websocket.frame import WebSocketFrame
+
+PAYLOAD_SIZES = (125, 4 * 1024, 64 * 1024, 1024 * 1024)
+
+
+def _mask_bytewise(masking_key: bytes, data: bytes) -> bytes:
+    # previous implementation, kept for comparison
+    return b''.join(
+        (data[i] ^ masking_key[i % 4]).to_bytes(1, byteorder='little')
+        for i in range(0, len(data))
+    )
+
+
+def _throughput(size: int, func, min_time: float = 0.2) -> float:
+    """Returns throughput of func in MB/s.
+    """
+    number = 1
+    while True:
+        elapsed = timeit(func, number=number)
+        if elapsed >= min_time:
+            return size * number / elapsed / (1024 * 1024)
+        number *= 2
+
+
+def main():
+    mask_key = WebSocketFrame.gen_mask()
+    decoder = WebSocketFrameDecoder(max_message_size=2 * max(PAYLOAD_SIZES))
+
+    print(f"{'payload':>10} {'bytewise':>13} {'mask':>13} {'unmask':>13}")
+    for size in PAYLOAD_SIZES:
+        payload = bytes(size)
+        frame = WebSocketFrame.for_payload(payload, client=True).serialize()
+
+        # byte by byte masking of large payloads takes too long
+        if size <= 64 * 1024:
+            bytewise = _throughput(
+                size, lambda: _mask_bytewise(mask_key, payload)
+            )
+            bytewise_str = f"{bytewise:.1f} MB/s"
+        else:
+            bytewise_str = "-"
+        mask = _throughput(
+            size, lambda: WebSocketFrame.mask_data(mask_key, payload)
+        )
+        unmask = _throughput(size, lambda: decoder.feed(frame))
+
+        print(f"{size:>10} {bytewise_str:>13} {mask:>8.1f} MB/s "
+              f"{unmask:>8.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+import unittest
+
+from lib.config.config.scgi_config import ScgiConfig
+from lib.config.loader import create_config_parser
+from lib.input_output.websocket.send_queue import DropPolicy
+from scgi_server.local.config.config.config_defaults import DEFAULT_CONFIG
+
+
+def _load(text: str) -> ScgiConfig:
+    cp = create_config_parser()
+    cp.read_string(text)
+    return ScgiConfig.load(cp, DEFAULT_CONFIG.scgi_config)
+
+
+class ScgiConfigTestCase(unittest.TestCase):
+    def test_drop_policy(self):
+        config = _load("[SCGI]\nws_drop_policy = disconnect\n")
+
+        self.assertEqual(config.ws_drop_policy, DropPolicy.DISCONNECT)
+
+    def test_invalid_drop_policy_falls_back_to_default(self):
+        with self.assertLogs(level="WARNING"):
+            config = _load("[SCGI]\nport = 4000\nws_drop_policy = drop_old\n")
+
+        self.assertEqual(config.ws_drop_policy,
+                         DEFAULT_CONFIG.scgi_config.ws_drop_policy)
+        self.assertEqual(config.scgi_port, 4000)
+
+
+if __name__ == '__main__':
+    unittest.main()
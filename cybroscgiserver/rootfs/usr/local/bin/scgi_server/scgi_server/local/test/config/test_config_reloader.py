@@ -0,0 +1,147 @@
+import asyncio
+import tempfile
+import unittest
+from dataclasses import replace
+from datetime import timedelta
+from pathlib import Path
+
+from lib.config.loader import read_config_from_file
+from lib.general.conditional_logger import get_logger
+from lib.services.alias_service import AliasService
+from scgi_server.local.config.config.config import Config
+from scgi_server.local.config.config.config_defaults import DEFAULT_CONFIG
+from scgi_server.local.config.config_reloader import ConfigReloader
+from scgi_server.local.services.plc_info_service.plc_info_service import \
+    PlcInfoService
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_cache.cache_budget import CacheBudget
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_cache.plc_cache import PlcCache
+
+CONFIG = """
+[CACHE]
+valid_period_s = 10
+request_period_s = 5
+
+[SCGI]
+port = 4000
+
+[ALIAS]
+c1000 = alpha
+
+[c2000]
+ip = 192.168.1.100
+port = 8442
+password =
+"""
+
+
+class FakePlcClientManager:
+    def on_plc_info_set(self, plc_info):
+        pass
+
+    def on_plc_info_removed(self, nad):
+        pass
+
+
+class FakeSocketService:
+    def __init__(self):
+        self.sockets = None
+
+    def set_sockets(self, sockets):
+        self.sockets = sockets
+
+
+class ConfigReloaderTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.path = Path(self._dir.name).joinpath("config.ini")
+        self.path.write_text(CONFIG, encoding="utf-8")
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def _create_reloader(self):
+        log = get_logger()
+        loop = asyncio.get_running_loop()
+        config = read_config_from_file(str(self.path), Config,
+                                       DEFAULT_CONFIG)
+
+        self.alias_service = AliasService(log,
+                                          config.alias_config.aliases,
+                                          config.alias_config.reversed)
+        self.plc_info_service = PlcInfoService(
+            log, loop, None, timedelta(hours=1),
+            config.static_plcs_config.static_plcs_configs
+        )
+        self.plc_info_service.set_plc_client_manager(FakePlcClientManager())
+        self.plc_info_service.load_static_plc_infos()
+        self.plc_cache = PlcCache(loop,
+                                  timedelta(0),
+                                  config.cache_config.request_period,
+                                  config.cache_config.valid_period,
+                                  CacheBudget(0, 0),
+                                  timedelta(minutes=10))
+        self.restart_count = 0
+
+        async def restart():
+            self.restart_count += 1
+
+        return ConfigReloader(log,
+                              self.path,
+                              config,
+                              DEFAULT_CONFIG,
+                              self.alias_service,
+                              self.plc_info_service,
+                              FakeSocketService(),
+                              self.plc_cache,
+                              restart)
+
+    async def test_applies_changes_in_place(self):
+        reloader = self._create_reloader()
+
+        self.path.write_text(
+            CONFIG.replace("c1000 = alpha", "c1000 = beta")
+                  .replace("valid_period_s = 10", "valid_period_s = 20")
+                  .replace("[c2000]", "[c3000]"),
+            encoding="utf-8"
+        )
+        await reloader.reload()
+
+        self.assertEqual(self.restart_count, 0)
+        self.assertEqual(self.alias_service.to_nad("beta"), "c1000")
+        self.assertEqual(
+            [p.nad for p in self.plc_info_service.get_static_plc_infos()],
+            [3000]
+        )
+        self.assertEqual(reloader.config.cache_config.valid_period,
+                         timedelta(seconds=20))
+
+    async def test_port_change_restarts(self):
+        reloader = self._create_reloader()
+
+        self.path.write_text(CONFIG.replace("port = 4000", "port = 4001"),
+                             encoding="utf-8")
+        await reloader.reload()
+
+        self.assertEqual(self.restart_count, 1)
+
+    def test_restart_reasons(self):
+        config = DEFAULT_CONFIG
+
+        self.assertEqual(ConfigReloader.get_restart_reasons(
+            config,
+            replace(config, cache_config=replace(
+                config.cache_config, request_period=timedelta(seconds=3)
+            ))
+        ), [])
+        self.assertEqual(ConfigReloader.get_restart_reasons(
+            config,
+            replace(config, eth_config=replace(
+                config.eth_config, port=9000
+            ))
+        ), ["ETH"])
+
+
+if __name__ == '__main__':
+    unittest.main()
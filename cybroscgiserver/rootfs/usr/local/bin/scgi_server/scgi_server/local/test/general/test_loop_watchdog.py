@@ -0,0 +1,47 @@
+import asyncio
+import time
+import unittest
+
+from lib.general.conditional_logger import get_logger
+from lib.general.loop_watchdog import LoopWatchdog
+from lib.general.metrics import MetricsRegistry
+
+
+class LoopWatchdogTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_blocked_loop_is_reported_with_stack(self):
+        metrics = MetricsRegistry()
+        watchdog = LoopWatchdog(get_logger("watchdog"), metrics, 0.01, 0.05)
+        watchdog.watch(asyncio.get_running_loop(), "main")
+        watchdog.start()
+
+        try:
+            await asyncio.sleep(0.05)
+            with self.assertLogs("watchdog", "WARNING") as logs:
+                time.sleep(0.3)
+                await asyncio.sleep(0.05)
+        finally:
+            watchdog.stop()
+
+        (message,) = logs.output
+        self.assertIn("main loop blocked", message)
+        self.assertIn("test_blocked_loop_is_reported_with_stack", message)
+        self.assertIn('event_loop_stalls_total{loop="main"} 1',
+                      metrics.render())
+
+    async def test_heartbeat_is_cancelled_on_stop(self):
+        watchdog = LoopWatchdog(get_logger("watchdog"),
+                                MetricsRegistry(),
+                                0.01,
+                                0.05)
+        watchdog.watch(asyncio.get_running_loop(), "main")
+        watchdog.start()
+        await asyncio.sleep(0.05)
+
+        watchdog.stop()
+        await asyncio.sleep(0.01)
+
+        self.assertEqual(
+            [task for task in asyncio.all_tasks()
+             if task.get_coro().__name__ == "_beat"],
+            []
+        )
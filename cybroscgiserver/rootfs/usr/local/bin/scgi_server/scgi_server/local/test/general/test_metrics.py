@@ -0,0 +1,52 @@
+import unittest
+
+from lib.general.metrics import MetricsRegistry
+
+
+class MetricsRegistryTestCase(unittest.TestCase):
+    def test_counters_and_gauges_are_rendered(self):
+        registry = MetricsRegistry()
+        exchanges = registry.counter("exchanges_total", "Exchanges",
+                                     ("nad", "result"))
+        exchanges.labels(1000, "ok").inc()
+        exchanges.labels(1000, "ok").inc(2)
+        registry.gauge("plcs", "Controllers", function=lambda: 3).labels()
+
+        self.assertEqual(registry.render(), "\n".join([
+            "# HELP exchanges_total Exchanges",
+            "# TYPE exchanges_total counter",
+            'exchanges_total{nad="1000",result="ok"} 3',
+            "# HELP plcs Controllers",
+            "# TYPE plcs gauge",
+            "plcs 3",
+            ""
+        ]))
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "Latency",
+                                       (0.1, 1.0)).labels()
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+
+        self.assertEqual(registry.render().splitlines()[2:], [
+            'latency_seconds_bucket{le="0.1"} 2',
+            'latency_seconds_bucket{le="1"} 3',
+            'latency_seconds_bucket{le="+Inf"} 4',
+            "latency_seconds_sum 2.65",
+            "latency_seconds_count 4"
+        ])
+
+    def test_metric_is_registered_once(self):
+        registry = MetricsRegistry()
+        first = registry.counter("requests_total", "Requests")
+
+        self.assertIs(registry.counter("requests_total", "Requests"), first)
+        with self.assertRaises(ValueError):
+            registry.gauge("requests_total", "Requests")
+        with self.assertRaises(ValueError):
+            first.labels("unexpected")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from lib.general.conditional_logger import get_logger
+from lib.general.sampling_profiler import SamplingProfiler
+
+
+def _busy(duration_s: float) -> None:
+    end = time.monotonic() + duration_s
+    while time.monotonic() < end:
+        pass
+
+
+class SamplingProfilerTestCase(unittest.TestCase):
+    def test_samples_are_attributed_to_subsystems_and_saved(self):
+        with tempfile.TemporaryDirectory() as log_dir:
+            profiler = SamplingProfiler(
+                get_logger("test"),
+                Path(log_dir),
+                ("MainThread",),
+                (("test_sampling_profiler", "busy"),),
+                0.005,
+                0.5
+            )
+
+            profiler.start(0.3)
+            self.assertTrue(profiler.is_running)
+            _busy(0.3)
+            while profiler.is_running:
+                time.sleep(0.01)
+
+            self.assertGreater(
+                profiler.last_profile[("MainThread", "busy")], 0.5
+            )
+            (path,) = Path(log_dir).glob("profile_*.folded")
+            stack, count = path.read_text().splitlines()[0].rsplit(" ", 1)
+            self.assertTrue(stack.startswith("MainThread;"))
+            self.assertIn("test_sampling_profiler:_busy", stack)
+            self.assertGreater(int(count), 0)
+
+    def test_restart_right_after_stop(self):
+        with tempfile.TemporaryDirectory() as log_dir:
+            profiler = SamplingProfiler(get_logger("test"),
+                                        Path(log_dir),
+                                        ("MainThread",),
+                                        (),
+                                        0.005,
+                                        0.5)
+
+            profiler.start(10)
+            profiler.stop()
+            self.assertFalse(profiler.is_running)
+            self.assertEqual(profiler.remaining_s, 0)
+
+            profiler.start(10)
+            self.assertTrue(profiler.is_running)
+            time.sleep(0.05)
+            self.assertTrue(profiler.is_running)
+
+            profiler.stop()
+            while profiler._thread.is_alive():
+                time.sleep(0.01)
@@ -0,0 +1,57 @@
+import asyncio
+import unittest
+
+from lib.general.tracing import Tracer, span, current_trace
+from lib.startup.runner import create_thread_loop
+
+
+class TracerTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_spans_of_concurrent_tasks_are_traced(self):
+        tracer = Tracer(10)
+
+        async def read(nad):
+            with span("read", nad):
+                await asyncio.sleep(0)
+
+        with tracer.trace() as trace:
+            await asyncio.gather(read(1000), read(1001))
+
+        self.assertIsNone(current_trace())
+        self.assertEqual(
+            sorted((s.stage, s.target) for s in trace.spans),
+            [("read", 1000), ("read", 1001)]
+        )
+
+    async def test_trace_reaches_other_loop(self):
+        tracer = Tracer(10)
+        loop, kill = create_thread_loop("TestThread")
+
+        async def exchange():
+            with span("exchange"):
+                await asyncio.sleep(0)
+
+        try:
+            with tracer.trace() as trace:
+                await asyncio.wrap_future(
+                    asyncio.run_coroutine_threadsafe(exchange(), loop)
+                )
+        finally:
+            kill()
+
+        self.assertEqual([s.stage for s in trace.spans], ["exchange"])
+
+    async def test_only_slowest_traces_are_kept(self):
+        tracer = Tracer(2)
+
+        for delay in (0.02, 0, 0.01, 0):
+            with tracer.trace():
+                await asyncio.sleep(delay)
+
+        self.assertEqual([trace.request_id for trace in tracer.slowest],
+                         [1, 3])
+
+    def test_span_without_trace_does_nothing(self):
+        with span("read", 1000):
+            pass
+
+        self.assertIsNone(current_trace())
@@ -0,0 +1,86 @@
+import asyncio
+import unittest
+from datetime import timedelta
+
+from lib.general.metrics import MetricsRegistry
+from scgi_server.local.general.errors import ExchangerTimeoutError
+from scgi_server.local.input_output.abus_stack.abus.abus_exchanger import \
+    AbusExchanger
+from scgi_server.local.input_output.abus_stack.abus.abus_message import \
+    AbusMessage
+
+
+class _Sender:
+    def __init__(self, answer: bool):
+        self.answer = answer
+        self.exchanger = None
+        self.sent = 0
+
+    def send(self, request: AbusMessage) -> None:
+        self.sent += 1
+        if self.answer:
+            response = AbusMessage(request.addr,
+                                   request.to_nad,
+                                   request.from_nad,
+                                   request.transaction_id,
+                                   None)
+            asyncio.get_running_loop().call_soon(self.exchanger.receive,
+                                                 response)
+
+
+def _request(transaction_id: int) -> AbusMessage:
+    return AbusMessage(("127.0.0.1", 8442), 0, 1000, transaction_id, None)
+
+
+class AbusExchangerSingleLoopTestCase(unittest.IsolatedAsyncioTestCase):
+    def _create(self,
+                sender: _Sender,
+                metrics: MetricsRegistry = None) -> AbusExchanger:
+        sender.exchanger = AbusExchanger(asyncio.get_running_loop(),
+                                         sender,
+                                         timedelta(milliseconds=10),
+                                         2,
+                                         metrics or MetricsRegistry(),
+                                         "rw")
+        return sender.exchanger
+
+    async def test_exchanges_on_the_same_loop(self):
+        exchanger = self._create(_Sender(answer=True))
+
+        responses = await asyncio.gather(
+            exchanger.exchange_threadsafe(_request(1)),
+            exchanger.exchange_threadsafe(_request(2))
+        )
+
+        self.assertEqual([r.transaction_id for r in responses], [1, 2])
+        self.assertEqual(responses[0].from_nad, 1000)
+
+    async def test_timeout_after_retries(self):
+        sender = _Sender(answer=False)
+        exchanger = self._create(sender)
+
+        with self.assertRaises(ExchangerTimeoutError):
+            await exchanger.exchange_threadsafe(_request(1))
+        self.assertEqual(sender.sent, 2)
+
+    async def test_queue_depth_is_exported(self):
+        metrics = MetricsRegistry()
+        exchanger = self._create(_Sender(answer=False), metrics)
+
+        exchanges = asyncio.gather(
+            exchanger.exchange_threadsafe(_request(1)),
+            exchanger.exchange_threadsafe(_request(2)),
+            return_exceptions=True
+        )
+        await asyncio.sleep(0)
+
+        # both requests are queued, the queue task did not run yet
+        self.assertIn('abus_queue_depth{exchanger="rw"} 2',
+                      metrics.render())
+        await exchanges
+        self.assertIn('abus_queue_depth{exchanger="rw"} 0',
+                      metrics.render())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import gzip
+import unittest
+import zlib
+
+from lib.input_output.http.compression import select_encoding, compress
+
+
+class CompressionTestCase(unittest.TestCase):
+    def test_select_encoding(self):
+        self.assertIsNone(select_encoding(None))
+        self.assertIsNone(select_encoding(""))
+        self.assertIsNone(select_encoding("br, identity"))
+        self.assertEqual(select_encoding("gzip, deflate, br"), "gzip")
+        self.assertEqual(select_encoding("DEFLATE"), "deflate")
+        self.assertEqual(select_encoding("gzip;q=0.5, deflate;q=0.8"),
+                         "deflate")
+        self.assertEqual(select_encoding("*"), "gzip")
+        self.assertIsNone(select_encoding("gzip;q=0"))
+        self.assertEqual(select_encoding("gzip;q=0, *"), "deflate")
+        self.assertIsNone(select_encoding("gzip;q=0, deflate;q=0, *"))
+        self.assertEqual(select_encoding("br, *;q=0.5"), "gzip")
+
+    def test_compress(self):
+        data = b"<data><var><name>c1000.a</name></var></data>" * 100
+
+        gzipped, _ = compress(data, "gzip")
+        self.assertEqual(gzip.decompress(gzipped), data)
+
+        deflated, cpu_time = compress(data, "deflate")
+        self.assertEqual(zlib.decompress(deflated), data)
+        self.assertLess(len(deflated), len(data))
+        self.assertGreaterEqual(cpu_time, 0)
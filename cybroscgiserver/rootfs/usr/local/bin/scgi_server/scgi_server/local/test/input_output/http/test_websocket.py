@@ -1,6 +1,12 @@
+import asyncio
 import unittest
+from dataclasses import replace
 
-from lib.input_output.websocket.frame import WebSocketFrame
+from lib.input_output.websocket.decoder import WebSocketFrameDecoder
+from lib.input_output.websocket.frame import WebSocketFrame, Opcode, \
+    WebSocketProtocolError
+from lib.input_output.websocket.send_queue import WebSocketSendQueue, \
+    DropPolicy, SendQueueFull
 
 
 class WebsocketTestCase(unittest.TestCase):
@@ -32,6 +38,70 @@ class WebsocketTestCase(unittest.TestCase):
 
         self.assertEqual(frame.payload, frame2.payload)
 
+    def test_mask_data(self):
+        mask_key = bytes.fromhex("44B6B51A")
+        data = bytes(range(256)) * 3 + b"odd"
+
+        expected = bytes(
+            data[i] ^ mask_key[i % 4] for i in range(len(data))
+        )
+
+        self.assertEqual(WebSocketFrame.mask_data(mask_key, data), expected)
+        self.assertEqual(WebSocketFrame.mask_data(mask_key, b""), b"")
+
+    def test_decoder_partial_and_coalesced(self):
+        ping = WebSocketFrame.ping("test", client=True).serialize()
+        text = WebSocketFrame.for_payload(b"x" * 300, client=True).serialize()
+        data = ping + text + ping
+
+        decoder = WebSocketFrameDecoder()
+        frames = []
+        for i in range(0, len(data), 7):
+            frames += decoder.feed(data[i:i + 7])
+
+        self.assertEqual([frame.opcode for frame in frames],
+                         [Opcode.PING, Opcode.TEXT, Opcode.PING])
+        self.assertEqual(frames[1].payload, b"x" * 300)
+
+    def test_decoder_fragmented(self):
+        first = replace(WebSocketFrame.for_payload(b"hello ", client=True),
+                        fin=False)
+        last = replace(WebSocketFrame.for_payload(b"world", client=True),
+                       opcode=Opcode.CONTINUATION)
+        ping = WebSocketFrame.ping("test", client=True)
+
+        frames = WebSocketFrameDecoder().feed(
+            first.serialize() + ping.serialize() + last.serialize()
+        )
+
+        self.assertEqual([frame.opcode for frame in frames],
+                         [Opcode.PING, Opcode.TEXT])
+        self.assertEqual(frames[1].payload, b"hello world")
+
+    def test_decoder_unexpected_continuation(self):
+        frame = replace(WebSocketFrame.for_payload(b"x", client=True),
+                        opcode=Opcode.CONTINUATION)
+
+        with self.assertRaises(WebSocketProtocolError):
+            WebSocketFrameDecoder().feed(frame.serialize())
+
+    def test_send_queue_drop_oldest(self):
+        queue = WebSocketSendQueue(2, DropPolicy.DROP_OLDEST)
+        for data in (b"1", b"2", b"3"):
+            queue.put(data)
+
+        self.assertEqual(queue.depth, 2)
+        self.assertEqual(queue.dropped_count, 1)
+        self.assertEqual(asyncio.run(queue.get()), b"2")
+
+    def test_send_queue_disconnect(self):
+        queue = WebSocketSendQueue(1, DropPolicy.DISCONNECT)
+        queue.put(b"1")
+
+        with self.assertRaises(SendQueueFull):
+            queue.put(b"2")
+        self.assertEqual(queue.dropped_count, 1)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,122 @@
+import asyncio
+import stat
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from lib.general.conditional_logger import get_logger
+from lib.input_output.scgi.r_response import RResponse
+from lib.services.cpu_intensive_task_runner import CPUIntensiveTaskRunner
+from scgi_server.local.input_output.ipc.rw_ipc_server import RWIpcServer
+from scgi_server.local.services.rw_service.errors import RWServiceError
+from scgi_server.local.services.rw_service.remote_rw_service import \
+    RemoteRWService
+from scgi_server.local.services.rw_service.scgi_communication.rw_request \
+    import RWRequest
+
+
+class _UnpicklableError(Exception):
+    def __init__(self):
+        super().__init__("unpicklable")
+        self.lock = threading.Lock()
+
+
+class _RWService:
+    async def process_plan(self, plan, task_id=None):
+        requests = [
+            request
+            for requests in plan.plc_r_requests_by_nad.values()
+            for request in requests
+        ]
+        tag_names = {request.tag_name for request in requests}
+        if "bad" in tag_names:
+            raise ValueError("bad tag")
+        if "unpicklable" in tag_names:
+            raise _UnpicklableError()
+        if "stuck" in tag_names:
+            await asyncio.Event().wait()
+        if "unpicklable_reply" in tag_names:
+            return [threading.Lock()]
+
+        await asyncio.sleep(0.01 * len(requests))
+        return [
+            RResponse.create(request.name, request.tag_name, str(request.nad))
+            for request in requests
+        ]
+
+
+class RWIpcTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.path = Path(self._dir.name).joinpath("ipc", "rw.sock")
+        loop = asyncio.get_running_loop()
+
+        self.server = RWIpcServer(get_logger(), loop, self.path, _RWService())
+        await self.server.start()
+
+        self.disconnected = asyncio.Event()
+        self.client = RemoteRWService(get_logger(),
+                                      loop,
+                                      self.path,
+                                      CPUIntensiveTaskRunner(),
+                                      0.1,
+                                      self.disconnected.set)
+        await self.client.connect(1)
+
+    async def asyncTearDown(self):
+        self.server.stop()
+        self._dir.cleanup()
+
+    async def _process(self, *names):
+        plan = await self.client.create_plan(
+            [RWRequest.create(name) for name in names]
+        )
+        return await self.client.process_plan(plan)
+
+    async def test_concurrent_requests(self):
+        slow, fast = await asyncio.gather(
+            self._process("c1000.a", "c1001.b"),
+            self._process("c1002.c")
+        )
+
+        self.assertEqual([(r.name, r.value) for r in slow],
+                         [("c1000.a", "1000"), ("c1001.b", "1001")])
+        self.assertEqual([(r.name, r.value) for r in fast],
+                         [("c1002.c", "1002")])
+
+    async def test_error_is_raised_in_worker(self):
+        with self.assertRaises(ValueError):
+            await self._process("c1000.bad")
+
+        responses = await self._process("c1000.a")
+        self.assertEqual(responses[0].value, "1000")
+
+    async def test_unpicklable_error_is_reported(self):
+        with self.assertRaisesRegex(RWServiceError, "unpicklable"):
+            await self._process("c1000.unpicklable")
+
+        responses = await self._process("c1000.a")
+        self.assertEqual(responses[0].value, "1000")
+
+    async def test_unpicklable_reply_is_reported(self):
+        with self.assertRaisesRegex(RWServiceError, "Can't send reply"):
+            await self._process("c1000.unpicklable_reply")
+
+        responses = await self._process("c1000.a")
+        self.assertEqual(responses[0].value, "1000")
+
+    async def test_socket_is_accessible_only_by_owner(self):
+        self.assertEqual(stat.S_IMODE(self.path.parent.stat().st_mode),
+                         0o700)
+        self.assertEqual(stat.S_IMODE(self.path.stat().st_mode), 0o600)
+
+    async def test_worker_stops_waiting_for_reply(self):
+        with self.assertRaises(RWServiceError):
+            await self._process("c1000.stuck")
+
+        self.assertFalse(self.disconnected.is_set())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,182 @@
+import unittest
+from collections import defaultdict
+from types import SimpleNamespace
+
+from lib.general.conditional_logger import get_logger
+from lib.general.metrics import MetricsRegistry
+from lib.input_output.scgi.r_response import RResponse
+from lib.services.alias_service import AliasService
+from scgi_server.local.input_output.scgi.program_response_cache import \
+    ProgramResponseCache
+from scgi_server.local.input_output.scgi.query_plan_cache import \
+    QueryPlanCache
+from scgi_server.local.input_output.scgi.scgi_activity_service import \
+    ScgiActivityService
+from scgi_server.local.input_output.scgi.scgi_server import ScgiServer
+from scgi_server.local.services.rw_service.scgi_communication.rw_request \
+    import RWRequest
+
+VARIABLES = RWRequest.create("c1000.sys.variables")
+
+
+def _create_plc_status_service(crc_by_nad):
+    return defaultdict(lambda: SimpleNamespace(alc_crc=None), {
+        nad: SimpleNamespace(alc_crc=crc) for nad, crc in crc_by_nad.items()
+    })
+
+
+def _create_cache(crc_by_nad):
+    return ProgramResponseCache(_create_plc_status_service(crc_by_nad),
+                                AliasService(get_logger(), {}, {}),
+                                10)
+
+
+class ProgramResponseCacheTestCase(unittest.TestCase):
+    def test_create_etag(self):
+        cache = _create_cache({1000: 0x1234})
+
+        etag = cache.create_etag([VARIABLES], [], [])
+        self.assertIsNotNone(etag)
+        self.assertEqual(cache.create_etag([VARIABLES], [], []), etag)
+        self.assertNotEqual(
+            _create_cache({1000: 0x4321}).create_etag([VARIABLES], [], []),
+            etag
+        )
+
+    def test_no_etag_for_responses_not_depending_on_program(self):
+        cache = _create_cache({1000: 0x1234})
+        error = RResponse.create("c1000.x", "x", valid=False,
+                                 code=RResponse.Code.DEVICE_NOT_FOUND)
+
+        self.assertIsNone(cache.create_etag([], [], []))
+        self.assertIsNone(cache.create_etag(
+            [VARIABLES], [RWRequest.create("c1000.a", "1")], []
+        ))
+        self.assertIsNone(cache.create_etag(
+            [VARIABLES, RWRequest.create("c1000.a")], [], []
+        ))
+        self.assertIsNone(cache.create_etag(
+            [RWRequest.create("c1000.sys.ip_port")], [], []
+        ))
+        self.assertIsNone(cache.create_etag([VARIABLES], [], [error]))
+        self.assertIsNone(cache.create_etag(
+            [RWRequest.create("c2000.sys.variables")], [], []
+        ))
+
+    def test_matches(self):
+        etag = '"abc"'
+
+        self.assertTrue(ProgramResponseCache.matches(etag, '"abc"'))
+        self.assertTrue(ProgramResponseCache.matches(etag, 'W/"abc"'))
+        self.assertTrue(ProgramResponseCache.matches(etag, '"x", "abc"'))
+        self.assertTrue(ProgramResponseCache.matches(etag, '*'))
+        self.assertFalse(ProgramResponseCache.matches(etag, '"x", W/"y"'))
+        self.assertFalse(ProgramResponseCache.matches(etag, None))
+
+
+class _RWService:
+    def __init__(self):
+        self.process_count = 0
+
+    async def create_plan(self, r_requests, w_requests):
+        return r_requests
+
+    async def process_plan(self, plan):
+        self.process_count += 1
+        return [
+            RResponse.create(request.name, request.tag_name, "1")
+            for request in plan
+        ]
+
+
+class ScgiServerEtagTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.rw_service = _RWService()
+        self.server = self._create_server(0)
+
+    def _create_server(self, compression_min_bytes):
+        alias_service = AliasService(get_logger(), {}, {})
+        return ScgiServer(
+            get_logger(),
+            self.rw_service,
+            ScgiActivityService(),
+            alias_service,
+            _create_cache({1000: 0x1234}),
+            QueryPlanCache(alias_service, 10),
+            False,
+            None,
+            compression_min_bytes,
+            MetricsRegistry(),
+            None
+        )
+
+    async def _get(self, query, if_none_match=None, accept_encoding=None):
+        headers = "" if if_none_match is None \
+            else f"If-None-Match: {if_none_match}\r\n"
+        if accept_encoding is not None:
+            headers += f"Accept-Encoding: {accept_encoding}\r\n"
+        response = await self.server.on_data(
+            f"GET /scgi/?{query} HTTP/1.1\r\n{headers}\r\n".encode()
+        )
+        head, _, body = response.decode("latin-1").partition("\r\n\r\n")
+        status_line, *header_lines = head.split("\r\n")
+        return (
+            int(status_line.split(" ")[1]),
+            dict(line.split(": ", 1) for line in header_lines),
+            body
+        )
+
+    async def test_response_is_cached(self):
+        status, headers, body = await self._get("c1000.sys.variables")
+        self.assertEqual(status, 200)
+        self.assertIn("ETag", headers)
+
+        self.assertEqual(await self._get("c1000.sys.variables"),
+                         (status, headers, body))
+        self.assertEqual(self.rw_service.process_count, 1)
+
+    async def test_not_modified(self):
+        _, headers, _ = await self._get("c1000.sys.variables")
+
+        status, not_modified_headers, body = await self._get(
+            "c1000.sys.variables", f'W/{headers["ETag"]}'
+        )
+        self.assertEqual(status, 304)
+        self.assertEqual(not_modified_headers["ETag"], headers["ETag"])
+        self.assertEqual(body, "")
+
+        status, _, _ = await self._get("c1000.sys.variables", '"other"')
+        self.assertEqual(status, 200)
+        self.assertEqual(self.rw_service.process_count, 1)
+
+    async def test_etag_depends_on_encoding(self):
+        self.server = self._create_server(1)
+        _, identity_headers, _ = await self._get("c1000.sys.variables")
+        _, gzip_headers, _ = await self._get("c1000.sys.variables",
+                                             accept_encoding="gzip")
+        self.assertEqual(gzip_headers["Content-Encoding"], "gzip")
+        self.assertNotEqual(gzip_headers["ETag"], identity_headers["ETag"])
+
+        status, _, _ = await self._get("c1000.sys.variables",
+                                       identity_headers["ETag"],
+                                       "gzip")
+        self.assertEqual(status, 200)
+        status, headers, _ = await self._get("c1000.sys.variables",
+                                             gzip_headers["ETag"],
+                                             "gzip")
+        self.assertEqual(status, 304)
+        self.assertEqual(headers["ETag"], gzip_headers["ETag"])
+        self.assertEqual(self.rw_service.process_count, 1)
+
+    async def test_other_responses_are_not_cached(self):
+        status, headers, _ = await self._get("c1000.a")
+        self.assertEqual(status, 200)
+        self.assertNotIn("ETag", headers)
+
+        status, _, _ = await self._get("c1000.a", "*")
+        self.assertEqual(status, 200)
+        self.assertEqual(self.rw_service.process_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
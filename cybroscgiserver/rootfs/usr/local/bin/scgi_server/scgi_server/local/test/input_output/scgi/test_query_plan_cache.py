@@ -0,0 +1,51 @@
+import unittest
+
+from lib.general.conditional_logger import get_logger
+from lib.services.alias_service import AliasService
+from scgi_server.local.input_output.scgi.query_plan_cache import \
+    QueryPlanCache, QueryPlan
+from scgi_server.local.services.rw_service.scgi_communication.rw_request \
+    import RWRequest
+
+
+def _create_plan(*w_requests):
+    return QueryPlan([], list(w_requests), [], [], None)
+
+
+class QueryPlanCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.alias_service = AliasService(get_logger(), {}, {})
+        self.cache = QueryPlanCache(self.alias_service, 2)
+
+    def test_least_recently_used_plan_is_evicted(self):
+        a, b, c = _create_plan(), _create_plan(), _create_plan()
+
+        self.cache.set("a", a)
+        self.cache.set("b", b)
+        self.assertIs(self.cache.get("a"), a)
+        self.cache.set("c", c)
+
+        self.assertIs(self.cache.get("a"), a)
+        self.assertIsNone(self.cache.get("b"))
+        self.assertIs(self.cache.get("c"), c)
+
+    def test_plans_with_writes_are_not_cached(self):
+        self.cache.set("c1000.a=1", _create_plan(
+            RWRequest.create("c1000.a", "1")
+        ))
+
+        self.assertIsNone(self.cache.get("c1000.a=1"))
+
+    def test_alias_change_clears_plans(self):
+        self.cache.set("alpha.a", _create_plan())
+
+        self.alias_service.update({"c1000": "alpha"}, {"alpha": "c1000"})
+
+        self.assertIsNone(self.cache.get("alpha.a"))
+        plan = _create_plan()
+        self.cache.set("alpha.a", plan)
+        self.assertIs(self.cache.get("alpha.a"), plan)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import tempfile
+import unittest
+import xml.etree.ElementTree as ElementTree
+from datetime import timedelta
+from pathlib import Path
+
+from lib.general.conditional_logger import get_logger
+from lib.general.metrics import MetricsRegistry
+from lib.general.sampling_profiler import SamplingProfiler
+from lib.services.alias_service import AliasService
+from lib.services.cpu_intensive_task_runner import CPUIntensiveTaskRunner, \
+    TaskRunnerBackend
+from scgi_server.local.input_output.scgi.query_plan_cache import \
+    QueryPlanCache
+from scgi_server.local.input_output.scgi.scgi_activity_service import \
+    ScgiActivityService
+from scgi_server.local.input_output.scgi.scgi_server import ScgiServer
+from scgi_server.local.services.rw_service.rw_service import RWService
+from scgi_server.local.services.status_services.facade \
+    .system_status_service_facade import SystemStatusServiceFacade
+from scgi_server.local.services.status_services.system_status_service \
+    import SystemStatusService
+
+
+class SystemTagWritesTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.log_dir = tempfile.TemporaryDirectory()
+        self.profiler = SamplingProfiler(get_logger(),
+                                         Path(self.log_dir.name),
+                                         ("MainThread",),
+                                         (),
+                                         0.01,
+                                         0.5)
+        scgi_activity_service = ScgiActivityService()
+        system_status_service = SystemStatusService(
+            None,
+            None,
+            scgi_activity_service,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+            self.profiler,
+            timedelta(seconds=1),
+            timedelta(seconds=1),
+            False
+        )
+        runner = CPUIntensiveTaskRunner(TaskRunnerBackend.INLINE)
+        alias_service = AliasService(get_logger(), {}, {})
+        self.server = ScgiServer(
+            get_logger(),
+            RWService(SystemStatusServiceFacade(system_status_service),
+                      None,
+                      None,
+                      runner),
+            scgi_activity_service,
+            alias_service,
+            None,
+            QueryPlanCache(alias_service, 10),
+            False,
+            None,
+            0,
+            MetricsRegistry(),
+            None
+        )
+
+    async def asyncTearDown(self):
+        self.profiler.stop()
+        self.log_dir.cleanup()
+
+    async def _get(self, query):
+        response = await self.server.on_data(
+            f"GET /scgi/?{query} HTTP/1.1\r\n\r\n".encode()
+        )
+        head, _, body = response.decode().partition("\r\n\r\n")
+        status = int(head.split(" ")[1])
+        if status != 200:
+            return status, {}
+        return status, {
+            var.findtext("name"): var.findtext("value")
+            for var in ElementTree.fromstring(body).iter("var")
+        }
+
+    async def test_profiler_is_started_and_stopped(self):
+        status, values = await self._get("sys.profiler=60")
+        self.assertEqual(status, 200)
+        self.assertTrue(self.profiler.is_running)
+        # written value is read back in the same response
+        self.assertEqual(values, {"sys.profiler": "60"})
+
+        status, values = await self._get("sys.profiler=0")
+        self.assertEqual(status, 200)
+        self.assertFalse(self.profiler.is_running)
+        self.assertEqual(values, {"sys.profiler": "0"})
+
+    async def test_invalid_value_is_bad_request(self):
+        status, _ = await self._get("sys.profiler=abc")
+
+        self.assertEqual(status, 400)
+        self.assertFalse(self.profiler.is_running)
+
+    async def test_tags_which_are_not_writable_are_ignored(self):
+        status, values = await self._get("sys.scgi_status=inactive")
+
+        self.assertEqual(status, 200)
+        self.assertEqual(values, {"sys.scgi_status": "active"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+
+from scgi_server.local.services.rw_service.errors import InvalidTagNameError
+from scgi_server.local.services.rw_service.scgi_communication \
+    .operation_type import OperationType
+from scgi_server.local.services.rw_service.scgi_communication.rw_request \
+    import RWRequest
+
+
+class RWRequestTestCase(unittest.TestCase):
+    def test_tag_names_are_parsed(self):
+        request = RWRequest.create("c1000.a.b")
+        self.assertEqual(
+            (request.target, request.nad, request.tag_name, request.type),
+            (RWRequest.Target.PLC, 1000, "a.b", OperationType.READ)
+        )
+
+        request = RWRequest.create("c1000.sys.ip_port")
+        self.assertEqual(
+            (request.target, request.nad, request.tag_name),
+            (RWRequest.Target.PLC_SYSTEM, 1000, "ip_port")
+        )
+
+        request = RWRequest.create("sys.server_uptime")
+        self.assertEqual(
+            (request.target, request.nad, request.tag_name),
+            (RWRequest.Target.SYSTEM, None, "server_uptime")
+        )
+
+    def test_invalid_tag_names_are_rejected(self):
+        for name in ("", "x1000.a", "c.a", "c10a.a", "1000.a"):
+            with self.assertRaises(InvalidTagNameError, msg=name):
+                RWRequest.create(name)
+
+    def test_read_requests_are_shared(self):
+        self.assertIs(RWRequest.create("c1000.shared"),
+                      RWRequest.create("c1000.shared"))
+
+    def test_write_request_uses_parsed_name(self):
+        RWRequest.create("c1000.w")
+        request = RWRequest.create("c1000.w", "5")
+
+        self.assertEqual(request.value, "5")
+        self.assertEqual(request.type, OperationType.WRITE)
+        self.assertEqual((request.nad, request.tag_name), (1000, "w"))
+        self.assertIsNone(RWRequest.create("c1000.w").value)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import asyncio
+import unittest
+from datetime import timedelta
+
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_cache.cache_budget import CacheBudget
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_cache.plc_cache import PlcCache
+
+
+class CacheBudgetTestCase(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.budget = CacheBudget(3, 0)
+        self.cache = PlcCache(self.loop,
+                              timedelta(seconds=0),
+                              timedelta(seconds=5),
+                              timedelta(seconds=10),
+                              self.budget,
+                              timedelta(seconds=0))
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_lru_across_plcs(self):
+        self.cache[1000].set_value("a", "1", "")
+        self.cache[2000].set_value("b", "1", "")
+        self.cache[1000].set_value("c", "1", "")
+
+        # "a" becomes most recently used, "b" is evicted first
+        self.cache[1000].get_values(["a"])
+        self.cache[3000].set_value("d", "1", "")
+
+        self.assertEqual(self.cache.entries, 3)
+        self.assertEqual(self.cache.evictions, 1)
+        self.assertEqual(len(self.cache[2000]), 0)
+        self.assertEqual(len(self.cache[1000]), 2)
+
+    def test_byte_budget(self):
+        budget = CacheBudget(0, 2 * CacheBudget.estimate_size("a", "1", ""))
+        cache = PlcCache(self.loop,
+                         timedelta(seconds=0),
+                         timedelta(seconds=5),
+                         timedelta(seconds=10),
+                         budget,
+                         timedelta(seconds=0))
+        for name in ("a", "b", "c"):
+            cache[1000].set_value(name, "1", "")
+
+        self.assertEqual(budget.entries, 2)
+        self.assertLessEqual(budget.bytes, 2 * CacheBudget.estimate_size(
+            "a", "1", ""
+        ))
+
+    def test_idle_plc_removed(self):
+        self.cache[1000].set_value("a", "1", "")
+        self.cache[2000]
+
+        self.cache._cleanup()
+
+        self.assertEqual(self.cache.plc_count, 0)
+        self.assertEqual(self.cache.entries, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
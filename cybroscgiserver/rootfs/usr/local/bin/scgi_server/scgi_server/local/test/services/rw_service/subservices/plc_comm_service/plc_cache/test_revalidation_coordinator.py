@@ -0,0 +1,75 @@
+import asyncio
+import unittest
+
+from lib.general.conditional_logger import get_logger
+from scgi_server.local.services.rw_service.scgi_communication.rw_request \
+    import RWRequest
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_cache.revalidation_coordinator import RevalidationCoordinator
+
+
+class _Controller:
+    """Answers refreshes only when the test releases them, so the tests do
+    not depend on how fast they run.
+    """
+    def __init__(self, expected_count: int):
+        self.released = asyncio.Event()
+        self.finished = asyncio.Event()
+        self.refreshed = []
+        self.running = 0
+        self.max_running = 0
+        self._expected_count = expected_count
+
+    async def refresh(self, requests):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await self.released.wait()
+        self.running -= 1
+        self.refreshed.append(sorted(r.tag_name for r in requests))
+        if len(self.refreshed) == self._expected_count:
+            self.finished.set()
+
+
+async def _run_pending_tasks():
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+class RevalidationCoordinatorTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_burst_is_refreshed_once(self):
+        coordinator = RevalidationCoordinator(get_logger(), 2)
+        controller = _Controller(1)
+
+        requests = [RWRequest.create("c1000.a"), RWRequest.create("c1000.b")]
+        for _ in range(100):
+            coordinator.schedule(1000, requests, controller.refresh)
+        await _run_pending_tasks()
+        controller.released.set()
+        await controller.finished.wait()
+
+        self.assertEqual(controller.refreshed, [["a", "b"]])
+        self.assertEqual(coordinator.deduplicated_count, 198)
+        self.assertEqual(coordinator.in_flight_count, 0)
+
+    async def test_concurrency_limit(self):
+        coordinator = RevalidationCoordinator(get_logger(), 1)
+        controller = _Controller(3)
+
+        for nad in range(1000, 1003):
+            coordinator.schedule(nad,
+                                 [RWRequest.create(f"c{nad}.a")],
+                                 controller.refresh)
+        await _run_pending_tasks()
+
+        self.assertEqual(controller.running, 1)
+        self.assertEqual(coordinator.in_flight_count, 3)
+
+        controller.released.set()
+        await controller.finished.wait()
+
+        self.assertEqual(controller.max_running, 1)
+        self.assertEqual(coordinator.in_flight_count, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
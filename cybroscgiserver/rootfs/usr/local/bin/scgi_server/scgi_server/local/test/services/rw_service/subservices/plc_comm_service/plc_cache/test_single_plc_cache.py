@@ -0,0 +1,73 @@
+import asyncio
+import unittest
+from datetime import timedelta
+
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_cache.cache_budget import CacheBudget
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_cache.cache_value_condition import CacheValueCondition
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_cache.plc_cache import PlcCache
+
+
+class SinglePlcCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.now = 100.0
+        self.cache = PlcCache(self.loop,
+                              timedelta(seconds=0),
+                              timedelta(seconds=5),
+                              timedelta(seconds=10),
+                              CacheBudget(0, 0),
+                              timedelta(seconds=0),
+                              lambda: self.now)[1000]
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_get_values(self):
+        self.cache.set_value("a", "1", "first")
+        self.now += 3
+        self.cache.set_value("b", "2", "")
+        self.now += 3
+
+        values = self.cache.get_values(["a", "b", "missing"])
+
+        self.assertEqual(values.keys(), {"a", "b"})
+        self.assertEqual(values["a"].value, "1")
+        self.assertEqual(values["a"].condition, CacheValueCondition.STINKY)
+        self.assertEqual(values["b"].condition, CacheValueCondition.FRESH)
+
+        self.now += 5
+        self.assertEqual(self.cache.get_value("a").condition,
+                         CacheValueCondition.STALE)
+
+    def test_cleanup(self):
+        self.cache.set_value("a", "1", "")
+        self.cache.set_value("b", "1", "")
+
+        self.cache.cleanup(self.now + 5)
+        self.assertEqual(len(self.cache), 2)
+
+        self.now += 8
+        self.cache.set_value("b", "2", "")
+
+        self.cache.cleanup(self.now + 5)
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(self.cache.get_value("b").value, "2")
+
+    def test_repeatedly_set_value_is_kept_until_last_expiry(self):
+        for _ in range(1000):
+            self.cache.set_value("a", "1", "")
+            self.now += 0.01
+        self.cache.set_value("a", "2", "")
+
+        self.cache.cleanup(self.now + 9)
+        self.assertEqual(self.cache.get_value("a").value, "2")
+
+        self.cache.cleanup(self.now + 10)
+        self.assertEqual(len(self.cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import asyncio
+import unittest
+from datetime import datetime
+
+from lib.general.conditional_logger import get_logger
+from scgi_server.local.services.plc_info_service.plc_info import PlcInfo
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_client_manager.plc_client_manager import PlcClientManager
+
+
+class FakePlcClient:
+    def __init__(self, plc_info):
+        self.plc_info = plc_info
+
+
+class FakePlcCommunicator:
+    def __init__(self, plc_client):
+        self.plc_client = plc_client
+
+
+class FakePlcClientManager(PlcClientManager):
+    def _create_plc_client(self, plc_info):
+        return FakePlcClient(plc_info)
+
+
+def create_plc_info(nad, ip):
+    now = datetime.now()
+    return PlcInfo(now, PlcInfo.Origin.STATIC, nad, ip, 8442, None, None,
+                   now)
+
+
+class PlcClientManagerTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.manager = FakePlcClientManager(
+            get_logger(), get_logger(), asyncio.get_event_loop(), None, None,
+            None, None
+        )
+        self.manager.set_communicator_factory(FakePlcCommunicator)
+
+    async def test_communicator_is_reused(self):
+        self.manager.on_plc_info_set(create_plc_info(1000, "10.0.0.1"))
+
+        first = await self.manager.get_communicator(1000)
+        second = await self.manager.get_communicator(1000)
+
+        self.assertIs(first, second)
+        self.assertEqual(first.plc_client.plc_info.ip, "10.0.0.1")
+
+    async def test_communicator_is_rebuilt_when_plc_info_changes(self):
+        self.manager.on_plc_info_set(create_plc_info(1000, "10.0.0.1"))
+        first = await self.manager.get_communicator(1000)
+
+        self.manager.on_plc_info_set(create_plc_info(1000, "10.0.0.2"))
+        second = await self.manager.get_communicator(1000)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(second.plc_client.plc_info.ip, "10.0.0.2")
+
+    async def test_no_communicator_without_ip(self):
+        self.manager.on_plc_info_set(create_plc_info(1000, None))
+
+        self.assertIsNone(await self.manager.get_communicator(1000))
+
+
+if __name__ == "__main__":
+    unittest.main()
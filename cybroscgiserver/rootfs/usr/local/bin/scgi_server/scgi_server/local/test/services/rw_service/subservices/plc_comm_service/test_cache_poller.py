@@ -0,0 +1,86 @@
+import asyncio
+import unittest
+from datetime import timedelta
+
+from lib.general.conditional_logger import get_logger
+from lib.services.alias_service import AliasService
+from scgi_server.local.services.rw_service.scgi_communication.rw_request \
+    import RWRequest
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_cache.cache_poller import CachePoller
+
+
+async def _run_pending_tasks():
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+class _Clock:
+    """Fake time of the poller, sleeping tasks wake up only when the test
+    advances the time.
+    """
+    def __init__(self):
+        self.now = 0.0
+        # (wake-up time, future of the sleeping task)
+        self._sleepers = []
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, delay):
+        future = asyncio.get_running_loop().create_future()
+        self._sleepers.append((self.now + delay, future))
+        await future
+
+    async def advance(self, seconds):
+        # started tasks go to sleep first
+        await _run_pending_tasks()
+        self.now += seconds
+        due = [sleeper for sleeper in self._sleepers if sleeper[0] <= self.now]
+        for sleeper in due:
+            self._sleepers.remove(sleeper)
+            if not sleeper[1].done():
+                sleeper[1].set_result(None)
+        await _run_pending_tasks()
+
+
+class CachePollerTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_batches_and_evicts_idle_tags(self):
+        reads = []
+
+        async def refresh(nad, requests):
+            reads.append((nad, sorted(r.tag_name for r in requests)))
+
+        clock = _Clock()
+        poller = CachePoller(get_logger(),
+                             refresh,
+                             AliasService(get_logger(),
+                                          {"c2000": "alpha"},
+                                          {"alpha": "c2000"}),
+                             timedelta(seconds=10),
+                             timedelta(seconds=25),
+                             ["alpha.static"],
+                             clock,
+                             clock.sleep)
+        poller.start()
+        poller.touch(1000, [RWRequest.create("c1000.a"),
+                            RWRequest.create("c1000.b")])
+
+        # the second controller starts later in the period
+        await clock.advance(0)
+        self.assertEqual(reads, [(2000, ["static"])])
+        await clock.advance(7)
+        self.assertEqual(reads, [(2000, ["static"]), (1000, ["a", "b"])])
+        self.assertTrue(poller.is_polled(1000, "a"))
+
+        await clock.advance(20)
+        self.assertEqual(reads[2:], [(2000, ["static"])])
+        self.assertFalse(poller.is_polled(1000, "a"))
+        self.assertTrue(poller.is_polled(2000, "static"))
+        self.assertEqual(poller.polled_tags_count, 1)
+
+        poller.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+import asyncio
+import unittest
+from datetime import datetime, timedelta
+
+from lib.general.conditional_logger import get_logger
+from lib.general.metrics import MetricsRegistry
+from lib.input_output.scgi.r_response import RResponse
+from lib.services.cpu_intensive_task_runner import CPUIntensiveTaskRunner
+from scgi_server.local.general.errors import ExchangerTimeoutError
+from scgi_server.local.services.plc_info_service.plc_info import PlcInfo
+from scgi_server.local.services.rw_service.scgi_communication.rw_request \
+    import RWRequest
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .alc_service.var_info import VarInfo
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .data_type import DataType
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_cache.cache_budget import CacheBudget
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_cache.plc_cache import PlcCache
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_cache.revalidation_coordinator import RevalidationCoordinator
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_client_manager.plc_client.plc_head import PlcHead
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_client_manager.plc_client_manager import PlcClientManager
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_comm_service import PlcCommService
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .read_plan_cache import ReadPlanCache
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .write_coalescer import WriteCoalescer
+
+NAD = 1000
+CRC = 0x1234
+PROGRAM_DATETIME = datetime(2024, 1, 1)
+
+
+class _PlcActivityService:
+    def report_alc_crc_used(self, nad, crc):
+        pass
+
+    def report_read_frames(self, frame_count):
+        pass
+
+
+class _AlcService:
+    def __getitem__(self, crc):
+        return {
+            "tag": VarInfo(0, "tag", False, 1, 0x100, 0, 2, "", DataType.INT,
+                           "")
+        }
+
+
+class _PlcClient:
+    """Controller with a single two byte variable, stops answering reads
+    and writes when `failing` is set.
+    """
+    def __init__(self, plc_info: PlcInfo):
+        self.plc_info = plc_info
+        self.value = 0
+        self.failing = False
+
+    async def read_plc_head(self):
+        return PlcHead(0, 31416, 0, CRC, 0, 0, PROGRAM_DATETIME, 1, 1, 0)
+
+    async def write_random_memory(self, one_b_addrs, two_b_addrs,
+                                  four_b_addrs, one_b_values, two_b_values,
+                                  four_b_values, four_b_types):
+        if self.failing:
+            raise ExchangerTimeoutError()
+        (self.value,) = two_b_values
+
+    async def read_random_memory(self, one_b_addrs, two_b_addrs,
+                                 four_b_addrs, four_b_types,
+                                 on_command_frame_and_type_info_created):
+        if self.failing:
+            raise ExchangerTimeoutError()
+        on_command_frame_and_type_info_created(
+            None,
+            (len(one_b_addrs), len(two_b_addrs), len(four_b_addrs),
+             four_b_types)
+        )
+        return [], [self.value] * len(two_b_addrs), []
+
+    async def read_random_memory_with_read_plan(self, frames):
+        if self.failing:
+            raise ExchangerTimeoutError()
+        return [self.value] * sum(sum(counts) for _, counts, _ in frames)
+
+
+class _PlcClientManager(PlcClientManager):
+    def _create_plc_client(self, plc_info):
+        return _PlcClient(plc_info)
+
+
+class PlcCommServiceWriteTestCase(unittest.IsolatedAsyncioTestCase):
+    def _create_service(self, write_coalescer):
+        log = get_logger()
+        loop = asyncio.get_running_loop()
+        runner = CPUIntensiveTaskRunner()
+        self.plc_client_manager = _PlcClientManager(
+            log, log, loop, None, _PlcActivityService(), None, runner
+        )
+        cache = PlcCache(loop,
+                         timedelta(0),
+                         timedelta(minutes=1),
+                         timedelta(minutes=1),
+                         CacheBudget(0, 0),
+                         timedelta(minutes=1))
+        now = datetime.now()
+        self.plc_client_manager.on_plc_info_set(
+            PlcInfo(now, PlcInfo.Origin.STATIC, NAD, "127.0.0.1", 8442, None,
+                    PROGRAM_DATETIME, now)
+        )
+        return PlcCommService(log, None, _AlcService(), _PlcActivityService(),
+                              self.plc_client_manager, cache, None,
+                              ReadPlanCache(100),
+                              RevalidationCoordinator(log, 1),
+                              write_coalescer, runner, False, False,
+                              MetricsRegistry())
+
+    async def _write_and_read(self, service, value):
+        (response,) = await service.process_rw_requests(
+            NAD,
+            [RWRequest.create(f"c{NAD}.tag")],
+            [RWRequest.create(f"c{NAD}.tag", value)],
+            None
+        )
+        return response
+
+    async def test_failed_write_is_not_answered_from_cache(self):
+        for write_coalescer in (
+            None,
+            WriteCoalescer(get_logger(), timedelta(milliseconds=1))
+        ):
+            with self.subTest(write_coalescer=write_coalescer):
+                service = self._create_service(write_coalescer)
+                client = (
+                    await self.plc_client_manager.get_communicator(NAD)
+                ).plc_client
+
+                response = await self._write_and_read(service, "5")
+                self.assertTrue(response.valid)
+                self.assertEqual(response.value, "5")
+
+                client.failing = True
+                response = await self._write_and_read(service, "7")
+                self.assertFalse(response.valid)
+                self.assertEqual(response.code, RResponse.Code.TIMEOUT)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import struct
+import unittest
+
+from scgi_server.local.input_output.abus_stack.abus.command_frame import \
+    CommandFrameUtil
+from scgi_server.local.services.rw_service.scgi_communication.rw_request \
+    import RWRequest
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .data_type import DataType
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .read_plan_cache import ReadPlan, ReadPlanCache
+
+
+class ReadPlanCacheTestCase(unittest.TestCase):
+    def test_decoder(self):
+        four_b_types = [DataType.LONG, DataType.REAL]
+        plan = ReadPlan.create([], [], [(
+            CommandFrameUtil.create_read_random_memory([1], [2, 3], [4, 5]),
+            (1, 2, 2, four_b_types)
+        )])
+
+        _, counts, decoder = plan.frames[0]
+        body = (struct.pack("<B2h", 7, -1, 300) + struct.pack("<l", -70000) +
+                struct.pack("<f", 1.5))
+
+        self.assertEqual(counts, (1, 2, 2))
+        self.assertEqual(decoder.unpack_from(body), (7, -1, 300, -70000, 1.5))
+
+    def test_fingerprint(self):
+        def fingerprint(*tag_names):
+            return ReadPlanCache.fingerprint(
+                [RWRequest.create(f"c1000.{name}") for name in tag_names]
+            )
+
+        self.assertEqual(fingerprint("a", "b"), fingerprint("a", "b"))
+        self.assertNotEqual(fingerprint("b", "a"), fingerprint("a", "b"))
+
+    def test_fingerprint_keeps_repeated_tags(self):
+        cache = ReadPlanCache(10)
+        plan = ReadPlan([], [], [])
+        repeated = ReadPlanCache.fingerprint([RWRequest.create("c1000.a"),
+                                              RWRequest.create("c1000.b"),
+                                              RWRequest.create("c1000.a")])
+
+        self.assertEqual(repeated, ("a", "b", "a"))
+        cache.set(1000, 1, ReadPlanCache.fingerprint(
+            [RWRequest.create("c1000.b"), RWRequest.create("c1000.a")]
+        ), plan)
+        self.assertIsNone(cache.get(1000, 1, repeated))
+
+    def test_crc_change_and_eviction(self):
+        cache = ReadPlanCache(2)
+        plan = ReadPlan([], [], [])
+
+        cache.set(1000, 1, ("a",), plan)
+        cache.set(2000, 1, ("a",), plan)
+        self.assertIs(cache.get(1000, 1, ("a",)), plan)
+        self.assertIsNone(cache.get(1000, 2, ("a",)))
+        self.assertIsNone(cache.get(1000, 1, ("a",)))
+        self.assertEqual(cache.size, 1)
+
+        cache.set(3000, 1, ("a",), plan)
+        cache.set(4000, 1, ("a",), plan)
+        self.assertEqual(cache.evictions, 1)
+        self.assertIsNone(cache.get(2000, 1, ("a",)))
+        self.assertAlmostEqual(cache.hit_rate, 1 / 4)
@@ -0,0 +1,65 @@
+import asyncio
+import unittest
+from datetime import timedelta
+
+from lib.general.conditional_logger import get_logger
+from scgi_server.local.services.rw_service.scgi_communication.rw_request \
+    import RWRequest
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .write_coalescer import WriteCoalescer
+
+
+class WriteCoalescerTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_burst_is_written_once(self):
+        coalescer = WriteCoalescer(get_logger(), timedelta(milliseconds=10))
+        written = []
+
+        async def write(requests):
+            written.append({r.tag_name: r.value for r in requests})
+            return True
+
+        results = await asyncio.gather(*(
+            coalescer.write(
+                1000,
+                [RWRequest.create("c1000.a", str(i)),
+                 RWRequest.create(f"c1000.b{i % 2}", str(i))],
+                write
+            )
+            for i in range(10)
+        ))
+
+        self.assertEqual(written, [{"a": "9", "b0": "8", "b1": "9"}])
+        self.assertEqual(results, [True] * 10)
+        self.assertEqual(coalescer.coalesced_count, 17)
+
+    async def test_controllers_are_written_separately(self):
+        coalescer = WriteCoalescer(get_logger(), timedelta(milliseconds=10))
+        written = []
+
+        async def write(requests):
+            written.append([r.name for r in requests])
+
+        await asyncio.gather(
+            coalescer.write(1000, [RWRequest.create("c1000.a", "1")], write),
+            coalescer.write(1001, [RWRequest.create("c1001.a", "1")], write)
+        )
+
+        self.assertEqual(sorted(written), [["c1000.a"], ["c1001.a"]])
+
+    async def test_write_error_is_raised_to_all_writers(self):
+        coalescer = WriteCoalescer(get_logger(), timedelta(milliseconds=10))
+
+        async def write(_):
+            raise RuntimeError("timeout")
+
+        results = await asyncio.gather(
+            coalescer.write(1000, [RWRequest.create("c1000.a", "1")], write),
+            coalescer.write(1000, [RWRequest.create("c1000.b", "1")], write),
+            return_exceptions=True
+        )
+
+        self.assertTrue(all(isinstance(r, RuntimeError) for r in results))
+
+
+if __name__ == '__main__':
+    unittest.main()
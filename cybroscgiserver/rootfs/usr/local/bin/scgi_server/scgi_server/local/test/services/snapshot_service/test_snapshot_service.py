@@ -0,0 +1,97 @@
+import asyncio
+import tempfile
+import unittest
+from datetime import timedelta, datetime
+from pathlib import Path
+
+from lib.general.conditional_logger import get_logger
+from lib.general.metrics import MetricsRegistry
+from scgi_server.local.services.plc_info_service.plc_info import PlcInfo
+from scgi_server.local.services.plc_info_service.plc_info_service import \
+    PlcInfoService
+from scgi_server.local.services.rw_service.subservices.plc_activity_service \
+    .plc_activity_service import PlcActivityService
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_cache.cache_budget import CacheBudget
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_cache.cache_value_condition import CacheValueCondition
+from scgi_server.local.services.rw_service.subservices.plc_comm_service \
+    .plc_cache.plc_cache import PlcCache
+from scgi_server.local.services.snapshot_service.snapshot_service import \
+    SnapshotService
+
+
+class FakePlcClientManager:
+    def on_plc_info_set(self, plc_info):
+        pass
+
+    def on_plc_info_removed(self, nad):
+        pass
+
+
+class SnapshotServiceTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.path = Path(self._dir.name).joinpath("snapshot.json")
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def _create_service(self):
+        log = get_logger()
+        loop = asyncio.get_running_loop()
+        plc_info_service = PlcInfoService(log, loop, None,
+                                          timedelta(hours=1), [])
+        plc_info_service.set_plc_client_manager(FakePlcClientManager())
+        plc_cache = PlcCache(loop,
+                             timedelta(0),
+                             timedelta(seconds=5),
+                             timedelta(seconds=10),
+                             CacheBudget(0, 0),
+                             timedelta(minutes=10))
+        service = SnapshotService(log,
+                                  loop,
+                                  self.path,
+                                  timedelta(seconds=60),
+                                  timedelta(hours=1),
+                                  plc_info_service,
+                                  PlcActivityService(MetricsRegistry()),
+                                  plc_cache)
+        return service, plc_info_service, plc_cache
+
+    async def test_restores_plcs_and_values(self):
+        service, plc_info_service, plc_cache = self._create_service()
+        program_datetime = datetime(2024, 1, 2, 3, 4, 5)
+        plc_info_service.set_plc_info(plc_info_service.create(
+            PlcInfo.Origin.AUTO, 1000, "192.168.1.10", 8442, None,
+            program_datetime
+        ))
+        plc_cache[1000].set_value("a", "12", "desc")
+        await service.save()
+
+        service, plc_info_service, plc_cache = self._create_service()
+        await service.restore()
+
+        plc_info = plc_info_service.get_plc_info(1000)
+        self.assertEqual(plc_info.ip, "192.168.1.10")
+        self.assertEqual(plc_info.origin, PlcInfo.Origin.AUTO)
+        self.assertEqual(plc_info.program_datetime, program_datetime)
+
+        value = plc_cache[1000].get_value("a")
+        self.assertEqual(value.value, "12")
+        self.assertEqual(value.description, "desc")
+        # answered, but refreshed on the next read
+        self.assertEqual(value.condition, CacheValueCondition.STINKY)
+
+    async def test_missing_or_invalid_snapshot_is_ignored(self):
+        service, plc_info_service, _ = self._create_service()
+        await service.restore()
+
+        self.path.write_text("{", encoding="utf-8")
+        await service.restore()
+
+        self.assertEqual(list(plc_info_service.get_plc_infos()), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
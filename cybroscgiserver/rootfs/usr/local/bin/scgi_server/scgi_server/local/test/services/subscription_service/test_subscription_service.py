@@ -0,0 +1,82 @@
+import asyncio
+import unittest
+from typing import List
+
+from lib.general.conditional_logger import get_logger
+from lib.input_output.scgi.r_response import RResponse
+from lib.services.alias_service import AliasService
+from scgi_server.local.services.rw_service.scgi_communication.rw_request \
+    import RWRequest
+from scgi_server.local.services.subscription_service.subscription_service \
+    import SubscriptionService
+
+
+class FakeRWService:
+    def __init__(self):
+        self.values = {}
+        self.calls: List[List[str]] = []
+
+    async def on_rw_requests(self, requests: List[RWRequest]):
+        self.calls.append([request.name for request in requests])
+        return [
+            RResponse.create(request.name,
+                             request.tag_name,
+                             self.values.get(request.name, "0"))
+            for request in requests
+        ]
+
+
+class FakeClient:
+    def __init__(self):
+        self.payloads: List[bytes] = []
+
+    async def send_payload(self, data: bytes) -> None:
+        self.payloads.append(data)
+
+
+class SubscriptionServiceTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        log = get_logger()
+        self.rw_service = FakeRWService()
+        self.service = SubscriptionService(
+            log,
+            self.rw_service,
+            AliasService(log, {"c1000": "alpha"}, {"alpha": "c1000"}),
+            False,
+            0.01
+        )
+
+    async def test_sends_changed_values_only(self):
+        client = FakeClient()
+        await self.service.on_message(
+            client,
+            b'{"subscribe": ["alpha.a", "alpha.b"], "interval": 0.01}'
+        )
+        await asyncio.sleep(0.05)
+
+        self.assertEqual(self.rw_service.calls[0], ["c1000.a", "c1000.b"])
+        self.assertEqual(len(client.payloads), 1)
+        self.assertIn(b"alpha.a", client.payloads[0])
+
+        self.rw_service.values["c1000.b"] = "1"
+        await asyncio.sleep(0.05)
+
+        self.assertEqual(len(client.payloads), 2)
+        self.assertIn(b"alpha.b", client.payloads[1])
+        self.assertNotIn(b"alpha.a", client.payloads[1])
+
+        self.service.remove(client)
+        await asyncio.sleep(0.02)
+        self.assertEqual(self.service.tags_count, 0)
+
+    async def test_invalid_tag(self):
+        client = FakeClient()
+        await self.service.on_message(client, b'{"subscribe": ["c1000.a"]}')
+        self.service.remove(client)
+
+        self.assertEqual(len(client.payloads), 1)
+        self.assertIn(b"<value>?</value>", client.payloads[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import threading
+import unittest
+
+from lib.services.cpu_intensive_task_runner import CPUIntensiveTaskRunner, \
+    TaskRunnerBackend
+
+
+def _where(items):
+    return len(items), os.getpid(), threading.get_ident()
+
+
+def _fail(items):
+    raise TypeError(f"{len(items)} items")
+
+
+class _Service:
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def where(self, items):
+        return _where(items)
+
+
+class CPUIntensiveTaskRunnerTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_small_task_runs_inline(self):
+        runner = CPUIntensiveTaskRunner(TaskRunnerBackend.THREAD, 10)
+
+        result = await runner.run(_where, list(range(9)))
+
+        self.assertEqual(result, (9, os.getpid(), threading.get_ident()))
+        timing = runner.timings[("_where", TaskRunnerBackend.INLINE)]
+        self.assertEqual(timing.count, 1)
+        self.assertEqual(sum(timing.buckets), 1)
+
+    async def test_large_task_runs_in_thread(self):
+        runner = CPUIntensiveTaskRunner(TaskRunnerBackend.THREAD, 10)
+
+        count, pid, thread = await runner.run(_where, (list(range(5)),
+                                                       list(range(5))))
+        runner.shutdown()
+
+        self.assertEqual(count, 2)
+        self.assertNotEqual(thread, threading.get_ident())
+        self.assertIn(("_where", TaskRunnerBackend.THREAD), runner.timings)
+
+    async def test_process_backend(self):
+        runner = CPUIntensiveTaskRunner(TaskRunnerBackend.PROCESS, 10)
+
+        _, function_pid, _ = await runner.run(_where, list(range(10)))
+        _, method_pid, _ = await runner.run(_Service().where,
+                                            list(range(10)))
+        _, lambda_pid, _ = await runner.run(lambda items: _where(items),
+                                            list(range(10)))
+        runner.shutdown()
+
+        self.assertNotEqual(function_pid, os.getpid())
+        # service instances and lambdas can't be sent to another process
+        self.assertEqual(method_pid, os.getpid())
+        self.assertEqual(lambda_pid, os.getpid())
+        self.assertIn(("_Service.where", TaskRunnerBackend.INLINE),
+                      runner.timings)
+
+    async def test_unpicklable_arguments_run_inline(self):
+        runner = CPUIntensiveTaskRunner(TaskRunnerBackend.PROCESS, 10)
+
+        _, pid, _ = await runner.run(_where, [threading.Lock()] * 10)
+        runner.shutdown()
+
+        self.assertEqual(pid, os.getpid())
+
+    async def test_error_of_task_in_process_is_raised(self):
+        runner = CPUIntensiveTaskRunner(TaskRunnerBackend.PROCESS, 10)
+
+        with self.assertRaisesRegex(TypeError, "10 items"):
+            await runner.run(_fail, list(range(10)))
+        runner.shutdown()
+
+        self.assertNotIn(("_fail", TaskRunnerBackend.INLINE), runner.timings)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import asyncio
+import logging
+from pathlib import Path
+
+from lib.config.loader import read_config_from_file
+from lib.general.paths import CONFIG_FILE
+from lib.startup.init_logging import init_logging
+from scgi_server.local.config.config.config import Config
+from scgi_server.local.config.config.config_defaults import DEFAULT_CONFIG
+from scgi_server.local.defaults import WORKER_CONNECT_TIMEOUT
+from scgi_server.local.worker.worker_container import WorkerContainer
+
+
+def run_worker(index: int, rw_ipc_path: Path, ws_relay_path: Path) -> None:
+    """Entry point of a scgi worker process. The worker exits when the main
+    process closes the connection, e.g. when it is restarted.
+    """
+    config = read_config_from_file(CONFIG_FILE, Config, DEFAULT_CONFIG)
+    init_logging(config.debuglog_config,
+                 config.locations_config.log_dir,
+                 f"scgi_worker{index}")
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    container = WorkerContainer(config,
+                                loop,
+                                rw_ipc_path,
+                                ws_relay_path,
+                                loop.stop)
+
+    try:
+        loop.run_until_complete(
+            container.rw_service.connect(WORKER_CONNECT_TIMEOUT)
+        )
+        loop.run_until_complete(container.tcp_server.start())
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        logging.critical(f"Worker {index} failed: {e}")
+    finally:
+        loop.close()
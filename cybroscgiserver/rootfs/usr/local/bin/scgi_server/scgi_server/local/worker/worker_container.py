@@ -0,0 +1,143 @@
+from asyncio import AbstractEventLoop
+from pathlib import Path
+from typing import Optional, Callable
+
+from lib.general.conditional_logger import get_logger
+from lib.general.metrics import MetricsRegistry
+from lib.services.alias_service import AliasService
+from lib.services.cpu_intensive_task_runner import CPUIntensiveTaskRunner
+from scgi_server.local.config.config.config import Config
+from scgi_server.local.defaults import QUERY_PLAN_CACHE_SIZE
+from scgi_server.local.general.logger_names import LoggerNames
+from scgi_server.local.input_output.scgi.query_plan_cache import \
+    QueryPlanCache
+from scgi_server.local.input_output.scgi.scgi_activity_service import \
+    ScgiActivityService
+from scgi_server.local.input_output.scgi.scgi_server import ScgiServer
+from scgi_server.local.input_output.tcp.server import TCPServer
+from scgi_server.local.input_output.websocket.websocket_activity_service \
+    import WebSocketActivityService
+from scgi_server.local.services.rw_service.remote_rw_service import \
+    RemoteRWService
+
+
+class WorkerContainer:
+    """Dependency container of a scgi worker process, contains only the
+    scgi front end, see `Container` of the main process.
+    """
+    def __init__(self,
+                 config: Config,
+                 loop: AbstractEventLoop,
+                 rw_ipc_path: Path,
+                 ws_relay_path: Path,
+                 on_disconnected: Callable[[], None]):
+        self.config: Config = config
+        self.loop: AbstractEventLoop = loop
+        self.rw_ipc_path: Path = rw_ipc_path
+        self.ws_relay_path: Path = ws_relay_path
+        self.on_disconnected: Callable[[], None] = on_disconnected
+
+        self._alias_service: Optional[AliasService] = None
+        self._scgi_activity_service: Optional[ScgiActivityService] = None
+        self._cpu_intensive_task_runner: Optional[
+            CPUIntensiveTaskRunner
+        ] = None
+        self._rw_service: Optional[RemoteRWService] = None
+        self._query_plan_cache: Optional[QueryPlanCache] = None
+        self._scgi_server: Optional[ScgiServer] = None
+        self._tcp_server: Optional[TCPServer] = None
+
+    @property
+    def alias_service(self) -> AliasService:
+        if self._alias_service is None:
+            self._alias_service = AliasService(
+                get_logger(LoggerNames.ALIAS_SERVICE.name),
+                self.config.alias_config.aliases,
+                self.config.alias_config.reversed
+            )
+
+        return self._alias_service
+
+    @property
+    def scgi_activity_service(self) -> ScgiActivityService:
+        if self._scgi_activity_service is None:
+            self._scgi_activity_service = ScgiActivityService()
+
+        return self._scgi_activity_service
+
+    @property
+    def cpu_intensive_task_runner(self) -> CPUIntensiveTaskRunner:
+        if self._cpu_intensive_task_runner is None:
+            self._cpu_intensive_task_runner = CPUIntensiveTaskRunner(
+                self.config.scgi_config.task_runner,
+                self.config.scgi_config.task_runner_threshold
+            )
+
+        return self._cpu_intensive_task_runner
+
+    @property
+    def rw_service(self) -> RemoteRWService:
+        if self._rw_service is None:
+            self._rw_service = RemoteRWService(
+                get_logger(LoggerNames.WORKER.name),
+                self.loop,
+                self.rw_ipc_path,
+                self.cpu_intensive_task_runner,
+                self.config.scgi_config.request_timeout_s,
+                self.on_disconnected
+            )
+
+        return self._rw_service
+
+    @property
+    def query_plan_cache(self) -> QueryPlanCache:
+        if self._query_plan_cache is None:
+            self._query_plan_cache = QueryPlanCache(
+                self.alias_service,
+                QUERY_PLAN_CACHE_SIZE
+            )
+
+        return self._query_plan_cache
+
+    @property
+    def scgi_server(self) -> ScgiServer:
+        if self._scgi_server is None:
+            self._scgi_server = ScgiServer(
+                get_logger(LoggerNames.SCGI_SERVER.name),
+                self.rw_service,
+                self.scgi_activity_service,
+                self.alias_service,
+                None,
+                self.query_plan_cache,
+                self.config.scgi_config.reply_with_descriptions,
+                self.config.scgi_config.access_token,
+                self.config.scgi_config.compression_min_bytes,
+                # metrics are served by the main process, scgi metrics of
+                # workers are not exported
+                MetricsRegistry(),
+                # read/write requests are processed by the main process
+                # where the trace would not reach
+                None
+            )
+
+        return self._scgi_server
+
+    @property
+    def tcp_server(self) -> TCPServer:
+        if self._tcp_server is None:
+            self._tcp_server = TCPServer(
+                get_logger(LoggerNames.TCP.name),
+                self.loop,
+                self.scgi_server,
+                self.config.scgi_config.scgi_bind_address,
+                self.config.scgi_config.scgi_port,
+                self.config.scgi_config.tls_enabled,
+                self.config.scgi_config.access_token,
+                WebSocketActivityService(),
+                self.config.scgi_config.ws_queue_size,
+                self.config.scgi_config.ws_drop_policy,
+                reuse_port=True,
+                ws_relay_path=self.ws_relay_path
+            )
+
+        return self._tcp_server
@@ -0,0 +1,91 @@
+import asyncio
+import multiprocessing
+from asyncio import AbstractEventLoop
+from pathlib import Path
+from typing import List, Optional
+
+from lib.general.conditional_logger import ConditionalLogger
+from lib.general.misc import create_task_callback
+from scgi_server.local.worker.worker import run_worker
+
+
+class WorkerPool:
+    """Starts scgi worker processes and restarts them when they die.
+
+    Workers accept scgi requests on the same port as the main process,
+    parse them and serialize responses. Read/write plans are processed by
+    the main process, so controllers still see a single client.
+    """
+    def __init__(self,
+                 log: ConditionalLogger,
+                 loop: AbstractEventLoop,
+                 count: int,
+                 rw_ipc_path: Path,
+                 ws_relay_path: Path,
+                 check_period_s: float):
+        self._log: ConditionalLogger = log
+        self._loop: AbstractEventLoop = loop
+        self._count: int = count
+        self._rw_ipc_path: Path = rw_ipc_path
+        self._ws_relay_path: Path = ws_relay_path
+        self._check_period_s: float = check_period_s
+        # workers are started with a fresh interpreter, forking a process
+        # with running threads and event loops is not safe
+        self._context = multiprocessing.get_context("spawn")
+        self._processes: List[Optional[multiprocessing.Process]] = (
+            [None] * count
+        )
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def ws_relay_path(self) -> Path:
+        return self._ws_relay_path
+
+    @property
+    def alive_count(self) -> int:
+        return sum(1 for p in self._processes
+                   if p is not None and p.is_alive())
+
+    def start(self) -> None:
+        for index in range(self._count):
+            self._start_worker(index)
+
+        self._task = self._loop.create_task(self._run())
+        self._task.add_done_callback(create_task_callback(self._log))
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+        for process in self._processes:
+            if process is not None and process.is_alive():
+                process.terminate()
+        for process in self._processes:
+            if process is not None:
+                process.join(1)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._check_period_s)
+            for index, process in enumerate(self._processes):
+                if not process.is_alive():
+                    self._log.error(f"Worker {index} exited with code "
+                                    f"{process.exitcode}, restarting")
+                    process.close()
+                    self._start_worker(index)
+
+    def _start_worker(self, index: int) -> None:
+        process = self._context.Process(
+            target=run_worker,
+            args=(index, self._rw_ipc_path, self._ws_relay_path),
+            name=f"ScgiWorker{index}",
+            daemon=True
+        )
+        process.start()
+        self._processes[index] = process
+        self._log.info(f"Started worker {index}, pid {process.pid}")